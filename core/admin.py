@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Abstract, CoordinatorApproval, Group, GroupMember, GroupRequest, GuideRequest, Notification, StudentProfile, FacultyProfile, SustainableDevelopmentGoal, GroupEvaluation, EvaluationFile, StudentEvaluation, Class, CoordinatorAssignment, ProjectReport
+from .models import Abstract, CoordinatorApproval, Group, GroupMember, GroupRequest, GuideRequest, Notification, StudentProfile, FacultyProfile, SustainableDevelopmentGoal, GroupEvaluation, EvaluationFile, StudentEvaluation, Class, CoordinatorAssignment, ProjectReport, StoredBlob
 
 
 @admin.register(Class)
@@ -13,10 +13,10 @@ class ClassAdmin(admin.ModelAdmin):
 
 @admin.register(CoordinatorAssignment)
 class CoordinatorAssignmentAdmin(admin.ModelAdmin):
-	list_display = ("faculty", "student_class", "get_department")
+	list_display = ("faculty", "student_class", "slot", "get_department")
 	search_fields = ("faculty__username", "faculty__email", "student_class__name")
 	list_filter = ("student_class__department",)
-	ordering = ("student_class__name", "faculty__username")
+	ordering = ("student_class__name", "slot")
 	
 	def get_department(self, obj):
 		return obj.student_class.department
@@ -225,3 +225,11 @@ class StudentEvaluationAdmin(admin.ModelAdmin):
 		return obj.coordinator_total
 	coordinator_total.short_description = "Coordinator Total"
 
+
+@admin.register(StoredBlob)
+class StoredBlobAdmin(admin.ModelAdmin):
+	list_display = ("digest", "size", "ref_count", "created_at", "orphaned_at")
+	search_fields = ("digest",)
+	list_filter = ("orphaned_at",)
+	readonly_fields = ("digest", "size", "ref_count", "created_at", "orphaned_at")
+	ordering = ("-created_at",)
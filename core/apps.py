@@ -1,5 +1,16 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        # Views render with render() and render_to_string(), which no
+        # middleware hook sees, so RequestTimingMiddleware's template time
+        # comes from a wrapper around the Django backend's Template.render.
+        # It is installed here, once per process, and only when the
+        # middleware is enabled.
+        if 'core.middleware.RequestTimingMiddleware' in settings.MIDDLEWARE:
+            from .middleware import install_template_timing
+            install_template_timing()
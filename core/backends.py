@@ -0,0 +1,19 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+
+class ProfileModelBackend(ModelBackend):
+	"""ModelBackend that loads the session user with both profiles in one query.
+
+	Nearly every view checks the student or faculty profile, so joining them
+	here saves a query per profile per request; a missing profile comes back
+	as a cached None instead of a failed lookup.
+	"""
+
+	def get_user(self, user_id):
+		UserModel = get_user_model()
+		try:
+			user = UserModel._default_manager.select_related("student_profile", "faculty_profile").get(pk=user_id)
+		except UserModel.DoesNotExist:
+			return None
+		return user if self.user_can_authenticate(user) else None
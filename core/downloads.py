@@ -0,0 +1,173 @@
+import hashlib
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models.fields.files import FieldFile
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import content_disposition_header, http_date, parse_etags, parse_http_date_safe, quote_etag
+
+from .storage import digest_from_name, is_blob_name, is_compressed
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+DELIVERY_DJANGO = "django"
+DELIVERY_X_ACCEL_REDIRECT = "x-accel-redirect"
+DELIVERY_X_SENDFILE = "x-sendfile"
+
+
+class _FileRange:
+	"""Read-only view over ``length`` bytes of an open file, starting at ``start``."""
+
+	def __init__(self, file, start, length):
+		self.file = file
+		self.remaining = length
+		file.seek(start)
+
+	def read(self, size=-1):
+		if self.remaining <= 0:
+			return b""
+		if size < 0 or size > self.remaining:
+			size = self.remaining
+		data = self.file.read(size)
+		self.remaining -= len(data)
+		return data
+
+	def close(self):
+		self.file.close()
+
+
+def content_digest(file):
+	"""SHA-256 hex digest of a file; free for content-addressed stored files."""
+	if isinstance(file, FieldFile) and is_blob_name(file.name):
+		return digest_from_name(file.name)
+	hasher = hashlib.sha256()
+	for chunk in file.chunks():
+		hasher.update(chunk)
+	return hasher.hexdigest()
+
+
+def _parse_range(header, size):
+	"""Return (start, end) for a single satisfiable byte range, None to ignore the
+	header, or False when the range cannot be satisfied."""
+	match = _RANGE_RE.match(header.replace(" ", ""))
+	if not match:
+		# Malformed headers and multi-range requests get the full body.
+		return None
+	first, last = match.groups()
+	if not first and not last:
+		return None
+	if not first:
+		suffix = int(last)
+		if suffix == 0 or size == 0:
+			return False
+		return max(size - suffix, 0), size - 1
+	start = int(first)
+	if start >= size:
+		return False
+	end = int(last) if last else size - 1
+	if start > end:
+		return None
+	return start, min(end, size - 1)
+
+
+def _if_range_passes(request, etag, last_modified):
+	if_range = request.META.get("HTTP_IF_RANGE")
+	if not if_range:
+		return True
+	if if_range.startswith(('"', "W/")):
+		# Only strong validators may be used with If-Range.
+		return not if_range.startswith("W/") and parse_etags(if_range) == [etag]
+	return last_modified is not None and parse_http_date_safe(if_range) == last_modified
+
+
+def _offload_response(file, *, filename, content_type, as_attachment):
+	"""Hand the transfer to the web server, or return None to stream it ourselves.
+
+	Only files in a filesystem storage can be offloaded; legacy inline content
+	and gzipped blobs, which must be decompressed, still go through Django.
+	"""
+	mode = getattr(settings, "FILE_DELIVERY", DELIVERY_DJANGO)
+	if mode == DELIVERY_DJANGO or not isinstance(file, FieldFile) or is_compressed(file.name):
+		return None
+	try:
+		path = file.path
+	except NotImplementedError:
+		return None
+
+	response = HttpResponse(content_type=content_type)
+	if mode == DELIVERY_X_ACCEL_REDIRECT:
+		# nginx maps this URI onto the storage directory through an ``internal`` location.
+		prefix = getattr(settings, "FILE_DELIVERY_ACCEL_PREFIX", "/protected/")
+		response["X-Accel-Redirect"] = quote(prefix.rstrip("/") + "/" + file.name.lstrip("/"))
+	elif mode == DELIVERY_X_SENDFILE:
+		response["X-Sendfile"] = path
+	else:
+		raise ImproperlyConfigured(f"Unknown FILE_DELIVERY mode {mode!r}.")
+	response["Content-Disposition"] = content_disposition_header(as_attachment, filename)
+	return response
+
+
+def serve_file(request, file, *, filename, content_type, last_modified=None, as_attachment=True):
+	"""Send a stored file with validators, 304 handling and single-range support.
+
+	``file`` is a Django File (a FieldFile or ContentFile); it is only opened
+	when a body actually has to be sent. The strong ETag is its content digest.
+
+	With ``settings.FILE_DELIVERY`` set to ``"x-accel-redirect"`` or
+	``"x-sendfile"`` the body, including any Range, is left to the web server
+	and this returns as soon as the caller has authorized the download.
+	"""
+	etag = quote_etag(content_digest(file))
+	last_modified = int(last_modified.timestamp()) if last_modified else None
+
+	def with_validators(response):
+		response["ETag"] = etag
+		if last_modified is not None:
+			response["Last-Modified"] = http_date(last_modified)
+		response["Accept-Ranges"] = "bytes"
+		# Downloads sit behind authorization, so let browsers keep a private
+		# copy but revalidate it on every use.
+		patch_cache_control(response, private=True, no_cache=True)
+		return response
+
+	conditional = get_conditional_response(request, etag=etag, last_modified=last_modified)
+	if conditional is not None:
+		return with_validators(conditional)
+
+	offloaded = _offload_response(file, filename=filename, content_type=content_type, as_attachment=as_attachment)
+	if offloaded is not None:
+		return with_validators(offloaded)
+
+	size = file.size
+	byte_range = None
+	range_header = request.META.get("HTTP_RANGE")
+	if range_header and request.method in ("GET", "HEAD") and _if_range_passes(request, etag, last_modified):
+		byte_range = _parse_range(range_header, size)
+
+	if byte_range is False:
+		response = HttpResponse(status=416)
+		response["Content-Range"] = f"bytes */{size}"
+		return with_validators(response)
+
+	handle = file.open("rb")
+	if byte_range is None:
+		response = FileResponse(handle, as_attachment=as_attachment, filename=filename, content_type=content_type)
+		# Compressed blobs can't be measured by seeking, so always send the real size.
+		response["Content-Length"] = str(size)
+		return with_validators(response)
+
+	start, end = byte_range
+	length = end - start + 1
+	response = FileResponse(
+		_FileRange(handle, start, length),
+		as_attachment=as_attachment,
+		filename=filename,
+		content_type=content_type,
+		status=206,
+	)
+	response["Content-Length"] = str(length)
+	response["Content-Range"] = f"bytes {start}-{end}/{size}"
+	return with_validators(response)
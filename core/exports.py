@@ -0,0 +1,116 @@
+import zipfile
+
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+from .models import EvaluationFile, ProjectReport
+
+STAGE_ORDER = ["zeroth", "first", "second", "final"]
+UNASSIGNED_FOLDER = "unassigned"
+
+
+class _ZipStream:
+	"""Write-only, unseekable sink for ZipFile; drained after every write."""
+
+	def __init__(self):
+		self.buffer = bytearray()
+
+	def write(self, data):
+		self.buffer += data
+		return len(data)
+
+	def flush(self):
+		pass
+
+	def drain(self):
+		data = bytes(self.buffer)
+		self.buffer.clear()
+		return data
+
+
+def _safe(name):
+	return name.replace("/", "_").replace("\\", "_").strip() or "file"
+
+
+def _class_folder(leader):
+	# Leaders without a student profile or a class still get exported.
+	profile = getattr(leader, "student_profile", None)
+	student_class = profile.student_class if profile else None
+	return _safe(student_class.name) if student_class else UNASSIGNED_FOLDER
+
+
+def _open_evaluation_file(eval_file):
+	if eval_file.file_blob:
+		return eval_file.file_blob.open("rb")
+	# Rows that migrate_blobs has not moved out of the database yet.
+	data = EvaluationFile.objects.with_content().values_list("file_data", flat=True).get(pk=eval_file.pk)
+	return ContentFile(bytes(data or b""))
+
+
+def export_entries(groups):
+	"""List (archive path, modified datetime, opener) for every report and
+	evaluation file of the given groups, laid out as class/group/stage/file.
+	Groups whose leader has no class go under UNASSIGNED_FOLDER.
+
+	Only metadata is loaded here; each file is opened when it is written.
+	"""
+	groups = (
+		groups.select_related("leader", "leader__student_profile__student_class")
+		.order_by("leader__student_profile__student_class__name", "id")
+	)
+	group_by_id = {group.id: group for group in groups}
+	stage_rank = {stage: index for index, stage in enumerate(STAGE_ORDER)}
+
+	files_by_group = {}
+	for eval_file in EvaluationFile.objects.filter(group_id__in=group_by_id).order_by("uploaded_at"):
+		files_by_group.setdefault(eval_file.group_id, []).append(eval_file)
+	report_by_group = {
+		report.group_id: report
+		for report in ProjectReport.objects.filter(group_id__in=group_by_id).exclude(report_file="")
+	}
+
+	entries = []
+	for group in group_by_id.values():
+		folder = f"{_class_folder(group.leader)}/group-{group.id}-{_safe(group.leader.username)}"
+		for eval_file in sorted(files_by_group.get(group.id, []), key=lambda item: stage_rank.get(item.stage, len(STAGE_ORDER))):
+			entries.append((
+				f"{folder}/{eval_file.stage}/{_safe(eval_file.file_name)}",
+				eval_file.uploaded_at,
+				lambda eval_file=eval_file: _open_evaluation_file(eval_file),
+			))
+		report = report_by_group.get(group.id)
+		if report:
+			entries.append((
+				f"{folder}/project-report/{_safe(report.display_filename)}",
+				report.uploaded_at,
+				lambda report=report: report.report_file.open("rb"),
+			))
+	return entries
+
+
+def stream_zip(entries, chunk_size=64 * 1024):
+	"""Yield a ZIP archive of ``entries`` piece by piece.
+
+	The archive is written to an unseekable sink, so ZipFile uses data
+	descriptors instead of seeking back, and every chunk is handed on as soon
+	as it is written: memory use stays at about one chunk whatever the size of
+	the export. Files are stored rather than deflated since PDFs and Office
+	documents are already compressed. Files missing from storage are skipped.
+	"""
+	sink = _ZipStream()
+	with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as archive:
+		for arcname, modified, opener in entries:
+			try:
+				source = opener()
+			except OSError:
+				continue
+			date_time = timezone.localtime(modified).timetuple()[:6] if modified else (1980, 1, 1, 0, 0, 0)
+			with source, archive.open(zipfile.ZipInfo(arcname, date_time=date_time), mode="w") as target:
+				for chunk in source.chunks(chunk_size):
+					target.write(chunk)
+					if sink.buffer:
+						yield sink.drain()
+			if sink.buffer:
+				yield sink.drain()
+	if sink.buffer:
+		yield sink.drain()
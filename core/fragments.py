@@ -0,0 +1,108 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.safestring import mark_safe
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def _version_key(scope, pk):
+	return f"{scope}:{pk}:version"
+
+
+def versions(*keys):
+	"""Current version of each ``(scope, pk)`` in ``keys``, e.g. ``("group", 7)``.
+
+	A version never read before, or evicted, starts at the current time in
+	nanoseconds rather than 0, so it cannot come back to a number that
+	fragments were cached under before.
+	"""
+	names = {_version_key(scope, pk): (scope, pk) for scope, pk in keys}
+	found = cache.get_many(names)
+	missing = {name: time.time_ns() for name in names if name not in found}
+	if missing:
+		cache.set_many(missing, timeout=None)
+		found.update(missing)
+	return {key: found[name] for name, key in names.items()}
+
+
+def bump(scope, pk):
+	"""Move ``(scope, pk)`` to a new version, orphaning the fragments cached under the old one.
+
+	Bumps again when the current transaction commits: a request reading in
+	between would otherwise cache the data from before the commit under
+	the new version.
+	"""
+
+	def incr():
+		try:
+			cache.incr(_version_key(scope, pk))
+		except ValueError:
+			# Never read, so no fragment uses it; the next read starts it.
+			pass
+
+	incr()
+	transaction.on_commit(incr)
+
+
+def _record(name, hits, misses):
+	with _stats_lock:
+		_stats[name, "hits"] += hits
+		_stats[name, "misses"] += misses
+
+
+def fragment_stats():
+	"""Hits and misses of each fragment in this process: ``{name: {"hits": n, "misses": n}}``."""
+	with _stats_lock:
+		names = {name for name, _ in _stats}
+		return {name: {"hits": _stats[name, "hits"], "misses": _stats[name, "misses"]} for name in names}
+
+
+def reset_fragment_stats():
+	with _stats_lock:
+		_stats.clear()
+
+
+def cached_fragments(request, name, parts, render):
+	"""HTML of fragment ``name`` for each of ``parts``, ``(group_id, vary_on)`` pairs, in order.
+
+	A fragment is cached per group and per user, under a key like
+	``group:7:v42:user:3:v9:guide-group:<digest>``; signals bump the group's
+	version when its evaluations, files, abstracts, report or requests
+	change, and the user's when their roles do. The digest covers
+	``vary_on`` and the session's CSRF secret, since fragments hold forms.
+	``render(missing)`` gets the parts with no current fragment and returns
+	their HTML in the same order, or None for a part it cannot render, which
+	is returned as None and not cached. ``FRAGMENT_CACHE_TIMEOUT`` bounds
+	how long a fragment lives; 0 turns the cache off.
+	"""
+	timeout = getattr(settings, "FRAGMENT_CACHE_TIMEOUT", 600)
+	if not timeout:
+		_record(name, 0, len(parts))
+		return [None if html is None else mark_safe(html) for html in render(parts)]
+
+	user_id = request.user.pk
+	current = versions(("user", user_id), *{("group", group_id) for group_id, _ in parts})
+	csrf_secret = request.META.get("CSRF_COOKIE", "")
+	keys = []
+	for group_id, vary_on in parts:
+		digest = hashlib.md5(f"{csrf_secret}:{vary_on}".encode(), usedforsecurity=False).hexdigest()
+		keys.append(
+			f"group:{group_id}:v{current['group', group_id]}:user:{user_id}:v{current['user', user_id]}:{name}:{digest}"
+		)
+
+	found = cache.get_many(keys)
+	missing = [index for index, key in enumerate(keys) if key not in found]
+	if missing:
+		rendered = render([parts[index] for index in missing])
+		fresh = {keys[index]: html for index, html in zip(missing, rendered) if html is not None}
+		cache.set_many(fresh, timeout)
+		found.update(fresh)
+	_record(name, len(keys) - len(missing), len(missing))
+	return [mark_safe(found[key]) if key in found else None for key in keys]
@@ -0,0 +1,270 @@
+from functools import cached_property
+
+from django.contrib.auth.models import User
+from django.db.models import Count, Exists, OuterRef, Prefetch, Q
+from django.db.models.functions import Lower
+
+from .models import CoordinatorApproval, EvaluationFile, Group, GroupEvaluation, GroupMember, GuideRequest, ProjectReport, StudentEvaluation, StudentProfile
+
+STAGES = ("zeroth", "first", "second", "final")
+STUDENT_STAGES = ("first", "second")
+
+# Sorts after every character that can follow a prefix, so
+# prefix <= value < prefix + PREFIX_END is a range an index can serve.
+PREFIX_END = "\U0010ffff"
+
+
+def index_first(rows, key):
+	"""Index rows by ``key(row)``, keeping the first row for each key like ``.first()`` would."""
+	index = {}
+	for row in rows:
+		index.setdefault(key(row), row)
+	return index
+
+
+class EvaluationIndex:
+	"""Evaluation records for a set of groups, one query per model.
+
+	Replaces per-group ``.filter(...).first()`` lookups in the dashboards.
+	``group_ids`` may be a list or a ``values("id")`` queryset, which is then
+	used as a subquery. Group evaluations and files are keyed by
+	``(group_id, stage)``; student evaluations by ``(student_id, stage)`` for
+	every member of those groups.
+	"""
+
+	def __init__(self, group_ids):
+		self.group_evaluations = index_first(
+			GroupEvaluation.objects.filter(group_id__in=group_ids).order_by("id"),
+			lambda evaluation: (evaluation.group_id, evaluation.stage),
+		)
+		# Default ordering is newest first, so each stage keeps its latest upload.
+		self.evaluation_files = index_first(
+			EvaluationFile.objects.filter(group_id__in=group_ids),
+			lambda eval_file: (eval_file.group_id, eval_file.stage),
+		)
+		member_ids = GroupMember.objects.filter(group_id__in=group_ids).values("user_id")
+		self.student_evaluation_rows = list(StudentEvaluation.objects.filter(student_id__in=member_ids).order_by("id"))
+		self.student_evaluations = index_first(
+			self.student_evaluation_rows,
+			lambda evaluation: (evaluation.student_id, evaluation.stage),
+		)
+
+	def group_evaluations_for(self, group_id):
+		return {stage: self.group_evaluations.get((group_id, stage)) for stage in STAGES}
+
+	def evaluation_files_for(self, group_id):
+		return {stage: self.evaluation_files.get((group_id, stage)) for stage in STAGES}
+
+	def student_evaluations_for(self, student_ids):
+		return {
+			stage: {student_id: self.student_evaluations.get((student_id, stage)) for student_id in student_ids}
+			for stage in STUDENT_STAGES
+		}
+
+	def stage_completed(self, group_id, member_ids, stage):
+		"""True when every member has a finalized evaluation of the group for ``stage``."""
+		member_ids = set(member_ids)
+		if not member_ids:
+			return False
+		evaluations = [
+			evaluation for evaluation in self.student_evaluation_rows
+			if evaluation.group_id == group_id and evaluation.stage == stage and evaluation.student_id in member_ids
+		]
+		return len(evaluations) == len(member_ids) and all(evaluation.finalized for evaluation in evaluations)
+
+
+def annotate_group_progress(queryset):
+	"""Annotate groups with the counts the dashboard filters on.
+
+	``member_count``; ``first_finalized`` and ``second_finalized``, the
+	members with a finalized evaluation for that stage; ``ese_ready_members``,
+	the members whose second evaluation meets every ESE prerequisite except
+	the report mark; and ``report_marked``. Compare the counts against
+	``member_count`` to tell whether a stage is complete for the whole group.
+	"""
+	def members_with(stage, **flags):
+		return Count(
+			"student_evaluations__student",
+			filter=Q(student_evaluations__stage=stage, **{f"student_evaluations__{flag}": value for flag, value in flags.items()}),
+			distinct=True,
+		)
+
+	return queryset.annotate(
+		member_count=Count("groupmember", distinct=True),
+		first_finalized=members_with("first", finalized=True),
+		second_finalized=members_with("second", finalized=True),
+		ese_ready_members=members_with(
+			"second",
+			guide_submitted=True,
+			coordinator1_submitted=True,
+			coordinator2_submitted=True,
+			final_guide_submitted=True,
+			attendance_submitted=True,
+			cie_calculated=True,
+		),
+		report_marked=Exists(ProjectReport.objects.filter(group=OuterRef("pk"), final_mark__isnull=False)),
+	)
+
+
+class StudentWorkspace:
+	"""A student's group and everything the student pages show about it.
+
+	The group comes with its members, coordinator approvals, accepted guide,
+	abstracts, SDG and project report in one query plus prefetches;
+	evaluations are loaded on first use through EvaluationIndex. Views get
+	the instance through ``for_request`` so the checks and the page they
+	guard share a single load.
+	"""
+
+	def __init__(self, user):
+		self.user = user
+		self.group = self._load_group(user)
+
+	@classmethod
+	def for_request(cls, request):
+		workspace = getattr(request, "_student_workspace", None)
+		if workspace is None or workspace.user.pk != request.user.pk:
+			workspace = request._student_workspace = cls(request.user)
+		return workspace
+
+	@staticmethod
+	def _load_group(user):
+		groups = (
+			Group.objects.filter(Q(leader=user) | Q(groupmember__user=user))
+			.distinct()
+			.select_related("leader", "sdg", "project_report")
+			.prefetch_related(
+				Prefetch("groupmember_set", queryset=GroupMember.objects.select_related("user").order_by("id")),
+				Prefetch(
+					"coordinator_approvals",
+					queryset=CoordinatorApproval.objects.select_related("coordinator", "coordinator__faculty_profile").order_by("id"),
+				),
+				Prefetch(
+					"guiderequest_set",
+					queryset=GuideRequest.objects.filter(status=GuideRequest.STATUS_ACCEPTED).select_related("guide").order_by("id"),
+					to_attr="accepted_guide_requests",
+				),
+				"abstracts",
+			)
+		)
+		# A group the student leads wins over one they merely belong to.
+		return min(groups, key=lambda group: (group.leader_id != user.pk, group.pk), default=None)
+
+	@property
+	def is_leader(self):
+		return bool(self.group and self.group.leader_id == self.user.pk)
+
+	@property
+	def members(self):
+		return list(self.group.groupmember_set.all()) if self.group else []
+
+	@property
+	def size(self):
+		return len(self.members)
+
+	@property
+	def coordinator_approvals(self):
+		return list(self.group.coordinator_approvals.all()) if self.group else []
+
+	@property
+	def sdg(self):
+		return getattr(self.group, "sdg", None)
+
+	@property
+	def project_report(self):
+		return getattr(self.group, "project_report", None)
+
+	@property
+	def assigned_guide(self):
+		accepted = self.group.accepted_guide_requests if self.group else []
+		return accepted[0].guide if accepted else None
+
+	@property
+	def abstracts(self):
+		"""Newest first, like Abstract's default ordering."""
+		return list(self.group.abstracts.all()) if self.group else []
+
+	@property
+	def selected_topic(self):
+		return next((abstract for abstract in self.abstracts if abstract.is_final_approved), None)
+
+	@cached_property
+	def _evaluations(self):
+		return EvaluationIndex([self.group.pk])
+
+	@property
+	def evaluation_files(self):
+		return self._evaluations.evaluation_files_for(self.group.pk) if self.group else {}
+
+	@property
+	def evaluations(self):
+		return self._evaluations.group_evaluations_for(self.group.pk) if self.group else {}
+
+	@property
+	def student_evaluations(self):
+		"""The student's own first and second evaluation records."""
+		if not self.group:
+			return {}
+		by_stage = self._evaluations.student_evaluations_for([self.user.pk])
+		return {stage: evaluations[self.user.pk] for stage, evaluations in by_stage.items()}
+
+	def stage_completed(self, stage):
+		if not self.group:
+			return False
+		member_ids = [member.user_id for member in self.members]
+		return self._evaluations.stage_completed(self.group.pk, member_ids, stage)
+
+
+def _prefix(key, prefix):
+	return Q(**{f"{key}__gte": prefix, f"{key}__lt": prefix + PREFIX_END})
+
+
+def search_available_students(user, query, after="", limit=20):
+	"""Students not yet in a group whose username, name, roll number or
+	register number starts with ``query``, ignoring case, ordered by username.
+
+	Each field is matched as a range over its LOWER() index (migration 0047)
+	rather than with LIKE, which SQLite cannot serve from an expression
+	index. Students already in a group are excluded with NOT EXISTS probes on
+	the indexed GroupMember.user and Group.leader foreign keys. Pages are
+	keyed on the last username returned; pass it back as ``after``.
+
+	Returns (students, cursor of the next page or None).
+	"""
+	prefix = query.strip().lower()
+	if not prefix:
+		return [], None
+
+	users = User.objects.alias(
+		username_key=Lower("username"),
+		first_name_key=Lower("first_name"),
+		last_name_key=Lower("last_name"),
+	)
+	name_match = _prefix("username_key", prefix) | _prefix("first_name_key", prefix) | _prefix("last_name_key", prefix)
+	first_name, _, last_name = prefix.partition(" ")
+	if last_name.strip():
+		# "jane do" -> first name jane, last name starting with do
+		name_match |= Q(first_name_key=first_name) & _prefix("last_name_key", last_name.strip())
+	profiles = StudentProfile.objects.alias(
+		roll_number_key=Lower("roll_number"),
+		register_number_key=Lower("register_number"),
+	)
+	profile_match = _prefix("roll_number_key", prefix) | _prefix("register_number_key", prefix)
+
+	students = (
+		User.objects.filter(
+			Q(pk__in=users.filter(name_match).values("pk"))
+			| Q(pk__in=profiles.filter(profile_match).values("user_id"))
+		)
+		.filter(student_profile__isnull=False)
+		.exclude(pk=user.pk)
+		.exclude(Exists(GroupMember.objects.filter(user=OuterRef("pk"))))
+		.exclude(Exists(Group.objects.filter(leader=OuterRef("pk"))))
+		.select_related("student_profile")
+		.order_by("username")
+	)
+	if after:
+		students = students.filter(username__gt=after)
+	page = list(students[:limit + 1])
+	next_cursor = page[limit - 1].username if len(page) > limit else None
+	return page[:limit], next_cursor
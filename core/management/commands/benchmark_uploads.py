@@ -0,0 +1,153 @@
+import multiprocessing
+import resource
+import shutil
+import tempfile
+import threading
+import time
+
+from django.core.files.base import ContentFile
+from django.core.files.uploadhandler import MemoryFileUploadHandler
+from django.core.handlers.wsgi import WSGIRequest
+from django.core.management.base import BaseCommand
+
+from core.storage import ContentAddressedStorage
+
+BOUNDARY = 'benchmarkboundary'
+CHUNK = bytes(range(256)) * 256  # 64 KiB of non-trivial data
+
+
+class MultipartStream:
+    """File-like multipart body that generates its payload on demand."""
+
+    def __init__(self, size, seed):
+        self.head = (
+            f'--{BOUNDARY}\r\n'
+            f'Content-Disposition: form-data; name="file"; filename="deck-{seed}.pdf"\r\n'
+            'Content-Type: application/pdf\r\n\r\n'
+        ).encode() + b'%PDF-1.7 ' + str(seed).encode()
+        self.tail = f'\r\n--{BOUNDARY}--\r\n'.encode()
+        self.body_size = size - len(self.head) - len(self.tail)
+        self.length = size
+        self.position = 0
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self.length - self.position
+        out = bytearray()
+        while size > 0 and self.position < self.length:
+            if self.position < len(self.head):
+                piece = self.head[self.position:self.position + size]
+            elif self.position < len(self.head) + self.body_size:
+                offset = self.position - len(self.head)
+                remaining = self.body_size - offset
+                piece = CHUNK[offset % len(CHUNK):][:min(size, remaining)]
+            else:
+                offset = self.position - len(self.head) - self.body_size
+                piece = self.tail[offset:offset + size]
+            out += piece
+            self.position += len(piece)
+            size -= len(piece)
+        return bytes(out)
+
+    def readline(self, size=-1):
+        line = bytearray()
+        while size < 0 or len(line) < size:
+            byte = self.read(1)
+            line += byte
+            if not byte or byte == b'\n':
+                break
+        return bytes(line)
+
+
+def peak_rss_mb():
+    # ru_maxrss is reported in KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def make_request(size, seed):
+    stream = MultipartStream(size, seed)
+    return WSGIRequest({
+        'REQUEST_METHOD': 'POST',
+        'PATH_INFO': '/evaluation/upload/first/',
+        'SERVER_NAME': 'testserver',
+        'SERVER_PORT': '80',
+        'CONTENT_TYPE': f'multipart/form-data; boundary={BOUNDARY}',
+        'CONTENT_LENGTH': str(stream.length),
+        'wsgi.input': stream,
+    })
+
+
+def run_mode(mode, concurrency, size, results):
+    location = tempfile.mkdtemp(prefix='upload-bench-')
+    storage = ContentAddressedStorage(location=location)
+    barrier = threading.Barrier(concurrency)
+    errors = []
+
+    def upload(seed):
+        try:
+            request = make_request(size, seed)
+            if mode == 'memory':
+                # The pre-streaming pipeline: buffer in memory, then read() a copy.
+                request.upload_handlers = [MemoryFileUploadHandler(request)]
+                uploaded = request.FILES['file']
+                content = ContentFile(uploaded.read())
+                barrier.wait()
+                storage.save('upload', content)
+            else:
+                uploaded = request.FILES['file']
+                barrier.wait()
+                storage.save('upload', uploaded)
+                uploaded.close()
+        except Exception as exc:
+            errors.append(repr(exc))
+            barrier.abort()
+
+    baseline = peak_rss_mb()
+    started = time.perf_counter()
+    threads = [threading.Thread(target=upload, args=(seed,)) for seed in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    shutil.rmtree(location, ignore_errors=True)
+    results.put({
+        'mode': mode,
+        'seconds': time.perf_counter() - started,
+        'baseline_mb': baseline,
+        'peak_mb': peak_rss_mb(),
+        'errors': errors,
+    })
+
+
+class Command(BaseCommand):
+    help = 'Compare peak RSS of the streaming upload pipeline against in-memory buffering'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--size-mb', type=float, default=8, help='Size of each upload; keep below FILE_UPLOAD_MAX_MEMORY_SIZE for a fair comparison')
+        parser.add_argument('--mode', choices=['streaming', 'memory', 'both'], default='both')
+
+    def handle(self, *args, **options):
+        size = int(options['size_mb'] * 1024 * 1024)
+        concurrency = options['concurrency']
+        modes = ['streaming', 'memory'] if options['mode'] == 'both' else [options['mode']]
+
+        # Each mode runs in its own process so peak RSS is not shared between them.
+        context = multiprocessing.get_context('fork')
+        for mode in modes:
+            results = context.Queue()
+            process = context.Process(target=run_mode, args=(mode, concurrency, size, results))
+            process.start()
+            result = results.get()
+            process.join()
+
+            growth = result['peak_mb'] - result['baseline_mb']
+            total_mb = concurrency * size / (1024 * 1024)
+            self.stdout.write(
+                f"{mode:>9}: {concurrency} x {options['size_mb']:g} MB ({total_mb:.0f} MB) in {result['seconds']:.2f}s, "
+                f"peak RSS {result['peak_mb']:.0f} MB (+{growth:.0f} MB over baseline)"
+            )
+            for error in result['errors'][:5]:
+                self.stdout.write(self.style.ERROR(f'  {error}'))
+
+        self.stdout.write(self.style.SUCCESS('Done!'))
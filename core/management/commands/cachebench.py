@@ -0,0 +1,175 @@
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import time
+from queue import Empty
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'sqlite': 'core.sqlitecache.SQLiteCache',
+}
+
+# Share of each operation, roughly a dashboard's: mostly fragment and
+# version reads, some fragment writes, a few version bumps.
+MIX = {'get': 80, 'set': 15, 'incr': 5}
+
+COUNTER_KEY = 'cachebench:counter'
+
+
+def _open(backend, location, max_entries):
+    return import_string(BACKENDS[backend])(location, {'TIMEOUT': None, 'OPTIONS': {'MAX_ENTRIES': max_entries}})
+
+
+def run_worker(backend, location, max_entries, worker, options, start, results):
+    """One server process: replay ``options['ops']`` random operations once every worker is ready."""
+    cache = _open(backend, location, max_entries)
+    rng = random.Random(options['seed'] * 1000 + worker)
+    value = os.urandom(options['value_size'])
+    operations = rng.choices(list(MIX), weights=list(MIX.values()), k=options['ops'])
+    keys = [f"cachebench:{rng.randrange(options['keys'])}" for _ in operations]
+    latencies = {operation: [] for operation in MIX}
+    hits = increments = 0
+
+    start.wait()
+    started = time.perf_counter()
+    for operation, key in zip(operations, keys):
+        began = time.perf_counter()
+        if operation == 'get':
+            hits += cache.get(key) is not None
+        elif operation == 'set':
+            cache.set(key, value)
+        else:
+            try:
+                cache.incr(COUNTER_KEY)
+                increments += 1
+            except ValueError:
+                # Not in this process's cache (locmem): start it here.
+                cache.add(COUNTER_KEY, 0)
+                cache.incr(COUNTER_KEY)
+                increments += 1
+        latencies[operation].append(time.perf_counter() - began)
+    results.put((worker, time.perf_counter() - started, hits, increments, latencies))
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the cache backends with several processes sharing one cache, as server workers do'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--backends', nargs='+', choices=sorted(BACKENDS), default=['locmem', 'file', 'sqlite'])
+        parser.add_argument('--workers', type=int, default=8, help='Concurrent processes')
+        parser.add_argument('--ops', type=int, default=5000, help='Operations per process')
+        parser.add_argument('--keys', type=int, default=1000, help='Distinct keys read and written')
+        parser.add_argument('--value-size', type=int, default=2048, help='Bytes per value, about a rendered group panel')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', metavar='FILE', help='Write the results as JSON')
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1 or options['ops'] < 1 or options['keys'] < 1:
+            raise CommandError('--workers, --ops and --keys must be at least 1.')
+        started_at = timezone.now()
+        results = {}
+        directory = tempfile.mkdtemp(prefix='cachebench-')
+        try:
+            for backend in options['backends']:
+                self.stdout.write(f"Running {backend} with {options['workers']} processes x {options['ops']} operations...")
+                results[backend] = self._run(backend, os.path.join(directory, backend), options)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+        self._report(results)
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump({
+                    'started_at': started_at.isoformat(),
+                    'workers': options['workers'],
+                    'ops': options['ops'],
+                    'keys': options['keys'],
+                    'value_size': options['value_size'],
+                    'mix': MIX,
+                    'backends': results,
+                }, handle, indent=2)
+            self.stdout.write(f"Results written to {options['output']}.")
+        self.stdout.write(self.style.SUCCESS('Done!'))
+
+    def _run(self, backend, location, options):
+        # Not at module level: loadtest imports the models, and the spawned
+        # workers import this module without setting Django up.
+        from core.management.commands.loadtest import percentile
+
+        max_entries = options['keys'] * 2
+        if backend == 'sqlite':
+            os.makedirs(location)
+            location = os.path.join(location, 'cache.sqlite3')
+        # Fill the cache first, so reads hit from the start where it is shared.
+        cache = _open(backend, location, max_entries)
+        value = os.urandom(options['value_size'])
+        for key in range(options['keys']):
+            cache.set(f'cachebench:{key}', value)
+        cache.set(COUNTER_KEY, 0)
+
+        # Spawned, not forked: each worker starts with its own empty memory, as
+        # separately started server processes do.
+        context = multiprocessing.get_context('spawn')
+        start = context.Barrier(options['workers'])
+        queue = context.Queue()
+        processes = [
+            context.Process(target=run_worker, args=(backend, location, max_entries, worker, options, start, queue))
+            for worker in range(options['workers'])
+        ]
+        for process in processes:
+            process.start()
+        finished = []
+        while len(finished) < len(processes):
+            try:
+                finished.append(queue.get(timeout=1))
+            except Empty:
+                if any(process.exitcode for process in processes):
+                    for process in processes:
+                        process.terminate()
+                    raise CommandError(f'A {backend} worker failed; see its traceback above.')
+        for process in processes:
+            process.join()
+
+        elapsed = max(seconds for _, seconds, _, _, _ in finished)
+        gets = sum(len(latencies['get']) for _, _, _, _, latencies in finished)
+        increments = sum(count for _, _, _, count, _ in finished)
+        counter = _open(backend, location, max_entries).get(COUNTER_KEY)
+        summary = {
+            'elapsed': elapsed,
+            'throughput': options['workers'] * options['ops'] / elapsed if elapsed else 0,
+            'hit_rate': sum(hits for _, _, hits, _, _ in finished) / gets if gets else None,
+            # What another process reads back: the increments every worker made
+            # when the cache is shared and incr() atomic.
+            'increments': increments,
+            'counter': counter,
+        }
+        for operation in MIX:
+            latencies = sorted(seconds * 1e6 for _, _, _, _, by_operation in finished for seconds in by_operation[operation])
+            summary[operation] = {
+                'count': len(latencies),
+                'p50_us': percentile(latencies, 50),
+                'p99_us': percentile(latencies, 99),
+            }
+        return summary
+
+    def _report(self, results):
+        header = f"{'backend':<8} {'ops/s':>10} {'hit rate':>8}"
+        for operation in MIX:
+            header += f" {operation + ' p50':>9} {operation + ' p99':>9}"
+        self.stdout.write(header + f" {'counter':>15}")
+        for backend, stats in results.items():
+            line = f"{backend:<8} {stats['throughput']:>10.0f} {stats['hit_rate'] or 0:>8.1%}"
+            for operation in MIX:
+                line += f" {stats[operation]['p50_us'] or 0:>9.1f} {stats[operation]['p99_us'] or 0:>9.1f}"
+            counter = f"{stats['counter']}/{stats['increments']}"
+            line += f" {counter:>15}"
+            self.stdout.write(self.style.ERROR(line) if stats['counter'] != stats['increments'] else line)
+        self.stdout.write('Latencies in microseconds; counter is the shared count read back / increments made.')
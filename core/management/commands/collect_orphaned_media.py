@@ -0,0 +1,145 @@
+import os
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models
+
+from core.management.commands.dedupe_blobs import format_bytes
+from core.models import StoredBlob
+from core.storage import ContentAddressedStorage, digest_from_name, is_blob_name
+
+
+def scan_directory(path):
+    """Return (files, subdirectories) of one directory; files are (path, size, mtime)."""
+    files = []
+    subdirectories = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirectories.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    stat = entry.stat(follow_symlinks=False)
+                    files.append((entry.path, stat.st_size, stat.st_mtime))
+    except FileNotFoundError:
+        pass
+    return files, subdirectories
+
+
+class Command(BaseCommand):
+    help = 'Find media files no FileField refers to and delete or quarantine them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only list orphans')
+        parser.add_argument('--quarantine', metavar='DIR', help='Move orphans under DIR instead of deleting them')
+        parser.add_argument('--workers', type=int, default=8, help='Directories scanned (and files removed) concurrently')
+        parser.add_argument('--min-age-hours', type=float, default=24, help='Ignore files modified more recently than this, e.g. uploads still in flight')
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        cutoff = time.time() - options['min_age_hours'] * 3600
+        started = time.perf_counter()
+
+        roots = self._roots()
+        referenced = self._referenced_names()
+        tracked_digests = set(StoredBlob.objects.values_list('digest', flat=True))
+        self.stdout.write(f'{len(referenced)} referenced files, walking {len(roots)} directories with {workers} workers...')
+
+        scanned = scanned_bytes = directories = 0
+        orphans = []
+        tracked = recent = 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = {pool.submit(scan_directory, path): location for path, location in roots.items()}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    location = pending.pop(future)
+                    files, subdirectories = future.result()
+                    directories += 1
+                    for path in subdirectories:
+                        pending[pool.submit(scan_directory, path)] = location
+                    for path, size, mtime in files:
+                        scanned += 1
+                        scanned_bytes += size
+                        name = os.path.relpath(path, location).replace(os.sep, '/')
+                        if name in referenced:
+                            continue
+                        if is_blob_name(name) and digest_from_name(name) in tracked_digests:
+                            # Unreferenced blobs with a StoredBlob row are reclaimed by
+                            # dedupe_blobs once their grace period is over.
+                            tracked += 1
+                            continue
+                        if mtime > cutoff:
+                            recent += 1
+                            continue
+                        orphans.append((path, name, size, location))
+
+            orphan_bytes = sum(size for _, _, size, _ in orphans)
+            for path, name, size, _ in orphans:
+                self.stdout.write(f'  orphan: {path} ({format_bytes(size)})')
+
+            removed = 0
+            if not options['dry_run'] and orphans:
+                quarantine = options['quarantine']
+                removed = sum(pool.map(lambda orphan: self._remove(orphan, quarantine), orphans))
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'Scanned {scanned} files ({format_bytes(scanned_bytes)}) in {directories} directories in {elapsed:.2f}s: '
+            f'{scanned / elapsed if elapsed else 0:.0f} files/s, {format_bytes(int(scanned_bytes / elapsed) if elapsed else 0)}/s'
+        )
+        self.stdout.write(f'Skipped {tracked} blobs awaiting dedupe_blobs and {recent} files newer than the minimum age.')
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'Done! Would remove {len(orphans)} orphans ({format_bytes(orphan_bytes)}).'))
+        else:
+            verb = 'Quarantined' if options['quarantine'] else 'Deleted'
+            self.stdout.write(self.style.SUCCESS(f'Done! {verb} {removed} orphans ({format_bytes(orphan_bytes)}).'))
+
+    def _file_fields(self):
+        for model in apps.get_models():
+            for field in model._meta.concrete_fields:
+                if isinstance(field, models.FileField):
+                    yield model, field
+
+    def _roots(self):
+        """Map each directory to walk onto the storage location its names are relative to."""
+        roots = {}
+        for model, field in self._file_fields():
+            storage = field.storage
+            location = os.path.abspath(storage.location)
+            if isinstance(storage, ContentAddressedStorage):
+                roots[location] = location
+            elif isinstance(field.upload_to, str) and field.upload_to:
+                roots[os.path.join(location, field.upload_to.split('%', 1)[0])] = location
+            else:
+                raise CommandError(f'{model.__name__}.{field.name} has no fixed upload_to directory to walk.')
+            if storage is not default_storage and isinstance(field.upload_to, str) and field.upload_to:
+                # Files stored before the field moved to its own storage (see migrate_blobs).
+                default_location = os.path.abspath(default_storage.location)
+                roots[os.path.join(default_location, field.upload_to)] = default_location
+        return {path.rstrip(os.sep): location for path, location in roots.items() if os.path.isdir(path)}
+
+    def _referenced_names(self):
+        referenced = set()
+        for model, field in self._file_fields():
+            names = model._base_manager.exclude(**{field.attname: ''}).values_list(field.attname, flat=True)
+            referenced.update(names.iterator(chunk_size=2000))
+        return referenced
+
+    def _remove(self, orphan, quarantine):
+        path, name, _, _ = orphan
+        try:
+            if quarantine:
+                target = os.path.join(quarantine, name)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.move(path, target)
+            else:
+                os.unlink(path)
+        except OSError as exc:
+            self.stderr.write(f'  could not remove {path}: {exc}')
+            return 0
+        return 1
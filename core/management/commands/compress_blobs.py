@@ -0,0 +1,81 @@
+import os
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.management.commands.dedupe_blobs import format_bytes
+from core.models import BLOB_REFERENCES, CODEC_GZIP, EvaluationFile, StoredBlob
+from core.storage import GZIP_SUFFIX, PRECOMPRESSED_KINDS, blob_storage, digest_from_name
+from core.uploads import sniff_kind
+
+
+class Command(BaseCommand):
+    help = 'Gzip stored blobs that compress well and report the compression ratio across existing rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report, do not compress anything')
+
+    def handle(self, *args, **options):
+        if not options['dry_run']:
+            self._compress_existing()
+        self._report()
+        self.stdout.write(self.style.SUCCESS('Done!'))
+
+    def _compress_existing(self):
+        compressed = 0
+        skipped = 0
+        for blob in StoredBlob.objects.filter(codec='').order_by('digest').iterator():
+            raw_name = blob.name
+            raw_path = blob_storage.path(raw_name)
+            if not os.path.exists(raw_path):
+                continue
+            with open(raw_path, 'rb') as handle:
+                kind = sniff_kind(handle.read(16))
+            if kind in PRECOMPRESSED_KINDS:
+                skipped += 1
+                continue
+            compressed_path = blob_storage.compress_file(raw_path)
+            if not compressed_path:
+                skipped += 1
+                continue
+
+            new_name = raw_name + GZIP_SUFFIX
+            os.replace(compressed_path, raw_path + GZIP_SUFFIX)
+            with transaction.atomic():
+                for model, field_name in BLOB_REFERENCES.items():
+                    model._base_manager.filter(**{field_name: raw_name}).update(**{field_name: new_name})
+                StoredBlob.objects.filter(digest=blob.digest).update(codec=CODEC_GZIP)
+                transaction.on_commit(lambda name=raw_name: blob_storage.delete(name))
+            compressed += 1
+
+        self.stdout.write(f'Compressed {compressed} blobs, left {skipped} as they were.')
+
+    def _report(self):
+        blobs = {}
+        for blob in StoredBlob.objects.all():
+            path = blob_storage.path(blob.name)
+            blobs[blob.digest] = (blob.size, os.path.getsize(path) if os.path.exists(path) else 0)
+
+        totals = defaultdict(lambda: [0, 0, 0])
+        rows = EvaluationFile.objects.exclude(file_blob='').values_list('file_name', 'file_blob')
+        for file_name, name in rows:
+            original, stored = blobs.get(digest_from_name(name), (0, 0))
+            extension = os.path.splitext(file_name)[1].lower() or '(none)'
+            for key in (extension, 'all evaluation files'):
+                totals[key][0] += 1
+                totals[key][1] += original
+                totals[key][2] += stored
+
+        self.stdout.write('Evaluation files by type (rows, original, stored, ratio):')
+        for key in sorted(totals, key=lambda key: (key == 'all evaluation files', key)):
+            count, original, stored = totals[key]
+            ratio = original / stored if stored else 1
+            self.stdout.write(f'  {key:<22} {count:>6} {format_bytes(original):>10} {format_bytes(stored):>10} {ratio:>6.2f}x')
+
+        original = sum(size for size, _ in blobs.values())
+        stored = sum(size for _, size in blobs.values())
+        ratio = original / stored if stored else 1
+        self.stdout.write(self.style.SUCCESS(
+            f'All unique blobs: {format_bytes(original)} -> {format_bytes(stored)} on disk ({ratio:.2f}x)'
+        ))
@@ -0,0 +1,76 @@
+import os
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import StoredBlob
+from core.storage import blob_storage
+
+
+def format_bytes(size):
+    if size < 1024:
+        return f'{size} B'
+    for unit in ('KB', 'MB', 'GB'):
+        size /= 1024
+        if size < 1024 or unit == 'GB':
+            return f'{size:.1f} {unit}'
+
+
+class Command(BaseCommand):
+    help = 'Rebuild blob reference counts, report storage saved by deduplication and reclaim unreferenced blobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reclaim', action='store_true', help='Delete blobs that have been unreferenced for longer than the grace period')
+        parser.add_argument('--grace-hours', type=float, default=24, help='How long an unreferenced blob is kept before it may be deleted')
+        parser.add_argument('--dry-run', action='store_true', help='With --reclaim, only list what would be deleted')
+
+    def handle(self, *args, **options):
+        counts = StoredBlob.recount()
+        sizes = dict(StoredBlob.objects.filter(digest__in=list(counts)).values_list('digest', 'size'))
+
+        references = sum(counts.values())
+        logical = sum(sizes.get(digest, 0) * refs for digest, refs in counts.items())
+        stored = sum(sizes.values())
+        reclaimed = logical - stored
+        shared = sum(1 for refs in counts.values() if refs > 1)
+
+        self.stdout.write(f'References:        {references}')
+        self.stdout.write(f'Unique blobs:      {len(counts)} ({shared} shared by more than one row)')
+        self.stdout.write(f'Without dedupe:    {format_bytes(logical)}')
+        self.stdout.write(f'Stored on disk:    {format_bytes(stored)}')
+        percent = 100 * reclaimed / logical if logical else 0
+        self.stdout.write(self.style.SUCCESS(f'Reclaimed:         {format_bytes(reclaimed)} ({percent:.1f}%)'))
+
+        orphans = StoredBlob.objects.filter(ref_count=0)
+        self.stdout.write(f'Unreferenced:      {orphans.count()} blobs')
+
+        if options['reclaim']:
+            self._reclaim(timezone.now() - timedelta(hours=options['grace_hours']), options['dry_run'])
+
+        self.stdout.write(self.style.SUCCESS('Done!'))
+
+    def _reclaim(self, cutoff, dry_run):
+        deleted = 0
+        freed = 0
+        for blob in StoredBlob.objects.filter(ref_count=0, orphaned_at__lt=cutoff).order_by('orphaned_at'):
+            path = blob_storage.path(blob.name)
+            if dry_run:
+                self.stdout.write(f'  Would delete {blob.name} ({format_bytes(blob.size)})')
+                continue
+            with transaction.atomic():
+                # Re-check under the row lock: an upload may have referenced it again.
+                if not StoredBlob.objects.select_for_update().filter(pk=blob.pk, ref_count=0).exists():
+                    continue
+                if os.path.exists(path) and os.path.getmtime(path) > cutoff.timestamp():
+                    # Identical bytes were uploaded again after the blob was orphaned;
+                    # the row referencing them may not be committed yet.
+                    continue
+                StoredBlob.objects.filter(pk=blob.pk).delete()
+                blob_storage.delete(blob.name)
+            deleted += 1
+            freed += blob.size
+
+        if not dry_run:
+            self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} unreferenced blobs, freeing {format_bytes(freed)}.'))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.exports import export_entries, stream_zip
+from core.models import Class, Group
+
+
+class Command(BaseCommand):
+    help = 'Write every project report and evaluation file of the selected classes to a ZIP, organized by class/group/stage'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='Path of the ZIP file to write')
+        parser.add_argument('--department', help='Only classes of this department')
+        parser.add_argument('--class', dest='class_names', action='append', default=[], help='Only this class (repeatable)')
+
+    def handle(self, *args, **options):
+        classes = Class.objects.order_by('department', 'name')
+        if options['department']:
+            classes = classes.filter(department=options['department'])
+        if options['class_names']:
+            classes = classes.filter(name__in=options['class_names'])
+        classes = list(classes)
+        if not classes:
+            raise CommandError('No matching classes.')
+
+        entries = export_entries(Group.objects.filter(leader__student_profile__student_class__in=classes))
+        written = 0
+        with open(options['output'], 'wb') as archive:
+            for chunk in stream_zip(entries):
+                archive.write(chunk)
+                written += len(chunk)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done! Wrote {len(entries)} files from {len(classes)} classes to {options['output']} ({written} bytes)."
+        ))
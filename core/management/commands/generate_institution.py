@@ -0,0 +1,509 @@
+import random
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import (
+    Abstract,
+    Class,
+    CoordinatorApproval,
+    CoordinatorAssignment,
+    FacultyProfile,
+    Group,
+    GroupEvaluation,
+    GroupMember,
+    GroupRequest,
+    GuideRequest,
+    ProjectReport,
+    StoredBlob,
+    StudentEvaluation,
+    StudentProfile,
+    SustainableDevelopmentGoal,
+)
+from core.storage import blob_storage
+
+DEPARTMENTS = ['CSE', 'ECE', 'EEE', 'ME', 'CE', 'IT', 'AD', 'CY']
+FIRST_NAMES = [
+    'Aarav', 'Aditi', 'Akhil', 'Amala', 'Anand', 'Anjali', 'Arjun', 'Devika', 'Farhan', 'Gayathri',
+    'Gokul', 'Hari', 'Irfan', 'Jyothi', 'Karthik', 'Lakshmi', 'Manu', 'Meera', 'Nandana', 'Nikhil',
+    'Priya', 'Rahul', 'Reshma', 'Rohan', 'Sandra', 'Sneha', 'Sreya', 'Varun', 'Vishnu', 'Yedu',
+]
+LAST_NAMES = ['A', 'B', 'George', 'K R', 'Kumar', 'M', 'Menon', 'Nair', 'P S', 'Pillai', 'R', 'S', 'Thomas', 'V', 'Varghese']
+TOPICS = [
+    'Crop disease detection', 'Campus navigation', 'Blood bank network', 'Waste segregation', 'Traffic signal control',
+    'Exam seat allocation', 'Water quality monitoring', 'Sign language translation', 'Energy usage dashboard',
+    'Library recommendation', 'Flood early warning', 'Hostel mess planner', 'Air quality mapping', 'Lost and found',
+]
+
+# Where each generated group is in the project workflow, and how often it occurs.
+LIFECYCLE = [
+    ('forming', 1),
+    ('awaiting_coordinator', 1),
+    ('awaiting_guide', 1),
+    ('abstract_review', 1),
+    ('first_evaluation', 2),
+    ('second_evaluation', 2),
+    ('report_review', 1),
+    ('cie_calculated', 1),
+    ('ese_completed', 2),
+]
+STATE_ORDER = {state: index for index, (state, _) in enumerate(LIFECYCLE)}
+
+GROUP_STAGES = ['zeroth', 'first', 'second', 'final']
+# Group evaluation stages completed by groups in each state from first_evaluation on.
+COMPLETED_GROUP_STAGES = {
+    'first_evaluation': 1,
+    'second_evaluation': 2,
+    'report_review': 3,
+    'cie_calculated': 3,
+    'ese_completed': 4,
+}
+
+# Student evaluation criteria and their maximum marks, as field suffixes.
+REVIEW_CRITERIA = [
+    ('topic', 5), ('planning', 5), ('scalability', 2), ('novelty', 5), ('task_distribution', 5),
+    ('schedule', 3), ('interim', 5), ('presentation', 5), ('viva', 5),
+]
+FINAL_GUIDE_CRITERIA = [
+    ('topic', 5), ('planning', 5), ('scale', 2), ('novelty', 5), ('task', 5),
+    ('schedule', 3), ('interim', 5), ('presentation', 5), ('viva', 5),
+]
+ESE_CRITERIA = [('presentation', 30), ('demo', 20), ('viva', 25)]
+
+
+def synthetic_pdf(text, pages=1):
+    """A small, valid PDF with one line of ``text`` on every page."""
+    escaped = text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)').encode()
+    content = b'BT /F1 12 Tf 72 720 Td (' + escaped + b') Tj ET'
+    kids = b' '.join(b'%d 0 R' % (4 + page) for page in range(pages))
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [' + kids + b'] /Count %d >>' % pages,
+        b'<< /Length %d >>\nstream\n' % len(content) + content + b'\nendstream',
+    ]
+    objects += [b'<< /Type /Page /Parent 2 0 R /Contents 3 0 R >>'] * pages
+    out = b'%PDF-1.4\n'
+    for number, body in enumerate(objects, start=1):
+        out += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    return out + b'trailer\n<< /Root 1 0 R >>\n%%EOF\n'
+
+
+def give_marks(rng, evaluation, prefix, criteria):
+    """Set random marks for ``criteria`` on ``evaluation``, in the upper half of each range."""
+    for name, maximum in criteria:
+        setattr(evaluation, f'{prefix}_{name}', rng.randint(maximum // 2, maximum))
+
+
+class Command(BaseCommand):
+    help = 'Generate a synthetic institution (departments, faculty, students, groups in every workflow state) for benchmarking'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=2000, help='Students across all departments')
+        parser.add_argument('--departments', type=int, default=4)
+        parser.add_argument('--classes', type=int, default=2, help='Classes per department')
+        parser.add_argument('--faculty', type=int, default=12, help='Faculty per department: one HOD, two coordinators per class, the rest guides')
+        parser.add_argument('--seed', type=int, default=0, help='Same seed, same institution')
+        parser.add_argument('--prefix', default='gen', help='Prefix of every generated username, class and department')
+        parser.add_argument('--password', default='password', help='Password of every generated user')
+        parser.add_argument('--pdf-payloads', type=int, default=0, metavar='N', help='Give abstracts one of N distinct PDFs in the blob store (0: metadata only)')
+        parser.add_argument('--replace', action='store_true', help='Delete data generated earlier with the same prefix first')
+
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+        if options['departments'] < 1 or options['classes'] < 1:
+            raise CommandError('Generate at least one department with one class.')
+        if options['faculty'] < 2 * options['classes'] + 2:
+            raise CommandError('Each department needs a HOD, two coordinators per class and at least one guide.')
+
+        existing = User.objects.filter(username__startswith=f'{prefix}-').exists() or Class.objects.filter(name__startswith=f'{prefix}-').exists()
+        if existing and not options['replace']:
+            raise CommandError(f'Data with prefix "{prefix}" already exists; pass --replace or choose another --prefix.')
+
+        started = time.perf_counter()
+        self.rng = random.Random(options['seed'])
+        self.prefix = prefix
+        self.now = timezone.now()
+        # Hashing is deliberately slow; every generated user shares one hash.
+        self.password = make_password(options['password'])
+
+        with transaction.atomic():
+            if existing:
+                User.objects.filter(username__startswith=f'{prefix}-').delete()
+                Class.objects.filter(name__startswith=f'{prefix}-').delete()
+            self.counts = {}
+            departments = self._departments(options['departments'], options['classes'], options['faculty'], options['students'])
+            self._payloads(options['pdf_payloads'])
+            for department in departments:
+                self._groups(department)
+            self._workflow(departments)
+        StoredBlob.recount()
+
+        elapsed = time.perf_counter() - started
+        summary = ', '.join(f'{count} {label}' for label, count in self.counts.items())
+        self.stdout.write(summary)
+        self.stdout.write(self.style.SUCCESS(f'Done! Generated in {elapsed:.1f}s; every user\'s password is "{options["password"]}".'))
+
+    def _create(self, label, objects):
+        """bulk_create ``objects``, count them under ``label`` and return them with primary keys set."""
+        if objects:
+            type(objects[0]).objects.bulk_create(objects, batch_size=2000)
+        self.counts[label] = self.counts.get(label, 0) + len(objects)
+        return objects
+
+    def _users(self, usernames):
+        users = [
+            User(
+                username=username,
+                first_name=self.rng.choice(FIRST_NAMES),
+                last_name=self.rng.choice(LAST_NAMES),
+                email=f'{username}@example.edu',
+                password=self.password,
+                date_joined=self.now,
+            )
+            for username in usernames
+        ]
+        self._create('users', users)
+        if users and users[0].pk is None:
+            # Backends that cannot return ids from a bulk insert.
+            ids = dict(User.objects.filter(username__in=usernames).values_list('username', 'id'))
+            for user in users:
+                user.pk = ids[user.username]
+        return users
+
+    def _departments(self, count, classes_per_department, faculty_per_department, students):
+        codes = [DEPARTMENTS[index] if index < len(DEPARTMENTS) else f'D{index + 1}' for index in range(count)]
+        departments = [{'code': code, 'name': f'{self.prefix.upper()}-{code}'} for code in codes]
+
+        classes = self._create('classes', [
+            Class(name=f'{self.prefix}-{department["code"]}-{chr(ord("A") + index)}', department=department['name'])
+            for department in departments
+            for index in range(classes_per_department)
+        ])
+
+        faculty_names = [
+            f'{self.prefix}-{department["code"].lower()}-f{index:03d}'
+            for department in departments
+            for index in range(faculty_per_department)
+        ]
+        faculty = self._users(faculty_names)
+        profiles = []
+        for department_index, department in enumerate(departments):
+            members = faculty[department_index * faculty_per_department:(department_index + 1) * faculty_per_department]
+            department['classes'] = classes[department_index * classes_per_department:(department_index + 1) * classes_per_department]
+            department['hod'] = members[0]
+            coordinators = members[1:1 + 2 * classes_per_department]
+            department['coordinators'] = {
+                student_class.pk: coordinators[2 * index:2 * index + 2]
+                for index, student_class in enumerate(department['classes'])
+            }
+            # Every other coordinator also guides, so dual-role faculty exist.
+            department['guides'] = coordinators[1::2] + members[1 + 2 * classes_per_department:]
+            for index, user in enumerate(members):
+                profiles.append(FacultyProfile(
+                    user=user,
+                    department=department['name'],
+                    is_hod=index == 0,
+                    is_coordinator=user in coordinators,
+                    is_guide=user in department['guides'],
+                ))
+        self._create('faculty profiles', profiles)
+        self._create('coordinator assignments', [
+            CoordinatorAssignment(faculty=coordinator, student_class_id=class_id, slot=slot)
+            for department in departments
+            for class_id, coordinators in department['coordinators'].items()
+            for slot, coordinator in enumerate(coordinators, 1)
+        ])
+        # bulk_create sends no post_save.
+        CoordinatorAssignment.forget_slots()
+
+        # Spread the students evenly over every class of every department.
+        class_count = count * classes_per_department
+        sizes = [students // class_count + (1 if index < students % class_count else 0) for index in range(class_count)]
+        usernames = []
+        for department_index, department in enumerate(departments):
+            total = sum(sizes[department_index * classes_per_department:(department_index + 1) * classes_per_department])
+            usernames += [f'{self.prefix}-{department["code"].lower()}-s{number:05d}' for number in range(1, total + 1)]
+        users = iter(self._users(usernames))
+
+        profiles = []
+        for department_index, department in enumerate(departments):
+            department['students'] = []
+            number = 0
+            for class_index, student_class in enumerate(department['classes']):
+                class_students = [next(users) for _ in range(sizes[department_index * classes_per_department + class_index])]
+                for user in class_students:
+                    number += 1
+                    profiles.append(StudentProfile(
+                        user=user,
+                        student_class=student_class,
+                        department=department['name'],
+                        roll_number=f'{department["code"]}{number:04d}',
+                        register_number=f'{self.prefix.upper()}{department["code"]}{number:05d}',
+                        cgp=f'{self.rng.uniform(5, 10):.2f}',
+                    ))
+                department['students'].append((student_class, class_students))
+        self._create('student profiles', profiles)
+        return departments
+
+    def _payloads(self, count):
+        """Write the PDFs that generated abstracts and reports share to the blob store once."""
+        self.abstract_pdfs = []
+        for index in range(count):
+            content = synthetic_pdf(f'{self.prefix} abstract {index}', pages=1 + index % 4)
+            self.abstract_pdfs.append((blob_storage.save('abstracts/abstract.pdf', ContentFile(content)), len(content)))
+        # Project reports need a file whatever --pdf-payloads says.
+        self.report_pdf = blob_storage.save('project_reports/report.pdf', ContentFile(synthetic_pdf(f'{self.prefix} project report', pages=12)))
+
+    def _groups(self, department):
+        """Split every class into groups of four or five, leaving a few students free to invite."""
+        department['groups'] = []
+        states, weights = zip(*LIFECYCLE)
+        for student_class, students in department['students']:
+            students = list(students)
+            self.rng.shuffle(students)
+            free = max(1, len(students) // 25)
+            department.setdefault('free', []).extend(students[:free])
+            students = students[free:]
+            while len(students) >= 4:
+                size = 5 if len(students) >= 9 and self.rng.random() < 0.4 else 4
+                members, students = students[:size], students[size:]
+                state = self.rng.choices(states, weights)[0]
+                if state == 'forming':
+                    # Still gathering members: the rest are free again.
+                    keep = self.rng.randint(2, 3)
+                    department['free'].extend(members[keep:])
+                    members = members[:keep]
+                department['groups'].append({'class': student_class, 'members': members, 'state': state})
+            department['free'].extend(students)
+
+    def _workflow(self, departments):
+        plans = [(department, plan) for department in departments for plan in department['groups']]
+        groups = self._create('groups', [Group(leader=plan['members'][0]) for _, plan in plans])
+        for (_, plan), group in zip(plans, groups):
+            plan['group'] = group
+
+        rows = {model: [] for model in (
+            GroupMember, GroupRequest, CoordinatorApproval, GuideRequest, Abstract,
+            SustainableDevelopmentGoal, GroupEvaluation, ProjectReport, StudentEvaluation,
+        )}
+        guide_turn = {}
+        for department, plan in plans:
+            group = plan['group']
+            reached = STATE_ORDER[plan['state']]
+            rows[GroupMember] += [GroupMember(group=group, user=member) for member in plan['members']]
+
+            if plan['state'] == 'forming' and department['free']:
+                invitee = department['free'][self.rng.randrange(len(department['free']))]
+                rows[GroupRequest].append(GroupRequest(sender=group.leader, recipient=invitee))
+                continue
+            if reached < STATE_ORDER['awaiting_coordinator']:
+                continue
+
+            coordinators = department['coordinators'][plan['class'].pk]
+            for index, coordinator in enumerate(coordinators):
+                approved = reached > STATE_ORDER['awaiting_coordinator'] and (index == 0 or self.rng.random() < 0.5)
+                rows[CoordinatorApproval].append(CoordinatorApproval(
+                    group=group,
+                    coordinator=coordinator,
+                    status=CoordinatorApproval.STATUS_APPROVED if approved else CoordinatorApproval.STATUS_PENDING,
+                ))
+            if reached < STATE_ORDER['awaiting_guide']:
+                continue
+
+            # Round-robin so guides carry similar loads, as the department would assign them.
+            turn = guide_turn.get(department['name'], 0)
+            guide_turn[department['name']] = turn + 1
+            guide = department['guides'][turn % len(department['guides'])]
+            accepted = reached > STATE_ORDER['awaiting_guide']
+            rows[GuideRequest].append(GuideRequest(
+                group=group,
+                guide=guide,
+                message='We would like you to guide our mini project.',
+                status=GuideRequest.STATUS_ACCEPTED if accepted else GuideRequest.STATUS_PENDING,
+            ))
+            if not accepted:
+                continue
+
+            rows[Abstract] += self._abstracts(group, guide, reached)
+            if reached < STATE_ORDER['first_evaluation']:
+                continue
+
+            goals = self.rng.sample(range(1, 18), self.rng.choice((4, 5)))
+            rows[SustainableDevelopmentGoal].append(SustainableDevelopmentGoal(
+                group=group,
+                submitted_by=group.leader,
+                is_submitted=True,
+                **{f'sdg{index}': str(goal) for index, goal in enumerate(goals, start=1)},
+                **{f'sdg{index}_justification': 'Addresses this goal directly.' for index in range(1, len(goals) + 1)},
+            ))
+            rows[GroupEvaluation] += self._group_evaluations(group, plan['state'])
+            report = None
+            if reached >= STATE_ORDER['report_review']:
+                report = self._report(group, coordinators, reached)
+                rows[ProjectReport].append(report)
+            rows[StudentEvaluation] += self._student_evaluations(group, plan['members'], coordinators, reached, report)
+
+        labels = {
+            GroupMember: 'group members',
+            GroupRequest: 'group requests',
+            CoordinatorApproval: 'coordinator approvals',
+            GuideRequest: 'guide requests',
+            Abstract: 'abstracts',
+            SustainableDevelopmentGoal: 'SDG submissions',
+            GroupEvaluation: 'group evaluations',
+            ProjectReport: 'project reports',
+            StudentEvaluation: 'student evaluations',
+        }
+        for model, objects in rows.items():
+            self._create(labels[model], objects)
+
+    def _abstracts(self, group, guide, reached):
+        abstracts = []
+
+        def abstract(**fields):
+            topic = self.rng.choice(TOPICS)
+            pdf, size = self.rng.choice(self.abstract_pdfs) if self.abstract_pdfs else ('', None)
+            return Abstract(
+                group=group,
+                title=f'{topic} for group {group.pk}',
+                abstract_text=f'A system for {topic.lower()} built as a mini project.',
+                pdf_blob=pdf,
+                pdf_filename='abstract.pdf' if pdf else None,
+                pdf_size=size,
+                **fields,
+            )
+
+        if self.rng.random() < 0.3:
+            abstracts.append(abstract(
+                status=Abstract.STATUS_REJECTED,
+                guide_status=Abstract.STATUS_REJECTED,
+                feedback='Narrow the scope and add a plan for evaluation.',
+                reviewed_at=self.now,
+                reviewed_by=guide,
+            ))
+        if reached == STATE_ORDER['abstract_review']:
+            guide_approved = self.rng.random() < 0.5
+            abstracts.append(abstract(
+                guide_status=Abstract.STATUS_APPROVED if guide_approved else Abstract.STATUS_PENDING,
+                reviewed_at=self.now if guide_approved else None,
+                reviewed_by=guide if guide_approved else None,
+            ))
+        else:
+            later = reached >= STATE_ORDER['cie_calculated']
+            abstracts.append(abstract(
+                status=Abstract.STATUS_APPROVED,
+                guide_status=Abstract.STATUS_APPROVED,
+                coordinator_status=Abstract.STATUS_APPROVED,
+                coordinator1_status=Abstract.STATUS_APPROVED,
+                hod_status=Abstract.STATUS_APPROVED if later else Abstract.STATUS_PENDING,
+                presentation_approved=later,
+                final_approved=reached == STATE_ORDER['ese_completed'],
+                is_final_approved=True,
+                reviewed_at=self.now,
+                reviewed_by=guide,
+            ))
+        return abstracts
+
+    def _group_evaluations(self, group, state):
+        # Stages behind the group are complete; the guide has reviewed the current one.
+        completed = COMPLETED_GROUP_STAGES[state]
+        evaluations = []
+        for index, stage in enumerate(GROUP_STAGES[:completed + 1]):
+            done = index < completed
+            evaluations.append(GroupEvaluation(
+                group=group,
+                stage=stage,
+                guide_technical_exposure=done,
+                guide_socially_relevant=done and self.rng.random() < 0.5,
+                guide_review='Steady progress.' if done else None,
+                guide_submitted=True,
+                coordinator1_submitted=done,
+                coordinator2_submitted=done and stage != 'zeroth',
+                coordinator_submitted=done,
+            ))
+        return evaluations
+
+    def _report(self, group, coordinators, reached):
+        marked = reached >= STATE_ORDER['cie_calculated']
+        first_mark = self.rng.randint(6, 10)
+        second_mark = self.rng.randint(6, 10) if marked else None
+        return ProjectReport(
+            group=group,
+            report_file=self.report_pdf,
+            report_filename=f'group-{group.pk}-report.pdf',
+            uploaded_by=group.leader,
+            review_status=ProjectReport.STATUS_APPROVED if marked else ProjectReport.STATUS_PENDING,
+            coordinator1_mark=first_mark,
+            coordinator1_submitted=True,
+            coordinator2_mark=second_mark,
+            coordinator2_submitted=marked,
+            final_mark=round((first_mark + second_mark) / 2) if marked else None,
+        )
+
+    def _student_evaluations(self, group, members, coordinators, reached, report):
+        evaluations = []
+        for student in members:
+            first = StudentEvaluation(group=group, student=student, stage='first', guide_submitted=True)
+            give_marks(self.rng, first, 'guide', REVIEW_CRITERIA)
+            evaluations.append(first)
+            if reached == STATE_ORDER['first_evaluation']:
+                continue
+            self._coordinator_marks(first)
+            first.finalized = True
+
+            second = StudentEvaluation(group=group, student=student, stage='second', guide_submitted=True)
+            give_marks(self.rng, second, 'guide', REVIEW_CRITERIA)
+            evaluations.append(second)
+            if reached == STATE_ORDER['second_evaluation']:
+                second.coordinator1_submitted = True
+                give_marks(self.rng, second, 'coordinator1', REVIEW_CRITERIA)
+                continue
+            self._coordinator_marks(second)
+            second.finalized = True
+
+            give_marks(self.rng, second, 'final_guide', FINAL_GUIDE_CRITERIA)
+            second.final_guide_total = second.final_guide_raw = sum(getattr(second, f'final_guide_{name}') for name, _ in FINAL_GUIDE_CRITERIA)
+            second.final_guide_mark = round(second.final_guide_total / 40 * 15)
+            second.final_guide_submitted = True
+            second.final_guide_submitted_at = self.now
+            second.attendance_marks = self.rng.randint(6, 10)
+            second.attendance_submitted = True
+            second.attendance_submitted_by = coordinators[0]
+            second.attendance_submitted_at = self.now
+            if reached == STATE_ORDER['report_review']:
+                continue
+
+            second.committee_raw_total = first.guide_total + first.coordinator1_total + first.coordinator2_total + second.guide_total + second.coordinator1_total + second.coordinator2_total
+            second.committee_mark = round(second.committee_raw_total / 240 * 40)
+            second.cie_total = second.committee_mark + second.final_guide_mark + second.attendance_marks + report.final_mark
+            second.cie_calculated = True
+            second.cie_calculated_at = self.now
+            if reached == STATE_ORDER['cie_calculated']:
+                continue
+
+            for evaluator in ('guide', 'coord1', 'coord2'):
+                give_marks(self.rng, second, f'ese_{evaluator}', ESE_CRITERIA)
+                setattr(second, f'ese_{evaluator}_submitted', True)
+                setattr(second, f'ese_{evaluator}_submitted_at', self.now)
+            second.ese_final = second.ese_final_calculated
+            second.ese_completed = True
+            second.ese_completed_at = self.now
+            second.final_total = second.cie_total + second.ese_final
+            second.final_percentage = round(second.final_total / 150 * 100, 2)
+            second.final_grade = StudentEvaluation.grade_for(second.final_percentage)
+            second.result_calculated = True
+        return evaluations
+
+    def _coordinator_marks(self, evaluation):
+        """Both coordinators' marks; the legacy coordinator fields mirror the last one, as the views do."""
+        for coordinator in ('coordinator1', 'coordinator2'):
+            give_marks(self.rng, evaluation, coordinator, REVIEW_CRITERIA)
+            setattr(evaluation, f'{coordinator}_submitted', True)
+        for name, _ in REVIEW_CRITERIA:
+            setattr(evaluation, f'coordinator_{name}', getattr(evaluation, f'coordinator2_{name}'))
+        evaluation.coordinator_submitted = True
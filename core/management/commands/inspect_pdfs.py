@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Abstract, EvaluationFile, ProjectReport, StoredBlob
+from core.storage import digest_from_name
+
+
+class Command(BaseCommand):
+    help = 'Record page count, version, encryption and text presence for stored PDFs not inspected yet'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recheck', action='store_true', help='Inspect every PDF again, not only new ones')
+
+    def handle(self, *args, **options):
+        names = set(Abstract.objects.exclude(pdf_blob='').values_list('pdf_blob', flat=True))
+        names.update(ProjectReport.objects.exclude(report_file='').values_list('report_file', flat=True))
+        names.update(
+            EvaluationFile.objects.exclude(file_blob='').filter(file_name__iendswith='.pdf').values_list('file_blob', flat=True)
+        )
+        digests = {digest_from_name(name) for name in names}
+
+        blobs = StoredBlob.objects.filter(digest__in=digests)
+        if options['recheck']:
+            blobs.update(pdf_checked_at=None)
+        pending = list(blobs.filter(pdf_checked_at__isnull=True).values_list('digest', flat=True))
+        self.stdout.write(f'Inspecting {len(pending)} PDFs...')
+
+        for digest in pending:
+            StoredBlob.inspect_pdf(digest)
+
+        invalid = StoredBlob.objects.filter(digest__in=pending, pdf_valid=False)
+        for blob in invalid:
+            self.stdout.write(self.style.WARNING(f'  {blob.name}: {blob.pdf_error}'))
+        self.stdout.write(self.style.SUCCESS(f'Done! {len(pending) - len(invalid)} valid, {len(invalid)} invalid.'))
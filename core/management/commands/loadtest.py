@@ -0,0 +1,325 @@
+import json
+import math
+import random
+import threading
+import time
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import HTTPCookieProcessor, HTTPRedirectHandler, Request, build_opener
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Q
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Abstract, CoordinatorAssignment, FacultyProfile, Group, GroupMember, GuideRequest, StudentEvaluation
+
+# Share of the virtual users playing each role.
+SCENARIOS = {
+    # An ordinary weekday: mostly students checking on their project.
+    'mixed': {'student': 70, 'guide': 10, 'coordinator': 15, 'hod': 5},
+    # Exam day: guides and coordinators entering ESE marks at the same time.
+    'ese-burst': {'guide': 40, 'coordinator': 60},
+}
+
+REVIEW_FIELDS = ['topic', 'planning', 'scalability', 'novelty', 'task_distribution', 'schedule', 'interim', 'presentation', 'viva']
+ESE_FIELDS = ['presentation', 'demo', 'viva']
+
+
+class NoRedirect(HTTPRedirectHandler):
+    """Time each request on its own instead of following the redirect that ends most POSTs."""
+
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+def percentile(ordered, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return None
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class VirtualUser:
+    """One logged-in browser session replaying a script of (url name, method, path, data) steps."""
+
+    def __init__(self, base_url, username, script, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.username = username
+        self.script = script
+        self.timeout = timeout
+        self.cookies = CookieJar()
+        self.opener = build_opener(HTTPCookieProcessor(self.cookies), NoRedirect)
+        self.samples = []
+
+    def csrf_token(self):
+        return next((cookie.value for cookie in self.cookies if cookie.name == settings.CSRF_COOKIE_NAME), '')
+
+    def request(self, url_name, method, path, data=None):
+        body = None
+        if method == 'POST':
+            body = urlencode({**(data or {}), 'csrfmiddlewaretoken': self.csrf_token()}).encode()
+        request = Request(self.base_url + path, data=body, method=method)
+        started = time.perf_counter()
+        try:
+            with self.opener.open(request, timeout=self.timeout) as response:
+                response.read()
+                status = response.status
+        except HTTPError as exc:
+            # Redirects surface as HTTPError because they are not followed.
+            status = exc.code
+            exc.read()
+        except (URLError, OSError):
+            status = None
+        elapsed = time.perf_counter() - started
+        self.samples.append((url_name, elapsed, status is not None and status < 400))
+        return status
+
+    def login(self, password, role):
+        self.request('login', 'GET', reverse('login'))
+        status = self.request('login', 'POST', reverse('login'), {'username': self.username, 'password': password})
+        if status != 302:
+            # A rejected login re-renders the form with 200; count it as the error it is.
+            url_name, elapsed, _ = self.samples.pop()
+            self.samples.append((url_name, elapsed, False))
+            return False
+        if role in ('guide', 'coordinator'):
+            # Faculty with both roles pick one first; everyone else is sent on to the dashboard.
+            self.request('role_selection', 'POST', reverse('role_selection'), {'role': role})
+        return True
+
+    def run(self, password, role, duration, think_time, start):
+        # Everyone logs in together after the barrier; the duration counts from
+        # each user's own login, so slow password hashing does not eat into it.
+        start.wait()
+        if not self.login(password, role):
+            return
+        deadline = time.monotonic() + duration
+        steps = 0
+        while time.monotonic() < deadline:
+            self.request(*self.script[steps % len(self.script)])
+            steps += 1
+            if think_time:
+                time.sleep(think_time)
+
+
+class Command(BaseCommand):
+    help = 'Replay concurrent student, guide, coordinator and HOD workflows against a running server and report latency per URL'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--scenario', choices=sorted(SCENARIOS), default='mixed')
+        parser.add_argument('--users', type=int, default=20, help='Concurrent virtual users, one thread each')
+        parser.add_argument('--duration', type=float, default=30, help='Seconds each virtual user keeps sending requests after logging in')
+        parser.add_argument('--think-time', type=float, default=0, help='Seconds a virtual user waits between requests')
+        parser.add_argument('--timeout', type=float, default=30, help='Seconds before a request counts as an error')
+        parser.add_argument('--prefix', default='gen', help='Only act as users generated by generate_institution with this prefix')
+        parser.add_argument('--password', default='password', help='Password of those users')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', metavar='FILE', help='Write the results as JSON')
+
+    def handle(self, *args, **options):
+        if options['users'] < 1:
+            raise CommandError('Run at least one virtual user.')
+        rng = random.Random(options['seed'])
+        prefix = f"{options['prefix']}-"
+        actors = {
+            'student': self._students(prefix),
+            'guide': self._guides(prefix, options['scenario']),
+            'coordinator': self._coordinators(prefix),
+            'hod': self._hods(prefix),
+        }
+        shares = SCENARIOS[options['scenario']]
+        available = {role: share for role, share in shares.items() if actors[role]}
+        if not available:
+            raise CommandError(f'No users with prefix "{prefix}" can run this scenario; generate them with generate_institution.')
+        for role in shares.keys() - available.keys():
+            self.stdout.write(self.style.WARNING(f'No {role} with work to do; skipping that role.'))
+
+        roles = rng.choices(list(available), weights=list(available.values()), k=options['users'])
+        start = threading.Barrier(len(roles))
+        virtual_users = []
+        threads = []
+        used = {}
+        for role in roles:
+            # Spread the virtual users of a role over distinct accounts first.
+            candidates = actors[role]
+            username, script = candidates[used.get(role, 0) % len(candidates)]
+            used[role] = used.get(role, 0) + 1
+            script = list(script)
+            rng.shuffle(script)
+            virtual_user = VirtualUser(options['base_url'], username, script, options['timeout'])
+            virtual_users.append(virtual_user)
+            threads.append(threading.Thread(
+                target=virtual_user.run,
+                args=(options['password'], role, options['duration'], options['think_time'], start),
+            ))
+
+        self.stdout.write(
+            f"Running {options['scenario']} against {options['base_url']}: {len(roles)} users "
+            f"({', '.join(f'{roles.count(role)} {role}' for role in available)}) for {options['duration']:g}s..."
+        )
+        started_at = timezone.now()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        results = self._summarize([sample for virtual_user in virtual_users for sample in virtual_user.samples], elapsed)
+        self._report(results)
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump({
+                    'started_at': started_at.isoformat(),
+                    'base_url': options['base_url'],
+                    'scenario': options['scenario'],
+                    'users': {role: roles.count(role) for role in available},
+                    'duration': options['duration'],
+                    'think_time': options['think_time'],
+                    **results,
+                }, handle, indent=2)
+            self.stdout.write(f"Results written to {options['output']}.")
+        self.stdout.write(self.style.SUCCESS('Done!'))
+
+    def _summarize(self, samples, elapsed):
+        by_url = {}
+        for url_name, seconds, ok in samples:
+            by_url.setdefault(url_name, []).append((seconds, ok))
+        urls = {}
+        for url_name, entries in sorted(by_url.items()):
+            latencies = sorted(seconds * 1000 for seconds, _ in entries)
+            errors = sum(1 for _, ok in entries if not ok)
+            urls[url_name] = {
+                'requests': len(entries),
+                'errors': errors,
+                'error_rate': errors / len(entries),
+                'throughput': len(entries) / elapsed if elapsed else 0,
+                'p50_ms': percentile(latencies, 50),
+                'p95_ms': percentile(latencies, 95),
+                'p99_ms': percentile(latencies, 99),
+                'max_ms': latencies[-1],
+            }
+        total = len(samples)
+        errors = sum(url['errors'] for url in urls.values())
+        latencies = sorted(seconds * 1000 for _, seconds, _ in samples)
+        return {
+            'elapsed': elapsed,
+            'totals': {
+                'requests': total,
+                'errors': errors,
+                'error_rate': errors / total if total else 0,
+                'throughput': total / elapsed if elapsed else 0,
+                'p50_ms': percentile(latencies, 50),
+                'p95_ms': percentile(latencies, 95),
+                'p99_ms': percentile(latencies, 99),
+            },
+            'urls': urls,
+        }
+
+    def _report(self, results):
+        self.stdout.write(f"{'URL name':<40} {'requests':>8} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        rows = list(results['urls'].items()) + [('total', results['totals'])]
+        for url_name, stats in rows:
+            line = (
+                f"{url_name:<40} {stats['requests']:>8} {stats['errors']:>7} {stats['throughput']:>8.1f} "
+                f"{stats['p50_ms'] or 0:>8.1f} {stats['p95_ms'] or 0:>8.1f} {stats['p99_ms'] or 0:>8.1f}"
+            )
+            self.stdout.write(self.style.ERROR(line) if stats['errors'] else line)
+
+    def _students(self, prefix):
+        student_ids = (
+            GroupMember.objects.filter(user__username__startswith=prefix)
+            .order_by('user__username')
+            .values_list('user__username', flat=True)
+        )
+        script = [
+            ('mini_project', 'GET', reverse('mini_project'), None),
+            ('dashboard', 'GET', reverse('dashboard'), None),
+        ]
+        return [(username, script) for username in student_ids]
+
+    def _guides(self, prefix, scenario):
+        """Guides with accepted groups; in the ESE burst only groups whose members can take ESE."""
+        members = self._members()
+        ready = self._ese_ready_group_ids()
+        scripts = {}
+        accepted = (
+            GuideRequest.objects.filter(status=GuideRequest.STATUS_ACCEPTED, guide__username__startswith=prefix)
+            .order_by('guide__username', 'group_id')
+            .values_list('guide__username', 'group_id')
+        )
+        for username, group_id in accepted:
+            if scenario == 'ese-burst':
+                if group_id not in ready:
+                    continue
+                step = ('submit_guide_ese', 'POST', reverse('submit_guide_ese', args=[group_id]), self._ese_marks(members[group_id]))
+            else:
+                scripts.setdefault(username, [('guide_dashboard', 'GET', reverse('guide_dashboard'), None)])
+                step = (
+                    'submit_guide_student_evaluation',
+                    'POST',
+                    reverse('submit_guide_student_evaluation', args=[group_id, 'first']),
+                    {f'student_{student_id}_{field}': '4' for student_id in members[group_id] for field in REVIEW_FIELDS},
+                )
+            scripts.setdefault(username, []).append(step)
+        return sorted(scripts.items())
+
+    def _coordinators(self, prefix):
+        """Coordinators entering ESE marks for the ready groups of their classes."""
+        members = self._members()
+        ready = self._ese_ready_group_ids()
+        groups_by_class = {}
+        classes = Group.objects.filter(id__in=ready).values_list('id', 'leader__student_profile__student_class_id')
+        for group_id, class_id in classes:
+            groups_by_class.setdefault(class_id, []).append(group_id)
+        scripts = {}
+        assignments = (
+            CoordinatorAssignment.objects.filter(faculty__username__startswith=prefix)
+            .order_by('faculty__username', 'student_class_id')
+            .values_list('faculty__username', 'student_class_id')
+        )
+        for username, class_id in assignments:
+            for group_id in sorted(groups_by_class.get(class_id, [])):
+                scripts.setdefault(username, [('coordinator_dashboard', 'GET', reverse('coordinator_dashboard'), None)]).append(
+                    ('submit_coordinator_ese', 'POST', reverse('submit_coordinator_ese', args=[group_id]), self._ese_marks(members[group_id]))
+                )
+        return sorted(scripts.items())
+
+    def _hods(self, prefix):
+        scripts = []
+        hods = FacultyProfile.objects.filter(is_hod=True, user__username__startswith=prefix).order_by('user__username')
+        for username, department in hods.values_list('user__username', 'department'):
+            abstract_ids = Abstract.objects.filter(
+                coordinator_status=Abstract.STATUS_APPROVED,
+                group__leader__student_profile__department=department,
+            ).order_by('id').values_list('id', flat=True)[:20]
+            script = [('hod_dashboard', 'GET', reverse('hod_dashboard'), None)]
+            script += [
+                ('hod_dashboard', 'POST', reverse('hod_dashboard'), {'abstract_id': abstract_id, 'action': 'verify_compliance'})
+                for abstract_id in abstract_ids
+            ]
+            scripts.append((username, script))
+        return scripts
+
+    def _members(self):
+        members = {}
+        for group_id, user_id in GroupMember.objects.order_by('id').values_list('group_id', 'user_id'):
+            members.setdefault(group_id, []).append(user_id)
+        return members
+
+    def _ese_ready_group_ids(self):
+        """Groups whose every member has CIE calculated, so both ESE views accept marks for them."""
+        ready = (
+            StudentEvaluation.objects.filter(stage='second')
+            .values('group_id')
+            .annotate(total=Count('id'), ready=Count('id', filter=Q(cie_calculated=True, final_guide_submitted=True, attendance_submitted=True)))
+            .filter(total__gt=0)
+        )
+        return {row['group_id'] for row in ready if row['ready'] == row['total']}
+
+    def _ese_marks(self, student_ids):
+        return {f'student_{student_id}_ese_{field}': '15' for student_id in student_ids for field in ESE_FIELDS}
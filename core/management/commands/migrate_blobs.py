@@ -0,0 +1,104 @@
+import os
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from core.models import Abstract, EvaluationFile, ProjectReport, StoredBlob
+from core.storage import blob_storage
+
+
+class Command(BaseCommand):
+    help = 'Move abstract PDFs, evaluation files and project reports into the content-addressed blob store'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50, help='Rows loaded and committed per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be moved')
+        parser.add_argument('--delete-source', action='store_true', help='Delete project report files from their old location once copied')
+        parser.add_argument('--vacuum', action='store_true', help='Run VACUUM afterwards so SQLite returns the freed space')
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        dry_run = options['dry_run']
+
+        self._move_inline(Abstract, 'pdf_file', 'pdf_blob', batch_size, dry_run)
+        self._move_inline(EvaluationFile, 'file_data', 'file_blob', batch_size, dry_run)
+        self._move_reports(batch_size, dry_run, options['delete_source'])
+
+        if not dry_run:
+            # The moves above use update(), which skips the reference counting signals.
+            StoredBlob.recount()
+
+        if options['vacuum'] and not dry_run and connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('VACUUM')
+            self.stdout.write('Database vacuumed.')
+
+        self.stdout.write(self.style.SUCCESS('Done!'))
+
+    def _move_inline(self, model, data_field, blob_field, batch_size, dry_run):
+        label = model._meta.verbose_name_plural
+        pending_ids = list(
+            model._base_manager.filter(**{blob_field: ''})
+            .exclude(**{f'{data_field}__isnull': True})
+            .order_by('id')
+            .values_list('id', flat=True)
+        )
+        if not pending_ids:
+            self.stdout.write(f'No {label} left to move.')
+            return
+
+        if dry_run:
+            self.stdout.write(f'Would move {len(pending_ids)} {label}.')
+            return
+
+        upload_to = model._meta.get_field(blob_field).upload_to
+        moved = 0
+        moved_bytes = 0
+        for start in range(0, len(pending_ids), batch_size):
+            batch_ids = pending_ids[start:start + batch_size]
+            with transaction.atomic():
+                rows = model._base_manager.filter(id__in=batch_ids).values_list('id', data_field)
+                for pk, data in rows:
+                    content = ContentFile(bytes(data))
+                    name = blob_storage.save(f'{upload_to}{pk}', content)
+                    model._base_manager.filter(id=pk).update(**{blob_field: name, data_field: None})
+                    moved += 1
+                    moved_bytes += content.size
+            self.stdout.write(f'  {label}: {moved}/{len(pending_ids)}')
+
+        self.stdout.write(self.style.SUCCESS(f'Moved {moved} {label} ({moved_bytes} bytes) out of the database.'))
+
+    def _move_reports(self, batch_size, dry_run, delete_source):
+        reports = list(ProjectReport._base_manager.exclude(report_file='').order_by('id').only('id', 'report_file', 'report_filename'))
+        legacy = [report for report in reports if not blob_storage.exists(report.report_file.name)]
+        if not legacy:
+            self.stdout.write('No project reports left to move.')
+            return
+
+        if dry_run:
+            self.stdout.write(f'Would move {len(legacy)} project reports.')
+            return
+
+        moved = 0
+        missing = 0
+        for start in range(0, len(legacy), batch_size):
+            with transaction.atomic():
+                for report in legacy[start:start + batch_size]:
+                    old_name = report.report_file.name
+                    if not default_storage.exists(old_name):
+                        missing += 1
+                        self.stdout.write(self.style.WARNING(f'  Report {report.id}: {old_name} not found, skipped'))
+                        continue
+                    with default_storage.open(old_name, 'rb') as source:
+                        new_name = blob_storage.save(old_name, source)
+                    ProjectReport._base_manager.filter(id=report.id).update(
+                        report_file=new_name,
+                        report_filename=report.report_filename or os.path.basename(old_name),
+                    )
+                    if delete_source:
+                        transaction.on_commit(lambda name=old_name: default_storage.delete(name))
+                    moved += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Moved {moved} project reports into the blob store ({missing} missing).'))
@@ -1,4 +1,47 @@
+import functools
+import logging
+import mimetypes
+import os
+import random
+import re
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.db import connections
+from django.http import FileResponse
 from django.middleware.csrf import get_token
+from django.middleware.gzip import GZipMiddleware
+from django.template.backends.django import Template
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.functional import SimpleLazyObject
+from django.utils.http import http_date
+
+from .queries import detect_repeated_queries
+from .roles import Roles
+
+logger = logging.getLogger(__name__)
+
+# Precompressed copies written by core.storage.CompressedManifestStaticFilesStorage,
+# in order of preference.
+STATIC_ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+# Responses CompressionMiddleware compresses: the pages and what they fetch.
+# Downloads (PDFs above all, already compressed inside) are left alone.
+COMPRESSIBLE_CONTENT_TYPES = {
+    'text/html',
+    'text/plain',
+    'text/css',
+    'text/javascript',
+    'application/javascript',
+    'application/json',
+    'image/svg+xml',
+}
+
+_current_timing = ContextVar('request_timing', default=None)
 
 
 class EnsureCSRFCookieMiddleware:
@@ -8,4 +51,250 @@ class EnsureCSRFCookieMiddleware:
     def __call__(self, request):
         get_token(request)
         response = self.get_response(request)
-        return response
\ No newline at end of file
+        return response
+
+
+class RolesMiddleware:
+    """Set ``request.roles``, the user's Roles, resolved on first use and kept for the request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.roles = SimpleLazyObject(lambda: Roles.for_user(request.user, request.session))
+        return self.get_response(request)
+
+
+class StaticFilesMiddleware:
+    """Serve the files collectstatic put in STATIC_ROOT, precompressed and long-cached.
+
+    For deployments that do not serve /static/ from the web server (nginx
+    should, with ``gzip_static``/``brotli_static``; see the README). A name
+    from the staticfiles manifest is fingerprinted, so it is sent as
+    ``immutable`` for a year; any other file must be revalidated. The
+    ``.br`` or ``.gz`` copy collectstatic wrote is sent in place of the
+    file when the client accepts it. Unknown files fall through to the
+    URLconf and its 404.
+    """
+
+    def __init__(self, get_response):
+        if not settings.STATIC_ROOT or '://' in settings.STATIC_URL:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.root = os.fspath(settings.STATIC_ROOT)
+        self.prefix = settings.STATIC_URL
+        self.fingerprinted = set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+
+    def __call__(self, request):
+        if request.method in ('GET', 'HEAD') and request.path.startswith(self.prefix):
+            response = self.serve(request, request.path.removeprefix(self.prefix))
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def serve(self, request, name):
+        try:
+            path = safe_join(self.root, name)
+        except SuspiciousFileOperation:
+            return None
+        if not os.path.isfile(path):
+            return None
+
+        last_modified = int(os.stat(path).st_mtime)
+        variants = [(encoding, path + suffix) for encoding, suffix in STATIC_ENCODINGS if os.path.isfile(path + suffix)]
+        response = get_conditional_response(request, last_modified=last_modified)
+        if response is None:
+            content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+            accepted = request.headers.get('Accept-Encoding', '')
+            encoding, body = next(
+                ((encoding, variant) for encoding, variant in variants if re.search(rf'\b{encoding}\b', accepted)),
+                (None, path),
+            )
+            response = FileResponse(open(body, 'rb'), content_type=content_type)
+            if encoding:
+                response['Content-Encoding'] = encoding
+
+        response['Last-Modified'] = http_date(last_modified)
+        if variants:
+            patch_vary_headers(response, ['Accept-Encoding'])
+        if name in self.fingerprinted:
+            patch_cache_control(response, public=True, max_age=365 * 24 * 60 * 60, immutable=True)
+        else:
+            patch_cache_control(response, public=True, no_cache=True)
+        return response
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """GZipMiddleware for pages only.
+
+    Compresses text responses (COMPRESSIBLE_CONTENT_TYPES) and leaves the
+    rest alone: PDF downloads and the like gain nothing, are streamed and
+    answer Range requests that need the bytes as stored.
+    """
+
+    def process_response(self, request, response):
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if response.streaming or content_type not in COMPRESSIBLE_CONTENT_TYPES or response.has_header('Content-Disposition'):
+            return response
+        return super().process_response(request, response)
+
+
+class RequestTiming:
+    """Where one request spent its time, in seconds."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.template = 0.0
+        self.view = 0.0
+        self.total = 0.0
+        self.view_started = None
+        self.rendering = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # Installed with connection.execute_wrapper(), so it sees every query
+        # whatever DEBUG is, without keeping the SQL around.
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db += time.perf_counter() - started
+
+    def server_timing(self):
+        return ', '.join([
+            f'db;dur={self.db * 1000:.1f};desc="{self.queries} queries"',
+            f'tpl;dur={self.template * 1000:.1f}',
+            f'view;dur={self.view * 1000:.1f}',
+            f'total;dur={self.total * 1000:.1f}',
+        ])
+
+
+def _timed_render(render):
+    @functools.wraps(render)
+    def timed_render(self, *args, **kwargs):
+        timing = _current_timing.get()
+        if timing is None or timing.rendering:
+            # Not sampled, or a template rendered from within another one.
+            return render(self, *args, **kwargs)
+        timing.rendering += 1
+        started = time.perf_counter()
+        try:
+            return render(self, *args, **kwargs)
+        finally:
+            timing.template += time.perf_counter() - started
+            timing.rendering -= 1
+
+    timed_render.timed = True
+    return timed_render
+
+
+def install_template_timing():
+    """Wrap the Django backend's Template.render so RequestTimingMiddleware sees template time.
+
+    Process-wide, so called once from CoreConfig.ready(). Outside a sampled
+    request the wrapper only reads a context variable.
+    """
+    if not getattr(Template.render, 'timed', False):
+        Template.render = _timed_render(Template.render)
+
+
+class RequestTimingMiddleware:
+    """Measure each sampled request and report it in a Server-Timing header and a log line.
+
+    Records the number of queries and the time spent in them, in rendering
+    templates and in the view; template time includes the queries a template
+    triggers and comes from install_template_timing(), which CoreConfig.ready()
+    calls. ``REQUEST_TIMING_SAMPLE_RATE`` is the fraction of requests
+    measured, 0 turns it off. ``REQUEST_TIMING_HEADER`` says who gets the
+    header: ``'staff'`` (staff users, and everyone under DEBUG), ``'all'``
+    or ``'off'``; the log line is written either way.
+    Queries run while a streaming response is consumed are not counted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        sample_rate = getattr(settings, 'REQUEST_TIMING_SAMPLE_RATE', 0.1)
+        if not sample_rate or random.random() >= sample_rate:
+            return self.get_response(request)
+
+        timing = request._timing = RequestTiming()
+        token = _current_timing.set(timing)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timing))
+                response = self.get_response(request)
+        finally:
+            _current_timing.reset(token)
+        finished = time.perf_counter()
+        timing.total = finished - started
+        if timing.view_started is not None:
+            timing.view = finished - timing.view_started
+
+        if self.send_header(request):
+            response['Server-Timing'] = timing.server_timing()
+        match = request.resolver_match
+        url_name = match.url_name if match else None
+        logger.info(
+            'url_name=%s method=%s status=%s queries=%d db_ms=%.1f template_ms=%.1f view_ms=%.1f total_ms=%.1f',
+            url_name, request.method, response.status_code, timing.queries,
+            timing.db * 1000, timing.template * 1000, timing.view * 1000, timing.total * 1000,
+            extra={
+                'url_name': url_name,
+                'method': request.method,
+                'status': response.status_code,
+                'queries': timing.queries,
+                'db_ms': timing.db * 1000,
+                'template_ms': timing.template * 1000,
+                'view_ms': timing.view * 1000,
+                'total_ms': timing.total * 1000,
+            },
+        )
+        return response
+
+    def send_header(self, request):
+        # Timings and query counts tell an attacker too much to send to anyone.
+        mode = getattr(settings, 'REQUEST_TIMING_HEADER', 'staff')
+        if mode == 'staff':
+            user = getattr(request, 'user', None)
+            return settings.DEBUG or bool(user and user.is_staff)
+        return mode == 'all'
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timing = getattr(request, '_timing', None)
+        if timing is not None:
+            timing.view_started = time.perf_counter()
+
+
+class RepeatedQueryMiddleware:
+    """Flag requests that run the same query shape more than ``REPEATED_QUERY_THRESHOLD`` times.
+
+    ``REPEATED_QUERY_MODE`` is ``'off'`` (the default, the middleware unloads
+    itself), ``'log'``, which logs a warning with the repeated shapes and the
+    call site of their first run, or ``'raise'``, which raises
+    RepeatedQueriesError so tests fail on an N+1 pattern.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.mode = getattr(settings, 'REPEATED_QUERY_MODE', 'off')
+        if self.mode not in ('log', 'raise'):
+            raise MiddlewareNotUsed
+
+    def __call__(self, request):
+        with detect_repeated_queries(strict=False) as detector:
+            response = self.get_response(request)
+        if detector.repeated():
+            match = request.resolver_match
+            url_name = match.url_name if match else None
+            if self.mode == 'raise':
+                detector.check()
+            logger.warning(
+                'Repeated queries in url_name=%s method=%s:\n%s', url_name, request.method, detector.report(),
+                extra={'url_name': url_name, 'repeated_queries': [(shape, count) for shape, count, _ in detector.repeated()]},
+            )
+        return response
@@ -0,0 +1,39 @@
+# Generated by Django 6.0.2 on 2026-10-17 02:09
+
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0041_remove_studentevaluation_ese_coord1_total_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='abstract',
+            name='pdf_blob',
+            field=models.FileField(blank=True, storage=core.storage.get_blob_storage, upload_to='abstracts/'),
+        ),
+        migrations.AddField(
+            model_name='evaluationfile',
+            name='file_blob',
+            field=models.FileField(blank=True, storage=core.storage.get_blob_storage, upload_to='evaluations/'),
+        ),
+        migrations.AddField(
+            model_name='projectreport',
+            name='report_filename',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='evaluationfile',
+            name='file_data',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='projectreport',
+            name='report_file',
+            field=models.FileField(storage=core.storage.get_blob_storage, upload_to='project_reports/'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-17 02:40
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0042_blob_storage'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='abstract',
+            options={'base_manager_name': 'objects', 'ordering': ['-submitted_at']},
+        ),
+        migrations.AlterModelOptions(
+            name='evaluationfile',
+            options={'base_manager_name': 'objects', 'ordering': ['-uploaded_at']},
+        ),
+    ]
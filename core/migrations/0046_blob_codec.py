@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-17 10:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0045_pdf_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='storedblob',
+            name='codec',
+            field=models.CharField(blank=True, max_length=10),
+        ),
+    ]
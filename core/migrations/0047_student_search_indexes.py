@@ -0,0 +1,37 @@
+# Generated by Django 6.0.2 on 2026-10-17 11:20
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0046_blob_codec'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studentprofile',
+            index=models.Index(django.db.models.functions.text.Lower('roll_number'), name='core_sp_roll_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentprofile',
+            index=models.Index(django.db.models.functions.text.Lower('register_number'), name='core_sp_register_lower_idx'),
+        ),
+        # auth_user belongs to django.contrib.auth, so its search indexes are plain SQL.
+        migrations.RunSQL(
+            sql=[
+                'CREATE INDEX core_user_username_lower_idx ON auth_user (LOWER(username));',
+                'CREATE INDEX core_user_first_name_lower_idx ON auth_user (LOWER(first_name));',
+                'CREATE INDEX core_user_last_name_lower_idx ON auth_user (LOWER(last_name));',
+            ],
+            reverse_sql=[
+                'DROP INDEX core_user_username_lower_idx;',
+                'DROP INDEX core_user_first_name_lower_idx;',
+                'DROP INDEX core_user_last_name_lower_idx;',
+            ],
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 6.0.2 on 2026-10-17 12:05
+
+from django.db import migrations, models
+
+
+def number_slots_in_assignment_order(apps, schema_editor):
+    # Slots used to be the position of the assignment among its class's, by id.
+    CoordinatorAssignment = apps.get_model("core", "CoordinatorAssignment")
+
+    positions = {}
+    for assignment in CoordinatorAssignment.objects.order_by("id").iterator():
+        positions[assignment.student_class_id] = positions.get(assignment.student_class_id, 0) + 1
+        assignment.slot = positions[assignment.student_class_id]
+        assignment.save(update_fields=["slot"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0047_student_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="coordinatorassignment",
+            name="slot",
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.RunPython(number_slots_in_assignment_order, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="coordinatorassignment",
+            name="slot",
+            field=models.PositiveSmallIntegerField(blank=True, help_text="1 or 2; left empty, the lowest slot free in the class."),
+        ),
+        migrations.AddConstraint(
+            model_name="coordinatorassignment",
+            constraint=models.UniqueConstraint(fields=("student_class", "slot"), name="core_coordinator_class_slot_uniq"),
+        ),
+    ]
@@ -1,8 +1,37 @@
+import os
+from collections import Counter
+
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
-from django.db.models.signals import post_save
-from django.dispatch import receiver
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Lower
+from django.db.models.signals import post_delete, post_init, post_save
+from django.utils import timezone
+
+from .fragments import bump
+from .pdfinfo import InvalidPDF, inspect_pdf_file
+from .storage import blob_storage, digest_from_name, get_blob_storage, is_blob_name, is_compressed, shard_name, GZIP_SUFFIX
+from .workers import run_in_background
+
+
+class BlobFreeQuerySet(models.QuerySet):
+	def with_content(self):
+		"""Load the inline file columns too; only download views need the bytes."""
+		return self.defer(None)
+
+
+class BlobFreeManager(models.Manager.from_queryset(BlobFreeQuerySet)):
+	"""Default manager that leaves inline file (BinaryField) columns unloaded."""
+
+	def get_queryset(self):
+		blob_fields = [
+			field.attname
+			for field in self.model._meta.concrete_fields
+			if isinstance(field, models.BinaryField)
+		]
+		return super().get_queryset().defer(*blob_fields)
 
 
 class Class(models.Model):
@@ -18,15 +47,71 @@ class Class(models.Model):
 
 
 class CoordinatorAssignment(models.Model):
-	"""Assigns coordinators to classes. Each class should have exactly 2 coordinators."""
+	"""Assigns coordinators to classes. Each class should have exactly 2 coordinators.
+
+	``slot`` says whose marks the coordinator enters: 1 for the coordinator1_*
+	fields, 2 for coordinator2_*. A new assignment takes the lowest slot free
+	in its class, so replacing a coordinator leaves the other one's slot as
+	it was.
+	"""
 	faculty = models.ForeignKey(User, on_delete=models.CASCADE, related_name="coordinator_assignments")
 	student_class = models.ForeignKey(Class, on_delete=models.CASCADE, related_name="coordinator_assignments")
+	slot = models.PositiveSmallIntegerField(blank=True, help_text="1 or 2; left empty, the lowest slot free in the class.")
 	
 	class Meta:
 		unique_together = ("faculty", "student_class")
+		constraints = [
+			models.UniqueConstraint(fields=["student_class", "slot"], name="core_coordinator_class_slot_uniq"),
+		]
 	
 	def __str__(self):
-		return f"{self.faculty.username} → {self.student_class.name}"
+		return f"{self.faculty.username} → {self.student_class.name} (coordinator {self.slot})"
+
+	def save(self, *args, **kwargs):
+		if self.slot is None:
+			taken = set(
+				CoordinatorAssignment.objects.filter(student_class_id=self.student_class_id)
+				.exclude(pk=self.pk)
+				.values_list("slot", flat=True)
+			)
+			self.slot = next(slot for slot in range(1, len(taken) + 2) if slot not in taken)
+		super().save(*args, **kwargs)
+
+	@classmethod
+	def slot_map(cls):
+		"""Map (faculty_id, class_id) -> slot for every assignment.
+
+		Served from the cache until an assignment is saved or deleted (see
+		forget_slots). The cache must be shared by all server processes for
+		that to reach every one of them; COORDINATOR_SLOTS_TIMEOUT bounds how
+		stale a process-local copy can get.
+		"""
+		return cache.get_or_set(
+			COORDINATOR_SLOTS_CACHE_KEY,
+			lambda: {
+				(faculty_id, class_id): slot
+				for faculty_id, class_id, slot in cls.objects.values_list("faculty_id", "student_class_id", "slot")
+			},
+			COORDINATOR_SLOTS_TIMEOUT,
+		)
+
+	@classmethod
+	def slot_for(cls, faculty_id, class_id):
+		"""The coordinator's slot in ``class_id``, or None when not assigned to it."""
+		return cls.slot_map().get((faculty_id, class_id))
+
+	@staticmethod
+	def forget_slots(**kwargs):
+		"""Drop the cached slot map. Connected to post_save and post_delete; call
+		it after bulk changes that bypass signals."""
+		cache.delete(COORDINATOR_SLOTS_CACHE_KEY)
+
+
+COORDINATOR_SLOTS_CACHE_KEY = "coordinator-slots"
+COORDINATOR_SLOTS_TIMEOUT = 300
+
+post_save.connect(CoordinatorAssignment.forget_slots, sender=CoordinatorAssignment)
+post_delete.connect(CoordinatorAssignment.forget_slots, sender=CoordinatorAssignment)
 
 
 class StudentProfile(models.Model):
@@ -37,6 +122,13 @@ class StudentProfile(models.Model):
 	department = models.CharField(max_length=100, blank=True, null=True)
 	cgp = models.DecimalField(max_digits=3, decimal_places=2, blank=True, null=True)
 
+	class Meta:
+		# Prefix search for group invitations; see core.loaders.search_available_students.
+		indexes = [
+			models.Index(Lower("roll_number"), name="core_sp_roll_lower_idx"),
+			models.Index(Lower("register_number"), name="core_sp_register_lower_idx"),
+		]
+
 	def __str__(self):
 		return f"{self.user.username} - Student"
 
@@ -144,7 +236,8 @@ class Abstract(models.Model):
 	group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name="abstracts")
 	title = models.CharField(max_length=255)
 	abstract_text = models.TextField()
-	pdf_file = models.BinaryField(null=True, blank=True)
+	pdf_file = models.BinaryField(null=True, blank=True)  # Legacy inline storage, emptied by migrate_blobs
+	pdf_blob = models.FileField(storage=get_blob_storage, upload_to="abstracts/", blank=True)
 	pdf_filename = models.CharField(max_length=255, null=True, blank=True)
 	pdf_size = models.IntegerField(null=True, blank=True)
 	status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
@@ -161,12 +254,20 @@ class Abstract(models.Model):
 	reviewed_at = models.DateTimeField(null=True, blank=True)
 	reviewed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="reviewed_abstracts")
 
+	objects = BlobFreeManager()
+
 	class Meta:
 		ordering = ["-submitted_at"]
+		base_manager_name = "objects"
 
 	def __str__(self):
 		return f"{self.title} - {self.group.leader.username}"
 
+	@property
+	def has_pdf(self):
+		"""True when a PDF was uploaded, without loading the file content."""
+		return bool(self.pdf_blob or self.pdf_filename)
+
 
 class SustainableDevelopmentGoal(models.Model):
 	group = models.OneToOneField(Group, on_delete=models.CASCADE, related_name="sdg")
@@ -328,15 +429,19 @@ class EvaluationFile(models.Model):
 
 	group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name="evaluation_files")
 	stage = models.CharField(max_length=10, choices=STAGE_CHOICES)
-	file_data = models.BinaryField()
+	file_data = models.BinaryField(null=True, blank=True)  # Legacy inline storage, emptied by migrate_blobs
+	file_blob = models.FileField(storage=get_blob_storage, upload_to="evaluations/", blank=True)
 	file_name = models.CharField(max_length=255)
 	file_size = models.IntegerField()
 	file_type = models.CharField(max_length=100)  # e.g., 'application/pdf', 'application/vnd.ms-powerpoint'
 	uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name="uploaded_evaluation_files")
 	uploaded_at = models.DateTimeField(auto_now_add=True)
 
+	objects = BlobFreeManager()
+
 	class Meta:
 		ordering = ["-uploaded_at"]
+		base_manager_name = "objects"
 
 	def __str__(self):
 		return f"{self.group.leader.username} - {self.get_stage_display()} - {self.file_name}"
@@ -359,7 +464,8 @@ class ProjectReport(models.Model):
 	]
 
 	group = models.OneToOneField(Group, on_delete=models.CASCADE, related_name="project_report")
-	report_file = models.FileField(upload_to="project_reports/")
+	report_file = models.FileField(storage=get_blob_storage, upload_to="project_reports/")
+	report_filename = models.CharField(max_length=255, blank=True)
 	uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE)
 	uploaded_at = models.DateTimeField(auto_now_add=True)
 	review_status = models.CharField(max_length=12, choices=STATUS_CHOICES, default=STATUS_PENDING)
@@ -395,6 +501,11 @@ class ProjectReport(models.Model):
 	def __str__(self):
 		return f"Project Report - Group {self.group_id}"
 
+	@property
+	def display_filename(self):
+		"""Original upload name; falls back to the stored name for legacy rows."""
+		return self.report_filename or os.path.basename(self.report_file.name)
+
 
 class StudentEvaluation(models.Model):
 	"""Per-student evaluation for First and Second stages with detailed criteria."""
@@ -719,4 +830,241 @@ class StudentEvaluation(models.Model):
 		"""Returns True if guide and both coordinators have submitted and finalized."""
 		return self.second_eval_completed and self.finalized
 
+	@staticmethod
+	def grade_for(percentage):
+		"""Letter grade of a final percentage."""
+		if percentage >= 90:
+			return "S"
+		if percentage >= 85:
+			return "A+"
+		if percentage >= 80:
+			return "A"
+		if percentage >= 75:
+			return "B+"
+		if percentage >= 70:
+			return "B"
+		if percentage >= 65:
+			return "C+"
+		if percentage >= 60:
+			return "C"
+		if percentage >= 55:
+			return "D"
+		if percentage >= 50:
+			return "P"
+		return "F"
+
+
+CODEC_GZIP = "gzip"
+
+
+class StoredBlob(models.Model):
+	"""Reference count for one file in the content-addressed blob store.
+
+	Identical uploads share a single file on disk, so a file may only be
+	removed once no Abstract, EvaluationFile or ProjectReport points at it.
+	Counts are kept up to date by the signal handlers below; a blob whose count
+	drops to zero is only marked orphaned and is deleted later by
+	``dedupe_blobs --reclaim`` once its grace period has passed.
+	"""
+
+	digest = models.CharField(max_length=64, primary_key=True)
+	size = models.BigIntegerField(default=0)
+	ref_count = models.PositiveIntegerField(default=0)
+	created_at = models.DateTimeField(auto_now_add=True)
+	orphaned_at = models.DateTimeField(null=True, blank=True, db_index=True)
+	codec = models.CharField(max_length=10, blank=True)  # "gzip" when stored compressed
+
+	# PDF metadata, filled in by inspect_pdf() on the background worker pool.
+	pdf_checked_at = models.DateTimeField(null=True, blank=True)
+	pdf_valid = models.BooleanField(null=True, blank=True)
+	pdf_error = models.CharField(max_length=255, blank=True)
+	pdf_version = models.CharField(max_length=8, blank=True)
+	page_count = models.PositiveIntegerField(null=True, blank=True)
+	is_encrypted = models.BooleanField(default=False)
+	has_text = models.BooleanField(null=True, blank=True)
 
+	def __str__(self):
+		return f"{self.digest[:12]} ({self.ref_count} refs)"
+
+	@property
+	def name(self):
+		return shard_name(self.digest) + (GZIP_SUFFIX if self.codec == CODEC_GZIP else "")
+
+	@classmethod
+	def acquire(cls, name, size=0):
+		digest = digest_from_name(name)
+		blob, created = cls.objects.get_or_create(
+			digest=digest,
+			defaults={"size": size, "ref_count": 1, "codec": CODEC_GZIP if is_compressed(name) else ""},
+		)
+		if not created:
+			cls.objects.filter(digest=digest).update(ref_count=F("ref_count") + 1, orphaned_at=None)
+
+	@classmethod
+	def release(cls, name):
+		digest = digest_from_name(name)
+		cls.objects.filter(digest=digest, ref_count__gt=0).update(ref_count=F("ref_count") - 1)
+		cls.objects.filter(digest=digest, ref_count=0, orphaned_at__isnull=True).update(orphaned_at=timezone.now())
+
+	@classmethod
+	def inspect_pdf(cls, digest):
+		"""Parse the stored file as a PDF and record its metadata, once per digest."""
+		blob = cls.objects.filter(digest=digest, pdf_checked_at__isnull=True).first()
+		if blob is None:
+			return
+		fields = {"pdf_checked_at": timezone.now()}
+		try:
+			info = inspect_pdf_file(blob_storage.path(blob.name))
+		except (InvalidPDF, OSError) as exc:
+			fields.update(pdf_valid=False, pdf_error=str(exc)[:255])
+		else:
+			fields.update(
+				pdf_valid=True,
+				pdf_error="",
+				pdf_version=info["version"],
+				page_count=info["page_count"],
+				is_encrypted=info["encrypted"],
+				has_text=info["has_text"],
+			)
+		cls.objects.filter(digest=digest).update(**fields)
+		# Dashboard panels show the metadata next to the file.
+		names = [shard_name(digest), shard_name(digest) + GZIP_SUFFIX]
+		for model, field_name in BLOB_REFERENCES.items():
+			for group_id in model._base_manager.filter(**{f"{field_name}__in": names}).values_list("group_id", flat=True):
+				bump("group", group_id)
+
+	@classmethod
+	def inspect_pdf_later(cls, name):
+		run_in_background(cls.inspect_pdf, digest_from_name(name))
+
+	@classmethod
+	def attach_pdf_info(cls, objects):
+		"""Set ``pdf_info`` (a StoredBlob or None) on model instances in one query."""
+		objects = [obj for obj in objects if obj is not None]
+		digests = [digest_from_name(_referenced_blob(obj)) for obj in objects]
+		blobs = cls.objects.in_bulk({digest for digest in digests if digest})
+		for obj, digest in zip(objects, digests):
+			obj.pdf_info = blobs.get(digest)
+		return objects
+
+	@classmethod
+	def recount(cls):
+		"""Rebuild every count from the file fields; returns {digest: references}.
+
+		Needed after bulk updates that bypass signals, such as migrate_blobs.
+		"""
+		counts = Counter()
+		compressed = set()
+		for model, field_name in BLOB_REFERENCES.items():
+			for name in model._base_manager.exclude(**{field_name: ""}).values_list(field_name, flat=True):
+				if is_blob_name(name):
+					counts[digest_from_name(name)] += 1
+					if is_compressed(name):
+						compressed.add(digest_from_name(name))
+
+		with transaction.atomic():
+			known = {blob.digest: blob for blob in cls.objects.select_for_update()}
+			missing = []
+			for digest, references in counts.items():
+				blob = known.get(digest)
+				if blob is None:
+					blob = cls(digest=digest, ref_count=references, codec=CODEC_GZIP if digest in compressed else "")
+					blob.size = blob_storage.size(blob.name) if blob_storage.exists(blob.name) else 0
+					missing.append(blob)
+				elif blob.ref_count != references or blob.orphaned_at:
+					cls.objects.filter(digest=digest).update(ref_count=references, orphaned_at=None)
+			cls.objects.bulk_create(missing)
+			for blob in known.values():
+				if blob.digest not in counts and (blob.ref_count or not blob.orphaned_at):
+					cls.objects.filter(digest=blob.digest).update(ref_count=0, orphaned_at=blob.orphaned_at or timezone.now())
+		return counts
+
+
+# Models whose files live in the blob store, and the FileField holding them.
+BLOB_REFERENCES = {
+	Abstract: "pdf_blob",
+	EvaluationFile: "file_blob",
+	ProjectReport: "report_file",
+}
+
+
+def _referenced_blob(instance):
+	"""Blob name held by the instance, without loading the field if it is deferred."""
+	value = instance.__dict__.get(BLOB_REFERENCES[type(instance)])
+	name = getattr(value, "name", value)
+	return name if is_blob_name(name) else ""
+
+
+def _remember_blob(sender, instance, **kwargs):
+	instance._saved_blob = _referenced_blob(instance)
+
+
+def _count_blob_reference(sender, instance, **kwargs):
+	field_name = BLOB_REFERENCES[sender]
+	if field_name not in instance.__dict__:
+		return
+	previous = instance._saved_blob
+	current = _referenced_blob(instance)
+	if current == previous:
+		return
+	if current:
+		try:
+			size = getattr(instance, field_name).size
+		except OSError:
+			size = 0
+		StoredBlob.acquire(current, size)
+	if previous:
+		StoredBlob.release(previous)
+	instance._saved_blob = current
+
+
+def _drop_blob_reference(sender, instance, **kwargs):
+	name = _referenced_blob(instance)
+	if name:
+		StoredBlob.release(name)
+
+
+for _model in BLOB_REFERENCES:
+	post_init.connect(_remember_blob, sender=_model)
+	post_save.connect(_count_blob_reference, sender=_model)
+	post_delete.connect(_drop_blob_reference, sender=_model)
+
+
+def _invalidate_group_fragments(sender, instance, **kwargs):
+	bump("group", instance.pk if sender is Group else instance.group_id)
+
+
+def _invalidate_member_fragments(sender, instance, **kwargs):
+	# Group panels list their members' profiles.
+	group_ids = set(GroupMember.objects.filter(user_id=instance.user_id).values_list("group_id", flat=True))
+	group_ids.update(Group.objects.filter(leader_id=instance.user_id).values_list("id", flat=True))
+	for group_id in group_ids:
+		bump("group", group_id)
+
+
+def _invalidate_user_fragments(sender, instance, **kwargs):
+	bump("user", instance.faculty_id if sender is CoordinatorAssignment else instance.user_id)
+
+
+# Models shown in a group's dashboard panels; see fragments.cached_fragments().
+FRAGMENT_SOURCES = (
+	StudentEvaluation,
+	GroupEvaluation,
+	EvaluationFile,
+	Abstract,
+	ProjectReport,
+	GuideRequest,
+	CoordinatorApproval,
+	GroupMember,
+	SustainableDevelopmentGoal,
+	Group,
+)
+
+for _model in FRAGMENT_SOURCES:
+	post_save.connect(_invalidate_group_fragments, sender=_model)
+	post_delete.connect(_invalidate_group_fragments, sender=_model)
+post_save.connect(_invalidate_member_fragments, sender=StudentProfile)
+post_delete.connect(_invalidate_member_fragments, sender=StudentProfile)
+for _model in (FacultyProfile, CoordinatorAssignment):
+	post_save.connect(_invalidate_user_fragments, sender=_model)
+	post_delete.connect(_invalidate_user_fragments, sender=_model)
@@ -0,0 +1,155 @@
+import mmap
+import re
+import zlib
+
+# Stop inflating a single stream past this many bytes; guards against
+# decompression bombs without rejecting large but sane documents.
+MAX_INFLATED_STREAM = 16 * 1024 * 1024
+
+_HEADER_RE = re.compile(rb"%PDF-(\d\.\d)")
+_OBJECT_RE = re.compile(rb"(\d+)\s+\d+\s+obj\b")
+_PAGES_RE = re.compile(rb"/Type\s*/Pages\b")
+_COUNT_RE = re.compile(rb"/Count\s+(\d+)")
+_PARENT_RE = re.compile(rb"/Parent\s+\d+\s+\d+\s+R")
+_LEAF_PAGE_RE = re.compile(rb"/Type\s*/Page\b(?!s)")
+_ENCRYPT_RE = re.compile(rb"/Encrypt\s*(\d+\s+\d+\s+R|<<)")
+_TEXT_OPERATOR_RE = re.compile(rb"\bT[jJ]\b")
+_LENGTH_RE = re.compile(rb"/Length\s+(\d+)(?!\s+\d+\s+R)")
+_FIRST_RE = re.compile(rb"/First\s+(\d+)")
+
+
+class InvalidPDF(Exception):
+	pass
+
+
+def _inflate(raw):
+	inflater = zlib.decompressobj()
+	data = inflater.decompress(raw, MAX_INFLATED_STREAM)
+	return data if not inflater.unconsumed_tail else None
+
+
+def _streams(data):
+	"""Yield (dictionary, decoded body) for every stream object in the file.
+
+	Bodies that use filters other than FlateDecode, or fail to inflate, come
+	back as None.
+	"""
+	position = 0
+	while True:
+		keyword = data.find(b"stream", position)
+		if keyword < 0:
+			return
+		if data[keyword - 3:keyword] == b"end":
+			position = keyword + 6
+			continue
+		dictionary_start = data.rfind(b"obj", max(0, keyword - 4096), keyword)
+		dictionary = data[dictionary_start + 3 if dictionary_start >= 0 else keyword:keyword]
+		body_start = keyword + 6
+		if data[body_start:body_start + 2] == b"\r\n":
+			body_start += 2
+		elif data[body_start:body_start + 1] in (b"\n", b"\r"):
+			body_start += 1
+
+		length = _LENGTH_RE.search(dictionary)
+		end = body_start + int(length.group(1)) if length else -1
+		if end < 0 or data[end:end + 12].lstrip(b"\r\n ")[:9] != b"endstream":
+			end = data.find(b"endstream", body_start)
+			if end < 0:
+				return
+		raw = data[body_start:end]
+		position = end + 9
+
+		if b"/Filter" not in dictionary:
+			yield dictionary, raw
+		elif re.search(rb"/Filter\s*\[?\s*/FlateDecode\s*\]?", dictionary) and b"/DecodeParms" not in dictionary:
+			try:
+				yield dictionary, _inflate(raw)
+			except zlib.error:
+				yield dictionary, None
+		else:
+			yield dictionary, None
+
+
+def _objects(data):
+	"""Yield the source of each top-level object, split at its ``N G obj`` header."""
+	matches = list(_OBJECT_RE.finditer(data))
+	for match, following in zip(matches, matches[1:] + [None]):
+		end = following.start() if following else len(data)
+		body = data[match.end():end]
+		yield body.split(b"endobj", 1)[0]
+
+
+def _compressed_objects(stream_dict, body):
+	"""Yield the objects packed inside a PDF 1.5 object stream."""
+	first = _FIRST_RE.search(stream_dict)
+	if not first:
+		return
+	first = int(first.group(1))
+	numbers = [int(value) for value in body[:first].split()]
+	offsets = sorted(numbers[1::2])
+	for start, end in zip(offsets, offsets[1:] + [len(body) - first]):
+		yield body[first + start:first + end]
+
+
+def inspect_pdf(data):
+	"""Return version, page_count, encrypted and has_text for PDF bytes (or an mmap).
+
+	This is a tolerant scan rather than a full parser: it finds the page tree
+	root's ``/Count`` in plain and compressed objects, falls back to counting
+	page leaves, and treats any text-showing operator in a content stream as a
+	sign the document has extractable text. Raises InvalidPDF when the file is
+	not a PDF at all or is truncated.
+	"""
+	header = _HEADER_RE.search(data[:1024])
+	if not header:
+		raise InvalidPDF("Missing %PDF header.")
+	if b"%%EOF" not in data[-2048:]:
+		raise InvalidPDF("Truncated file: no %%EOF marker.")
+
+	encrypted = bool(_ENCRYPT_RE.search(data))
+
+	objects = list(_objects(data))
+	content_streams = []
+	for stream_dict, body in _streams(data):
+		if body is None:
+			continue
+		if b"/ObjStm" in stream_dict:
+			objects.extend(_compressed_objects(stream_dict, body))
+		elif not re.search(rb"/(Type\s*/XRef|Subtype\s*/Image|Length1|Subtype\s*/Type1C|Subtype\s*/CIDFontType0C)\b", stream_dict):
+			content_streams.append(body)
+
+	root_counts = []
+	leaves = 0
+	for obj in objects:
+		if _PAGES_RE.search(obj):
+			count = _COUNT_RE.search(obj)
+			if count and not _PARENT_RE.search(obj):
+				root_counts.append(int(count.group(1)))
+		elif _LEAF_PAGE_RE.search(obj):
+			leaves += 1
+	# Incremental updates append a new page tree root; the last one wins.
+	page_count = root_counts[-1] if root_counts else leaves
+	if not page_count:
+		raise InvalidPDF("No pages found.")
+
+	has_text = None
+	if not encrypted:
+		# Encrypted content streams can't be read without the key.
+		has_text = any(b"BT" in body and _TEXT_OPERATOR_RE.search(body) for body in content_streams)
+	return {
+		"version": header.group(1).decode(),
+		"page_count": page_count,
+		"encrypted": encrypted,
+		"has_text": has_text,
+	}
+
+
+def inspect_pdf_file(path):
+	"""inspect_pdf() over a memory-mapped file, so large PDFs are not read into memory."""
+	with open(path, "rb") as handle:
+		try:
+			data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+		except ValueError:
+			raise InvalidPDF("Empty file.")
+		with data:
+			return inspect_pdf(data)
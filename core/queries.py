@@ -0,0 +1,107 @@
+import os
+import re
+import sys
+import traceback
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+
+def sql_shape(sql):
+	"""Reduce a query to its shape so the same query for different rows compares equal.
+
+	Placeholders, string and number literals become ``?`` and IN lists
+	collapse to ``IN (...)``.
+	"""
+	sql = sql.replace("%s", "?")
+	sql = re.sub(r"'(?:[^']|'')*'", "?", sql)
+	sql = re.sub(r"\b\d+(?:\.\d+)?\b", "?", sql)
+	return re.sub(r"\bIN \((?:\?, )*\?\)", "IN (...)", sql)
+
+
+class RepeatedQueriesError(AssertionError):
+	"""Raised in strict mode when a query shape runs more often than allowed."""
+
+
+# Wrappers every query passes through; their frames say nothing about the caller.
+_WRAPPER_FILES = {
+	os.path.abspath(__file__),
+	os.path.join(os.path.dirname(os.path.abspath(__file__)), "middleware.py"),
+}
+
+
+def _project_frames(stack, limit=6):
+	"""The innermost ``limit`` frames of ``stack`` in this project's own code, outermost first."""
+	base_dir = str(settings.BASE_DIR) + os.sep
+	frames = [
+		frame for frame in stack
+		if frame.filename.startswith(base_dir)
+		and frame.filename not in _WRAPPER_FILES
+		and "site-packages" not in frame.filename
+	]
+	return frames[-limit:]
+
+
+class RepeatedQueryDetector:
+	"""Count the queries of each shape and remember where each shape first ran.
+
+	A database execute wrapper: install it with ``connection.execute_wrapper()``
+	or use ``detect_repeated_queries``. A shape that runs more than
+	``threshold`` times is the N+1 pattern of a query issued once per row
+	from a loop; the stack recorded for its first run points at the loop.
+	"""
+
+	def __init__(self, threshold):
+		self.threshold = threshold
+		self.counts = Counter()
+		self.first_stacks = {}
+
+	def __call__(self, execute, sql, params, many, context):
+		shape = sql_shape(sql)
+		self.counts[shape] += 1
+		if shape not in self.first_stacks:
+			# Only new shapes pay for the stack, a few dozen per request at most.
+			self.first_stacks[shape] = _project_frames(traceback.extract_stack(sys._getframe(1)))
+		return execute(sql, params, many, context)
+
+	def repeated(self):
+		"""(shape, count, first call site frames) for every shape over the threshold, most repeated first."""
+		return [
+			(shape, count, self.first_stacks[shape])
+			for shape, count in self.counts.most_common()
+			if count > self.threshold
+		]
+
+	def report(self):
+		lines = []
+		for shape, count, frames in self.repeated():
+			lines.append(f"{count} queries of the same shape (more than {self.threshold}): {shape}")
+			lines.append("First run from:")
+			lines.extend(line.rstrip("\n") for line in traceback.format_list(frames))
+		return "\n".join(lines)
+
+	def check(self):
+		"""Raise RepeatedQueriesError listing every repeated shape, if any."""
+		if self.repeated():
+			raise RepeatedQueriesError(self.report())
+
+
+@contextmanager
+def detect_repeated_queries(threshold=None, strict=True):
+	"""Watch the queries run inside the block on every database connection.
+
+	On exit, with ``strict`` a shape repeated more than ``threshold`` times
+	(``REPEATED_QUERY_THRESHOLD`` by default) raises RepeatedQueriesError;
+	otherwise the detector is only returned for inspection.
+	"""
+	if threshold is None:
+		threshold = getattr(settings, "REPEATED_QUERY_THRESHOLD", 10)
+	detector = RepeatedQueryDetector(threshold)
+	with ExitStack() as stack:
+		for connection in connections.all():
+			stack.enter_context(connection.execute_wrapper(detector))
+		yield detector
+	if strict:
+		detector.check()
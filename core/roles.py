@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+from functools import cached_property
+
+from .models import CoordinatorAssignment, FacultyProfile, StudentProfile
+
+FACULTY_ROLES = ("guide", "coordinator")
+
+
+@dataclass(frozen=True)
+class Roles:
+	"""What a user is, resolved from their profiles once.
+
+	RolesMiddleware sets ``request.roles`` for the logged-in user, whose
+	profiles ProfileModelBackend loads together with the user, so the view
+	helpers answer from memory. ``active_role`` is the role a faculty member
+	with both guide and coordinator duties picked for this session, or None.
+	"""
+
+	user_id: int | None = None
+	student_profile: StudentProfile | None = None
+	faculty_profile: FacultyProfile | None = None
+	active_role: str | None = None
+
+	@classmethod
+	def for_user(cls, user, session=None):
+		if not user.is_authenticated:
+			return cls()
+		student_profile = getattr(user, "student_profile", None)
+		faculty_profile = getattr(user, "faculty_profile", None)
+		active_role = session.get("active_role") if session is not None else None
+		is_dual = bool(faculty_profile and faculty_profile.is_guide and faculty_profile.is_coordinator)
+		return cls(
+			user_id=user.pk,
+			student_profile=student_profile,
+			faculty_profile=faculty_profile,
+			active_role=active_role if is_dual and active_role in FACULTY_ROLES else None,
+		)
+
+	@property
+	def is_student(self):
+		return self.student_profile is not None
+
+	@property
+	def is_faculty(self):
+		return self.faculty_profile is not None
+
+	@property
+	def is_guide(self):
+		return self.is_faculty and self.faculty_profile.is_guide
+
+	@property
+	def is_coordinator(self):
+		return self.is_faculty and self.faculty_profile.is_coordinator
+
+	@property
+	def is_hod(self):
+		return self.is_faculty and self.faculty_profile.is_hod
+
+	@property
+	def is_dual(self):
+		return self.is_guide and self.is_coordinator
+
+	@property
+	def department(self):
+		profile = self.faculty_profile or self.student_profile
+		return profile.department if profile else None
+
+	@property
+	def class_id(self):
+		return self.student_profile.student_class_id if self.student_profile else None
+
+	@cached_property
+	def coordinator_slots(self):
+		"""Map class_id -> the user's coordinator slot, for every class they coordinate."""
+		return {
+			class_id: slot
+			for (faculty_id, class_id), slot in CoordinatorAssignment.slot_map().items()
+			if faculty_id == self.user_id
+		}
+
+	def coordinator_slot(self, class_id):
+		"""The user's coordinator1/2 slot for ``class_id``, or None when not assigned to it."""
+		return self.coordinator_slots.get(class_id)
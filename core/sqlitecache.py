@@ -0,0 +1,267 @@
+import os
+import pickle
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+SCHEMA = [
+	"CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL, accessed REAL NOT NULL)",
+	"CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires)",
+	"CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)",
+]
+
+# SQLite binds at most 999 parameters per statement in older builds.
+CHUNK_SIZE = 900
+
+
+def _encode(value):
+	# Integers are stored as such so incr() can add to them in SQL.
+	if type(value) is int and -(2 ** 63) <= value < 2 ** 63:
+		return value
+	return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+
+def _decode(value):
+	return value if isinstance(value, int) else pickle.loads(value)
+
+
+def _chunks(items):
+	for start in range(0, len(items), CHUNK_SIZE):
+		yield items[start:start + CHUNK_SIZE]
+
+
+class SQLiteCache(BaseCache):
+	"""Cache shared by every process on the host, in one SQLite file in WAL mode.
+
+	WAL lets readers run alongside the single writer, so the server
+	processes see one cache without a cache server. incr() is a single
+	UPDATE, atomic across processes, which the fragment versions rely on.
+	Past ``MAX_ENTRIES`` a write first drops the expired entries, then the
+	least recently read ``1/CULL_FREQUENCY`` of the rest; a read records its
+	time only when the last one is older than ``ACCESS_RESOLUTION`` seconds,
+	so hot keys do not turn every read into a write. get_or_set() lets one
+	process compute a missing value while the others wait for it.
+
+	OPTIONS, besides MAX_ENTRIES and CULL_FREQUENCY: ``BUSY_TIMEOUT`` (seconds
+	to wait for the write lock, default 5), ``ACCESS_RESOLUTION`` (default
+	10) and ``LOCK_TIMEOUT`` (seconds get_or_set() waits for another
+	process's value before computing it anyway, default 10).
+	"""
+
+	def __init__(self, location, params):
+		super().__init__(params)
+		options = params.get("OPTIONS", {})
+		self._path = str(location)
+		self._busy_timeout = float(options.get("BUSY_TIMEOUT", 5))
+		self._access_resolution = float(options.get("ACCESS_RESOLUTION", 10))
+		self._lock_timeout = float(options.get("LOCK_TIMEOUT", 10))
+		self._local = threading.local()
+
+	def _connection(self):
+		"""This thread's connection, opened again in a forked child."""
+		connection = getattr(self._local, "connection", None)
+		if connection is None or self._local.pid != os.getpid():
+			connection = sqlite3.connect(self._path, timeout=self._busy_timeout, isolation_level=None, check_same_thread=False)
+			connection.execute("PRAGMA journal_mode=WAL")
+			connection.execute("PRAGMA synchronous=NORMAL")
+			for statement in SCHEMA:
+				connection.execute(statement)
+			self._local.connection = connection
+			self._local.pid = os.getpid()
+		return connection
+
+	@contextmanager
+	def _write(self):
+		"""A transaction holding the write lock from the start, so reads in it stay current."""
+		connection = self._connection()
+		connection.execute("BEGIN IMMEDIATE")
+		try:
+			yield connection
+		except BaseException:
+			connection.execute("ROLLBACK")
+			raise
+		connection.execute("COMMIT")
+
+	def _cull(self, connection, now):
+		count = connection.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+		if count < self._max_entries:
+			return
+		connection.execute("DELETE FROM cache WHERE expires <= ?", (now,))
+		if self._cull_frequency == 0:
+			connection.execute("DELETE FROM cache")
+			return
+		count = connection.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+		if count >= self._max_entries:
+			connection.execute(
+				"DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed LIMIT ?)",
+				(count // self._cull_frequency,),
+			)
+
+	def _record_access(self, keys, now):
+		connection = self._connection()
+		for chunk in _chunks(keys):
+			connection.execute(
+				f"UPDATE cache SET accessed = ? WHERE accessed < ? AND key IN ({', '.join('?' * len(chunk))})",
+				(now, now - self._access_resolution, *chunk),
+			)
+
+	def _upsert(self, connection, key, value, expires, now):
+		connection.execute(
+			"INSERT INTO cache (key, value, expires, accessed) VALUES (?, ?, ?, ?) "
+			"ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires, accessed = excluded.accessed",
+			(key, _encode(value), expires, now),
+		)
+
+	def get(self, key, default=None, version=None):
+		key = self.make_and_validate_key(key, version=version)
+		now = time.time()
+		row = self._connection().execute("SELECT value, expires, accessed FROM cache WHERE key = ?", (key,)).fetchone()
+		if row is None or (row[1] is not None and row[1] <= now):
+			return default
+		if row[2] < now - self._access_resolution:
+			self._record_access([key], now)
+		return _decode(row[0])
+
+	def get_many(self, keys, version=None):
+		keys = {self.make_and_validate_key(key, version=version): key for key in keys}
+		now = time.time()
+		found = {}
+		stale = []
+		for chunk in _chunks(list(keys)):
+			rows = self._connection().execute(
+				f"SELECT key, value, expires, accessed FROM cache WHERE key IN ({', '.join('?' * len(chunk))})", chunk,
+			)
+			for key, value, expires, accessed in rows:
+				if expires is None or expires > now:
+					found[keys[key]] = _decode(value)
+					if accessed < now - self._access_resolution:
+						stale.append(key)
+		if stale:
+			self._record_access(stale, now)
+		return found
+
+	def has_key(self, key, version=None):
+		key = self.make_and_validate_key(key, version=version)
+		row = self._connection().execute(
+			"SELECT 1 FROM cache WHERE key = ? AND (expires IS NULL OR expires > ?)", (key, time.time()),
+		).fetchone()
+		return row is not None
+
+	def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+		key = self.make_and_validate_key(key, version=version)
+		now = time.time()
+		with self._write() as connection:
+			self._cull(connection, now)
+			self._upsert(connection, key, value, self.get_backend_timeout(timeout), now)
+
+	def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+		now = time.time()
+		expires = self.get_backend_timeout(timeout)
+		with self._write() as connection:
+			self._cull(connection, now)
+			for key, value in data.items():
+				self._upsert(connection, self.make_and_validate_key(key, version=version), value, expires, now)
+		return []
+
+	def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+		key = self.make_and_validate_key(key, version=version)
+		now = time.time()
+		with self._write() as connection:
+			self._cull(connection, now)
+			cursor = connection.execute(
+				"INSERT INTO cache (key, value, expires, accessed) VALUES (?, ?, ?, ?) "
+				"ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires, accessed = excluded.accessed "
+				"WHERE cache.expires <= ?",
+				(key, _encode(value), self.get_backend_timeout(timeout), now, now),
+			)
+			return cursor.rowcount == 1
+
+	def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+		key = self.make_and_validate_key(key, version=version)
+		now = time.time()
+		cursor = self._connection().execute(
+			"UPDATE cache SET expires = ? WHERE key = ? AND (expires IS NULL OR expires > ?)",
+			(self.get_backend_timeout(timeout), key, now),
+		)
+		return cursor.rowcount == 1
+
+	def incr(self, key, delta=1, version=None):
+		key = self.make_and_validate_key(key, version=version)
+		now = time.time()
+		row = self._connection().execute(
+			"UPDATE cache SET value = value + ? "
+			"WHERE key = ? AND typeof(value) = 'integer' AND (expires IS NULL OR expires > ?) RETURNING value",
+			(delta, key, now),
+		).fetchone()
+		if row is not None:
+			return row[0]
+		# Missing, or not stored as an integer: read and write under the lock.
+		with self._write() as connection:
+			row = connection.execute(
+				"SELECT value FROM cache WHERE key = ? AND (expires IS NULL OR expires > ?)", (key, now),
+			).fetchone()
+			if row is None:
+				raise ValueError(f"Key '{key}' not found")
+			value = _decode(row[0]) + delta
+			connection.execute("UPDATE cache SET value = ? WHERE key = ?", (_encode(value), key))
+			return value
+
+	@contextmanager
+	def lock(self, key, timeout=None, version=None):
+		"""Hold the cache-wide lock ``key`` for the block, waiting up to ``timeout`` seconds.
+
+		Yields whether the lock was acquired. A lock left by a dead process
+		expires after LOCK_TIMEOUT.
+		"""
+		lock_key = f"{key}:lock"
+		token = random.getrandbits(62)
+		deadline = time.monotonic() + (self._lock_timeout if timeout is None else timeout)
+		acquired = self.add(lock_key, token, self._lock_timeout, version=version)
+		while not acquired and time.monotonic() < deadline:
+			time.sleep(0.01)
+			acquired = self.add(lock_key, token, self._lock_timeout, version=version)
+		try:
+			yield acquired
+		finally:
+			if acquired:
+				# Only our own token: after LOCK_TIMEOUT another process may hold it.
+				self._connection().execute(
+					"DELETE FROM cache WHERE key = ? AND value = ?", (self.make_and_validate_key(lock_key, version=version), token),
+				)
+
+	def get_or_set(self, key, default, timeout=DEFAULT_TIMEOUT, version=None):
+		"""BaseCache.get_or_set(), computing a missing value in one process at a time.
+
+		Under the lock the value is looked up again, so the processes that
+		waited read what the first one stored instead of computing it too.
+		"""
+		value = self.get(key, self._missing_key, version=version)
+		if value is not self._missing_key:
+			return value
+		with self.lock(key, version=version):
+			value = self.get(key, self._missing_key, version=version)
+			if value is self._missing_key:
+				value = default() if callable(default) else default
+				self.set(key, value, timeout, version=version)
+		return value
+
+	def delete(self, key, version=None):
+		key = self.make_and_validate_key(key, version=version)
+		return self._connection().execute("DELETE FROM cache WHERE key = ?", (key,)).rowcount == 1
+
+	def delete_many(self, keys, version=None):
+		keys = [self.make_and_validate_key(key, version=version) for key in keys]
+		for chunk in _chunks(keys):
+			self._connection().execute(f"DELETE FROM cache WHERE key IN ({', '.join('?' * len(chunk))})", chunk)
+
+	def clear(self):
+		self._connection().execute("DELETE FROM cache")
+
+	def close(self, **kwargs):
+		# Connections stay open for the life of their thread, like the
+		# database ones under CONN_MAX_AGE.
+		pass
@@ -0,0 +1,261 @@
+import gzip
+import hashlib
+import os
+import re
+import shutil
+import struct
+import tempfile
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import File
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage, storages
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.functional import LazyObject, empty
+
+from .uploads import sniff_kind
+
+try:
+	import brotli
+except ImportError:
+	# Optional: without it collectstatic writes only the gzip copies.
+	brotli = None
+
+BLOB_STORAGE_ALIAS = "blobs"
+GZIP_SUFFIX = ".gz"
+BROTLI_SUFFIX = ".br"
+# Static files worth compressing: text formats and the font formats that are
+# not compressed already (WOFF and WOFF2 are).
+COMPRESSIBLE_STATIC_EXTENSIONS = {".css", ".js", ".mjs", ".map", ".json", ".svg", ".txt", ".xml", ".html", ".ico", ".ttf", ".otf", ".eot"}
+# Sniffed formats (see core.uploads) that are already compressed internally.
+PRECOMPRESSED_KINDS = {"pdf", "zip"}
+_DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+def shard_name(digest):
+	"""Return the storage name for a SHA-256 hex digest, e.g. ``ab/cd/abcd...``."""
+	return f"{digest[:2]}/{digest[2:4]}/{digest}"
+
+
+def digest_from_name(name):
+	"""Return the SHA-256 hex digest encoded in a content-addressed storage name."""
+	if not name:
+		return ""
+	return os.path.basename(name).split(".", 1)[0]
+
+
+def is_compressed(name):
+	"""True when the stored file behind ``name`` is gzipped (its codec flag)."""
+	return name.endswith(GZIP_SUFFIX)
+
+
+def is_blob_name(name):
+	"""True for names produced by ContentAddressedStorage (not legacy upload paths)."""
+	return bool(name) and bool(_DIGEST_RE.match(digest_from_name(name)))
+
+
+class _GzipReader(gzip.GzipFile):
+	"""Decompresses as it is read.
+
+	It reports itself as unseekable so FileResponse doesn't seek to the end
+	(decompressing everything) just to measure it. Explicit seeks, used for
+	Range requests, still work.
+	"""
+
+	def seekable(self):
+		return False
+
+
+class ContentAddressedStorage(FileSystemStorage):
+	"""Filesystem storage that names every file after the SHA-256 of its content.
+
+	Files are written to ``<location>/<aa>/<bb>/<digest>`` so no directory grows
+	unbounded and identical content always resolves to the same path. The name
+	passed in by ``upload_to`` is ignored apart from being validated.
+
+	With ``compress`` enabled, content that is not already compressed (PDF and
+	ZIP-based Office files are left alone) is gzipped when that saves at least
+	``min_saving`` of its size. The ``.gz`` suffix on the name is the codec flag:
+	such files are decompressed on the fly when opened and report their
+	original size.
+	"""
+
+	chunk_size = 64 * 1024
+
+	def __init__(self, *args, compress=True, min_saving=0.1, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.compress = compress
+		self.min_saving = min_saving
+
+	def _reuse(self, full_path):
+		# Touch the existing copy so a pending reclaim (see StoredBlob) sees it
+		# was just referenced again and leaves it alone.
+		os.utime(full_path)
+
+	def _existing(self, digest):
+		"""Name of the stored copy of ``digest`` (raw or compressed), or None."""
+		for suffix in ("", GZIP_SUFFIX):
+			name = shard_name(digest) + suffix
+			full_path = self.path(name)
+			if os.path.exists(full_path):
+				self._reuse(full_path)
+				return name
+		return None
+
+	def get_available_name(self, name, max_length=None):
+		# Names are derived from content in _save(), so collisions are impossible.
+		return name
+
+	def _save(self, name, content):
+		digest = getattr(content, "sha256", None)
+		if digest and hasattr(content, "temporary_file_path"):
+			# Spooled by HashingFileUploadHandler: already hashed and sniffed.
+			return self._existing(digest) or self._store(digest, content.temporary_file_path(), getattr(content, "kind", None))
+
+		os.makedirs(self.location, exist_ok=True)
+		hasher = hashlib.sha256()
+		head = b""
+		fd, tmp_path = tempfile.mkstemp(dir=self.location, prefix=".incoming-")
+		try:
+			with os.fdopen(fd, "wb") as tmp_file:
+				for chunk in content.chunks(self.chunk_size):
+					if not head:
+						head = chunk[:16]
+					hasher.update(chunk)
+					tmp_file.write(chunk)
+			digest = hasher.hexdigest()
+			name = self._existing(digest) or self._store(digest, tmp_path, sniff_kind(head))
+		finally:
+			if os.path.exists(tmp_path):
+				os.unlink(tmp_path)
+		return name
+
+	def _store(self, digest, source_path, kind):
+		"""Move (or compress) the file at ``source_path`` into place for ``digest``."""
+		name = shard_name(digest)
+		full_path = self.path(name)
+		os.makedirs(os.path.dirname(full_path), exist_ok=True)
+
+		compressed_path = None
+		if self.compress and kind not in PRECOMPRESSED_KINDS:
+			compressed_path = self.compress_file(source_path)
+		if compressed_path:
+			name += GZIP_SUFFIX
+			full_path += GZIP_SUFFIX
+			os.replace(compressed_path, full_path)
+		else:
+			file_move_safe(source_path, full_path, allow_overwrite=True)
+		if self.file_permissions_mode is not None:
+			os.chmod(full_path, self.file_permissions_mode)
+		return name
+
+	def compress_file(self, source_path):
+		"""Gzip ``source_path`` to a temp file; return its path if it is worth keeping."""
+		fd, tmp_path = tempfile.mkstemp(dir=self.location, prefix=".incoming-", suffix=GZIP_SUFFIX)
+		try:
+			with open(source_path, "rb") as source, os.fdopen(fd, "wb") as raw:
+				with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6, mtime=0) as target:
+					shutil.copyfileobj(source, target, self.chunk_size)
+			if os.path.getsize(tmp_path) <= os.path.getsize(source_path) * (1 - self.min_saving):
+				return tmp_path
+		except BaseException:
+			os.unlink(tmp_path)
+			raise
+		os.unlink(tmp_path)
+		return None
+
+	def _open(self, name, mode="rb"):
+		if not is_compressed(name):
+			return super()._open(name, mode)
+		if "w" in mode or "a" in mode:
+			raise ValueError("Compressed blobs are read-only.")
+		file = File(_GzipReader(self.path(name), mode="rb"), name=name)
+		file.size = self.size(name)
+		return file
+
+	def size(self, name):
+		if not is_compressed(name):
+			return super().size(name)
+		# The gzip trailer ends with the uncompressed size modulo 2**32; uploads
+		# are far below that.
+		with open(self.path(name), "rb") as handle:
+			handle.seek(-4, os.SEEK_END)
+			return struct.unpack("<I", handle.read(4))[0]
+
+
+class BlobStorage(LazyObject):
+	"""Lazy handle on the storage configured under ``STORAGES["blobs"]``."""
+
+	def _setup(self):
+		if BLOB_STORAGE_ALIAS in settings.STORAGES:
+			self._wrapped = storages[BLOB_STORAGE_ALIAS]
+		else:
+			self._wrapped = ContentAddressedStorage(location=os.path.join(settings.MEDIA_ROOT, "blobs"))
+
+
+blob_storage = BlobStorage()
+
+
+def get_blob_storage():
+	"""Storage callable for FileFields so migrations don't freeze the backend."""
+	return blob_storage
+
+
+@receiver(setting_changed)
+def _reset_blob_storage(*, setting, **kwargs):
+	if setting in ("STORAGES", "MEDIA_ROOT"):
+		blob_storage._wrapped = empty
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+	"""ManifestStaticFilesStorage that also writes compressed copies of the text assets.
+
+	At collectstatic time each CSS, JS, SVG, ... file, under its original and
+	its fingerprinted name, gets a ``.gz`` copy, and a ``.br`` one when the
+	``brotli`` package is installed, if that saves at least ``min_saving`` of
+	its size. The web server (nginx ``gzip_static``/``brotli_static``, or
+	core.middleware.StaticFilesMiddleware) sends those as they are instead of
+	compressing the file on every request.
+
+	Until collectstatic has written the manifest, in development and tests,
+	``{% static %}`` returns the unhashed names instead of failing.
+	"""
+
+	def __init__(self, *args, min_saving=0.05, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.min_saving = min_saving
+
+	def stored_name(self, name):
+		if not self.hashed_files:
+			return name
+		return super().stored_name(name)
+
+	def post_process(self, paths, dry_run=False, **options):
+		yield from super().post_process(paths, dry_run, **options)
+		if dry_run:
+			return
+		for name in sorted(set(paths) | set(self.hashed_files.values())):
+			if os.path.splitext(name)[1].lower() in COMPRESSIBLE_STATIC_EXTENSIONS:
+				self.compress_file(name)
+
+	def compress_file(self, name):
+		"""Write the ``.gz`` and ``.br`` copies of ``name`` that are worth keeping; return their suffixes."""
+		path = self.path(name)
+		with open(path, "rb") as handle:
+			content = handle.read()
+		codecs = {GZIP_SUFFIX: lambda: gzip.compress(content, compresslevel=9, mtime=0)}
+		if brotli is not None:
+			codecs[BROTLI_SUFFIX] = lambda: brotli.compress(content)
+		written = []
+		for suffix, compress in codecs.items():
+			compressed = compress()
+			if len(compressed) <= len(content) * (1 - self.min_saving):
+				with open(path + suffix, "wb") as handle:
+					handle.write(compressed)
+				written.append(suffix)
+			elif os.path.exists(path + suffix):
+				# Left from an earlier version of the file that compressed better.
+				os.unlink(path + suffix)
+		return written
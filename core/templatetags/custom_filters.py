@@ -40,3 +40,23 @@ def sdg_title(sdg_number):
         '17': '17. Partnerships for the Goals'
     }
     return sdg_titles.get(str(sdg_number), sdg_number)
+
+
+@register.filter(name='pdf_pages')
+def pdf_pages(pdf_info):
+    """
+    Describe a file's page count from its StoredBlob PDF metadata.
+    Usage: {{ abstract.pdf_info|pdf_pages }}
+    """
+    if pdf_info is None:
+        return '—'
+    if pdf_info.pdf_checked_at is None:
+        return 'Checking…'
+    if not pdf_info.pdf_valid:
+        return 'Invalid PDF'
+    label = f'{pdf_info.page_count} page' + ('' if pdf_info.page_count == 1 else 's')
+    if pdf_info.is_encrypted:
+        label += ' (encrypted)'
+    elif pdf_info.has_text is False:
+        label += ' (no text)'
+    return label
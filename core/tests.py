@@ -1,3 +1,1989 @@
-from django.test import TestCase
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+import zlib
+from collections import Counter
+from datetime import timedelta
+from urllib.parse import unquote
 
-# Create your tests here.
+from django import forms, test
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.messages import get_messages
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache, caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.template.backends.django import Template as DjangoTemplate
+from django.test import LiveServerTestCase, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .backends import ProfileModelBackend
+from .downloads import content_digest
+from .fragments import fragment_stats, reset_fragment_stats, versions
+from .loaders import StudentWorkspace
+from .middleware import RequestTimingMiddleware
+from .queries import RepeatedQueriesError, detect_repeated_queries, sql_shape
+from .roles import Roles
+from .sqlitecache import SQLiteCache
+from .views import COORDINATOR_GROUPS_PER_PAGE, STUDENT_SEARCH_PAGE_SIZE
+from .storage import blob_storage
+from .uploads import rejected_upload
+from .models import (
+	Abstract,
+	Class,
+	CoordinatorApproval,
+	CoordinatorAssignment,
+	EvaluationFile,
+	FacultyProfile,
+	Group,
+	GroupEvaluation,
+	GroupMember,
+	GroupRequest,
+	GuideRequest,
+	ProjectReport,
+	StudentEvaluation,
+	StudentProfile,
+	StoredBlob,
+	SustainableDevelopmentGoal,
+)
+
+STAGES = ["zeroth", "first", "second", "final"]
+
+
+class TemporaryCacheMixin:
+	"""Point CACHES at a SQLite cache in a throwaway directory for the test case.
+
+	The cache.sqlite3 in BASE_DIR is shared with any server running from the
+	checkout, and the test processes of ``test --parallel`` would clear each
+	other's entries, whose group ids collide across their databases.
+	"""
+
+	@classmethod
+	def setUpClass(cls):
+		cls._cache_dir = tempfile.mkdtemp()
+		caches = {
+			**settings.CACHES,
+			"default": {**settings.CACHES["default"], "LOCATION": os.path.join(cls._cache_dir, "cache.sqlite3")},
+		}
+		cls._cache_override = override_settings(CACHES=caches)
+		cls._cache_override.enable()
+		super().setUpClass()
+
+	@classmethod
+	def tearDownClass(cls):
+		super().tearDownClass()
+		cls._cache_override.disable()
+		shutil.rmtree(cls._cache_dir, ignore_errors=True)
+
+
+class TestCase(TemporaryCacheMixin, test.TestCase):
+	"""Also starts every test with an empty cache of its own.
+
+	Rolling back a test does not undo what it cached, such as
+	CoordinatorAssignment.slot_map(), and the next test's rows reuse its ids.
+	"""
+
+	def _pre_setup(self):
+		super()._pre_setup()
+		cache.clear()
+
+
+def build_department(group_count=1, members_per_group=4, department="CSE"):
+	"""Seed one class with two coordinators, a guide, a HOD and fully populated groups."""
+	student_class = Class.objects.create(name=f"{department}-A", department=department)
+
+	def faculty(username, **roles):
+		user = User.objects.create_user(username=f"{department.lower()}-{username}")
+		FacultyProfile.objects.create(user=user, department=department, **roles)
+		return user
+
+	coordinators = [faculty(f"coord{i}", is_coordinator=True) for i in (1, 2)]
+	for coordinator in coordinators:
+		CoordinatorAssignment.objects.create(faculty=coordinator, student_class=student_class)
+	guide = faculty("guide", is_guide=True)
+	hod = faculty("hod", is_hod=True)
+
+	groups = []
+	for group_index in range(group_count):
+		students = []
+		for member_index in range(members_per_group):
+			user = User.objects.create_user(username=f"{department.lower()}-s{group_index}_{member_index}")
+			StudentProfile.objects.create(user=user, student_class=student_class, department=department)
+			students.append(user)
+		group = Group.objects.create(leader=students[0])
+		for student in students:
+			GroupMember.objects.create(group=group, user=student)
+		for coordinator in coordinators:
+			CoordinatorApproval.objects.create(group=group, coordinator=coordinator, status=CoordinatorApproval.STATUS_APPROVED)
+		GuideRequest.objects.create(group=group, guide=guide, message="Please guide us", status=GuideRequest.STATUS_ACCEPTED)
+		Abstract.objects.create(
+			group=group,
+			title=f"Topic {group_index}",
+			abstract_text="Abstract",
+			pdf_file=b"%PDF-1.4 inline",
+			pdf_filename="abstract.pdf",
+			pdf_size=15,
+			guide_status=Abstract.STATUS_APPROVED,
+			coordinator_status=Abstract.STATUS_APPROVED,
+			is_final_approved=True,
+		)
+		for stage in STAGES:
+			GroupEvaluation.objects.create(group=group, stage=stage)
+			EvaluationFile.objects.create(
+				group=group,
+				stage=stage,
+				file_data=b"%PDF-1.4 inline",
+				file_name=f"{stage}.pdf",
+				file_size=15,
+				file_type="application/pdf",
+				uploaded_by=students[0],
+			)
+		for student in students:
+			for stage in ("first", "second"):
+				StudentEvaluation.objects.create(student=student, group=group, stage=stage)
+		groups.append(group)
+
+	return {
+		"class": student_class,
+		"coordinators": coordinators,
+		"guide": guide,
+		"hod": hod,
+		"groups": groups,
+	}
+
+
+class BlobFreeDashboardTests(TestCase):
+	"""Dashboards list files by name and size and must never load their bytes."""
+
+	BLOB_COLUMNS = ('"core_abstract"."pdf_file"', '"core_evaluationfile"."file_data"')
+
+	@classmethod
+	def setUpTestData(cls):
+		cls.data = build_department(group_count=2)
+
+	def assertNoBlobColumnsSelected(self, user, url_name):
+		self.client.force_login(user)
+		with CaptureQueriesContext(connection) as ctx:
+			response = self.client.get(reverse(url_name))
+		self.assertEqual(response.status_code, 200)
+		for query in ctx.captured_queries:
+			sql = query["sql"]
+			if not sql.startswith("SELECT"):
+				continue
+			for column in self.BLOB_COLUMNS:
+				self.assertNotIn(column, sql, f"{url_name} selected {column}:\n{sql}")
+
+	def test_student_pages(self):
+		leader = self.data["groups"][0].leader
+		for url_name in ("dashboard", "mini_project", "abstract_status"):
+			with self.subTest(url_name=url_name):
+				self.assertNoBlobColumnsSelected(leader, url_name)
+
+	def test_guide_pages(self):
+		for url_name in ("guide_dashboard", "faculty_abstracts"):
+			with self.subTest(url_name=url_name):
+				self.assertNoBlobColumnsSelected(self.data["guide"], url_name)
+
+	def test_coordinator_dashboard(self):
+		self.assertNoBlobColumnsSelected(self.data["coordinators"][0], "coordinator_dashboard")
+
+	def test_hod_dashboard(self):
+		self.assertNoBlobColumnsSelected(self.data["hod"], "hod_dashboard")
+
+	def test_download_still_reads_inline_content(self):
+		eval_file = EvaluationFile.objects.filter(group=self.data["groups"][0]).first()
+		self.client.force_login(self.data["groups"][0].leader)
+		response = self.client.get(reverse("download_evaluation_file", args=[eval_file.id]))
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(b"".join(response.streaming_content), b"%PDF-1.4 inline")
+
+
+class DashboardQueryBudgetTests(TestCase):
+	"""Dashboards load their data in a fixed number of queries whatever the number of groups."""
+
+	COORDINATOR_DASHBOARD_QUERIES = 11
+	COORDINATOR_GROUP_DETAIL_QUERIES = 13
+	GUIDE_DASHBOARD_QUERIES = 13
+	# With every panel in the fragment cache: the session and the user, then
+	# for the guide the group ids, pending requests and abstracts.
+	CACHED_COORDINATOR_GROUP_DETAIL_QUERIES = 2
+	CACHED_GUIDE_DASHBOARD_QUERIES = 5
+
+	def assertCoordinatorDashboardQueries(self, group_count):
+		data = build_department(group_count=group_count, department=f"Q{group_count}")
+		self.client.force_login(data["coordinators"][0])
+		with self.assertNumQueries(self.COORDINATOR_DASHBOARD_QUERIES):
+			response = self.client.get(reverse("coordinator_dashboard"))
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(response.context["page_obj"].paginator.count, group_count)
+		self.assertEqual(len(response.context["group_details"]), min(group_count, COORDINATOR_GROUPS_PER_PAGE))
+
+		group = data["groups"][-1]
+		with self.assertNumQueries(self.COORDINATOR_GROUP_DETAIL_QUERIES):
+			response = self.client.get(reverse("coordinator_group_detail", args=[group.id]))
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(response.context["item"]["group"], group)
+		with self.assertNumQueries(self.CACHED_COORDINATOR_GROUP_DETAIL_QUERIES):
+			self.assertEqual(self.client.get(reverse("coordinator_group_detail", args=[group.id])).content, response.content)
+
+	def test_coordinator_dashboard_with_10_groups(self):
+		self.assertCoordinatorDashboardQueries(10)
+
+	def test_coordinator_dashboard_with_500_groups(self):
+		self.assertCoordinatorDashboardQueries(500)
+
+	def assertGuideDashboardQueries(self, group_count):
+		data = build_department(group_count=group_count, department=f"G{group_count}")
+		self.client.force_login(data["guide"])
+		with self.assertNumQueries(self.GUIDE_DASHBOARD_QUERIES):
+			response = self.client.get(reverse("guide_dashboard"))
+		self.assertEqual(response.status_code, 200)
+		with self.assertNumQueries(self.CACHED_GUIDE_DASHBOARD_QUERIES):
+			cached = self.client.get(reverse("guide_dashboard"))
+		self.assertEqual(cached.context["group_panels"], response.context["group_panels"])
+		return data, response.context["group_panels"]
+
+	def test_guide_dashboard_with_10_groups(self):
+		data, group_panels = self.assertGuideDashboardQueries(10)
+		self.assertEqual(len(group_panels), len(data["groups"]))
+		for number, (group, panel) in enumerate(zip(data["groups"], group_panels), start=1):
+			self.assertIn(f"Group {number}</h5>", panel)
+			self.assertIn(f"<strong style=\"color: #e5e7eb;\">Leader:</strong> {group.leader.username}", panel)
+			for member in GroupMember.objects.filter(group=group).select_related("user"):
+				self.assertIn(f'<span class="badge badge-secondary">{member.user.username}</span>', panel)
+			zeroth_file = EvaluationFile.objects.get(group=group, stage="zeroth")
+			self.assertIn(reverse("download_evaluation_file", args=[zeroth_file.id]), panel)
+			self.assertIn(reverse("submit_guide_evaluation", args=[group.id, "zeroth"]), panel)
+			self.assertIn("<strong>Locked:</strong> Complete Zeroth Evaluation first.", panel)
+
+	def test_guide_dashboard_with_500_groups(self):
+		self.assertGuideDashboardQueries(500)
+
+
+class CoordinatorGroupListTests(TestCase):
+	@classmethod
+	def setUpTestData(cls):
+		cls.data = build_department(group_count=COORDINATOR_GROUPS_PER_PAGE + 5)
+		cls.coordinator = cls.data["coordinators"][0]
+		cls.groups = cls.data["groups"]
+
+	def setUp(self):
+		self.client.force_login(self.coordinator)
+
+	def listed(self, **params):
+		response = self.client.get(reverse("coordinator_dashboard"), params)
+		self.assertEqual(response.status_code, 200)
+		return [item["group"].id for item in response.context["group_details"]]
+
+	def test_pages(self):
+		self.assertEqual(self.listed(), [group.id for group in self.groups[:COORDINATOR_GROUPS_PER_PAGE]])
+		self.assertEqual(self.listed(page=2), [group.id for group in self.groups[COORDINATOR_GROUPS_PER_PAGE:]])
+
+	def test_list_leaves_panels_to_the_detail_endpoint(self):
+		group = self.groups[0]
+		page = self.client.get(reverse("coordinator_dashboard")).content.decode()
+		self.assertIn(reverse("coordinator_group_detail", args=[group.id]), page)
+		self.assertNotIn("Zeroth Evaluation", page)
+		detail = self.client.get(reverse("coordinator_group_detail", args=[group.id])).content.decode()
+		self.assertIn("Zeroth Evaluation", detail)
+
+	def test_stage_filter(self):
+		group = self.groups[3]
+		StudentEvaluation.objects.filter(group=group, stage="first").update(finalized=True)
+		self.assertEqual(self.listed(stage="first_complete"), [group.id])
+		self.assertNotIn(group.id, self.listed(stage="first_pending", page=1))
+		self.assertEqual(self.listed(stage="second_complete"), [])
+
+	def test_ese_and_report_filters(self):
+		ready, submitted = self.groups[1], self.groups[2]
+		ProjectReport.objects.create(group=ready, report_file="project_reports/ready.pdf", uploaded_by=ready.leader, final_mark=8)
+		ProjectReport.objects.create(group=submitted, report_file="project_reports/draft.pdf", uploaded_by=submitted.leader)
+		StudentEvaluation.objects.filter(group=ready, stage="second").update(
+			guide_submitted=True,
+			coordinator1_submitted=True,
+			coordinator2_submitted=True,
+			final_guide_submitted=True,
+			attendance_submitted=True,
+			cie_calculated=True,
+		)
+		self.assertEqual(self.listed(ese="ready"), [ready.id])
+		self.assertEqual(self.listed(report="evaluated"), [ready.id])
+		self.assertEqual(self.listed(report="pending"), [submitted.id])
+		self.assertNotIn(ready.id, self.listed(report="missing"))
+
+	def test_class_filter_and_sort(self):
+		other_class = Class.objects.create(name="CSE-B", department="CSE")
+		moved = self.groups[5]
+		StudentProfile.objects.filter(user=moved.leader).update(student_class=other_class)
+		self.assertEqual(self.listed(**{"class": other_class.id}), [moved.id])
+		self.assertEqual(self.listed(sort="newest")[0], self.groups[-1].id)
+		self.assertEqual(self.listed(sort="class", page=2)[-1], moved.id)
+
+	def test_detail_is_limited_to_own_department(self):
+		outsider_group = build_department(department="ECE")["groups"][0]
+		response = self.client.get(reverse("coordinator_group_detail", args=[outsider_group.id]))
+		self.assertEqual(response.status_code, 404)
+		self.client.force_login(self.groups[0].leader)
+		response = self.client.get(reverse("coordinator_group_detail", args=[self.groups[0].id]))
+		self.assertEqual(response.status_code, 403)
+
+	def test_detail_needs_the_coordinator_role_of_a_dual_role_faculty_member(self):
+		FacultyProfile.objects.filter(user=self.coordinator).update(is_guide=True)
+		url = reverse("coordinator_group_detail", args=[self.groups[0].id])
+		for active_role, status in ((None, 403), ("guide", 403), ("coordinator", 200)):
+			session = self.client.session
+			session["active_role"] = active_role
+			session.save()
+			self.assertEqual(self.client.get(url).status_code, status, active_role)
+
+
+class StudentWorkspaceTests(TestCase):
+	@classmethod
+	def setUpTestData(cls):
+		cls.data = build_department(group_count=2)
+		cls.group = cls.data["groups"][0]
+		cls.member = GroupMember.objects.filter(group=cls.group).exclude(user=cls.group.leader).first().user
+
+	def test_loads_group_state_for_leader_and_member(self):
+		for user in (self.group.leader, self.member):
+			with self.subTest(user=user.username):
+				workspace = StudentWorkspace(user)
+				self.assertEqual(workspace.group, self.group)
+				self.assertEqual(workspace.is_leader, user == self.group.leader)
+				self.assertEqual(workspace.size, 4)
+				self.assertEqual(workspace.assigned_guide, self.data["guide"])
+				self.assertEqual(workspace.selected_topic, Abstract.objects.get(group=self.group))
+				self.assertEqual(workspace.student_evaluations["second"], StudentEvaluation.objects.get(student=user, stage="second"))
+				self.assertEqual(
+					{stage: evaluation.pk for stage, evaluation in workspace.evaluations.items()},
+					{stage: GroupEvaluation.objects.get(group=self.group, stage=stage).pk for stage in STAGES},
+				)
+
+	def test_stage_completion(self):
+		self.assertFalse(StudentWorkspace(self.member).stage_completed("first"))
+		StudentEvaluation.objects.filter(group=self.group, stage="first").update(finalized=True)
+		workspace = StudentWorkspace(self.member)
+		self.assertTrue(workspace.stage_completed("first"))
+		self.assertFalse(workspace.stage_completed("second"))
+
+	def test_student_without_group(self):
+		loner = User.objects.create_user(username="loner")
+		StudentProfile.objects.create(user=loner, student_class=self.data["class"], department="CSE")
+		workspace = StudentWorkspace(loner)
+		self.assertIsNone(workspace.group)
+		self.assertEqual((workspace.size, workspace.evaluations, workspace.stage_completed("first")), (0, {}, False))
+		self.client.force_login(loner)
+		self.assertEqual(self.client.get(reverse("mini_project")).status_code, 200)
+
+	def test_memoized_per_request(self):
+		request = RequestFactory().get("/")
+		request.user = self.group.leader
+		workspace = StudentWorkspace.for_request(request)
+		with self.assertNumQueries(0):
+			self.assertIs(StudentWorkspace.for_request(request), workspace)
+
+	def test_mini_project_query_budget(self):
+		self.client.force_login(self.group.leader)
+		with self.assertNumQueries(11):
+			response = self.client.get(reverse("mini_project"))
+		self.assertEqual(response.status_code, 200)
+		self.assertFalse(response.context["first_complete"])
+
+
+class StudentSearchTests(TestCase):
+	@classmethod
+	def setUpTestData(cls):
+		cls.data = build_department()
+		cls.leader = cls.data["groups"][0].leader
+		for index in range(STUDENT_SEARCH_PAGE_SIZE + 5):
+			user = User.objects.create_user(username=f"free{index:02d}", first_name=f"Asha{index:02d}", last_name="Menon")
+			StudentProfile.objects.create(
+				user=user,
+				student_class=cls.data["class"],
+				department="CSE",
+				roll_number=f"R{index:02d}",
+				register_number=f"REG2024{index:02d}",
+			)
+
+	def setUp(self):
+		self.client.force_login(self.leader)
+
+	def search(self, **params):
+		response = self.client.get(reverse("student_search"), params)
+		self.assertEqual(response.status_code, 200)
+		return response.json()
+
+	def test_keyset_pages(self):
+		first = self.search(q="free")
+		self.assertEqual(len(first["results"]), STUDENT_SEARCH_PAGE_SIZE)
+		self.assertEqual(first["next"], first["results"][-1]["username"])
+		second = self.search(q="free", after=first["next"])
+		self.assertIsNone(second["next"])
+		usernames = [student["username"] for student in first["results"] + second["results"]]
+		self.assertEqual(usernames, [f"free{index:02d}" for index in range(STUDENT_SEARCH_PAGE_SIZE + 5)])
+
+	def test_prefix_on_each_field_ignores_case(self):
+		for query in ("FREE03", "r03", "reg202403", "asha03", "asha03 men"):
+			with self.subTest(query=query):
+				self.assertEqual([student["username"] for student in self.search(q=query)["results"]], ["free03"])
+		self.assertEqual(len(self.search(q="menon")["results"]), STUDENT_SEARCH_PAGE_SIZE)
+		self.assertEqual(self.search(q="03")["results"], [])
+
+	def test_students_in_groups_are_excluded(self):
+		self.assertEqual(self.search(q="cse-s")["results"], [])
+		self.assertEqual(self.search(q="")["results"], [])
+
+	def test_search_query_budget(self):
+		with self.assertNumQueries(3):
+			self.search(q="free")
+
+	def test_only_students_can_search(self):
+		self.client.force_login(self.data["guide"])
+		self.assertEqual(self.client.get(reverse("student_search"), {"q": "free"}).status_code, 403)
+
+	def test_mini_project_does_not_list_students(self):
+		response = self.client.get(reverse("mini_project"))
+		self.assertEqual(response.status_code, 200)
+		self.assertNotIn("available_students", response.context)
+		self.assertNotContains(response, "free00")
+
+
+class RolesTests(TestCase):
+	def setUp(self):
+		self.data = build_department(group_count=1, department="R")
+
+	def test_backend_loads_profiles_with_the_user(self):
+		backend = ProfileModelBackend()
+		student = self.data["groups"][0].leader
+		with self.assertNumQueries(1):
+			user = backend.get_user(student.pk)
+			roles = Roles.for_user(user)
+		self.assertTrue(roles.is_student)
+		self.assertFalse(roles.is_faculty)
+		self.assertEqual((roles.department, roles.class_id), ("R", self.data["class"].id))
+
+	def test_request_roles(self):
+		coordinator = self.data["coordinators"][1]
+		FacultyProfile.objects.filter(user=coordinator).update(is_guide=True)
+		self.client.force_login(coordinator)
+		self.client.post(reverse("role_selection"), {"role": "coordinator"})
+		response = self.client.get(reverse("coordinator_dashboard"))
+		roles = response.wsgi_request.roles
+		self.assertTrue(roles.is_dual)
+		self.assertEqual(roles.active_role, "coordinator")
+		self.assertEqual(roles.coordinator_slots, {self.data["class"].id: 2})
+		# Answered from the request's slots without going back to the cache.
+		CoordinatorAssignment.forget_slots()
+		with self.assertNumQueries(0):
+			self.assertEqual(roles.coordinator_slot(self.data["class"].id), 2)
+			self.assertIsNone(roles.coordinator_slot(self.data["class"].id + 1))
+		with self.assertRaises(AttributeError):
+			roles.active_role = "guide"
+
+	def test_active_role_only_for_dual_faculty(self):
+		session = {"active_role": "guide"}
+		self.assertIsNone(Roles.for_user(self.data["coordinators"][0], session).active_role)
+		self.assertIsNone(Roles.for_user(self.data["guide"], session).active_role)
+		self.assertFalse(Roles.for_user(AnonymousUser()).is_faculty)
+
+
+class CoordinatorSlotTests(TestCase):
+	def setUp(self):
+		self.data = build_department(group_count=1, department="S")
+		self.first, self.second = self.data["coordinators"]
+
+	def test_slots_survive_reassignment(self):
+		student_class = self.data["class"]
+		self.assertEqual(
+			list(CoordinatorAssignment.objects.order_by("slot").values_list("faculty", "slot")),
+			[(self.first.id, 1), (self.second.id, 2)],
+		)
+		CoordinatorAssignment.objects.get(faculty=self.first).delete()
+		replacement = User.objects.create_user(username="s-coord3")
+		FacultyProfile.objects.create(user=replacement, department="S", is_coordinator=True)
+		CoordinatorAssignment.objects.create(faculty=replacement, student_class=student_class)
+		self.assertEqual(CoordinatorAssignment.slot_for(self.second.id, student_class.id), 2)
+		self.assertEqual(CoordinatorAssignment.slot_for(replacement.id, student_class.id), 1)
+		self.assertIsNone(CoordinatorAssignment.slot_for(self.first.id, student_class.id))
+
+		self.client.force_login(self.second)
+		response = self.client.get(reverse("coordinator_group_detail", args=[self.data["groups"][0].id]))
+		self.assertEqual(response.context["item"]["coordinator_role"], 2)
+
+	def test_slot_map_is_cached_until_assignments_change(self):
+		class_id = self.data["class"].id
+		with self.assertNumQueries(1):
+			CoordinatorAssignment.slot_map()
+		with self.assertNumQueries(0):
+			self.assertEqual(CoordinatorAssignment.slot_for(self.first.id, class_id), 1)
+		other_class = Class.objects.create(name="S-B", department="S")
+		CoordinatorAssignment.objects.create(faculty=self.first, student_class=other_class)
+		self.assertEqual(CoordinatorAssignment.slot_for(self.first.id, other_class.id), 1)
+		CoordinatorAssignment.objects.filter(student_class=other_class).delete()
+		self.assertIsNone(CoordinatorAssignment.slot_for(self.first.id, other_class.id))
+
+
+@override_settings(REQUEST_TIMING_SAMPLE_RATE=1.0)
+class RequestTimingTests(TestCase):
+	def setUp(self):
+		self.data = build_department(group_count=1, department="T")
+		self.client.force_login(self.data["coordinators"][0])
+
+	def test_reports_queries_and_timings(self):
+		url = reverse("coordinator_dashboard")
+		with override_settings(REQUEST_TIMING_HEADER="all"), self.assertLogs("core.middleware", "INFO") as logs, CaptureQueriesContext(connection) as queries:
+			response = self.client.get(url)
+		self.assertEqual(response.status_code, 200)
+		timings = dict(re.findall(r"(\w+);dur=([\d.]+)", response["Server-Timing"]))
+		self.assertEqual(set(timings), {"db", "tpl", "view", "total"})
+		self.assertGreater(float(timings["tpl"]), 0)
+		self.assertLessEqual(float(timings["view"]), float(timings["total"]))
+		self.assertIn(f'desc="{len(queries)} queries"', response["Server-Timing"])
+
+		record = logs.records[-1]
+		self.assertEqual(record.url_name, "coordinator_dashboard")
+		self.assertEqual(record.status, 200)
+		self.assertEqual(record.queries, len(queries))
+		self.assertIn("url_name=coordinator_dashboard method=GET status=200", record.getMessage())
+
+	def test_counts_queries_without_debug(self):
+		with override_settings(DEBUG=False), self.assertLogs("core.middleware", "INFO") as logs:
+			self.client.get(reverse("coordinator_dashboard"))
+		self.assertGreater(logs.records[-1].queries, 0)
+
+	def test_sampling(self):
+		with override_settings(REQUEST_TIMING_SAMPLE_RATE=0), self.assertNoLogs("core.middleware", "INFO"):
+			response = self.client.get(reverse("coordinator_dashboard"))
+		self.assertNotIn("Server-Timing", response)
+
+		with override_settings(REQUEST_TIMING_HEADER="off", DEBUG=True), self.assertLogs("core.middleware", "INFO"):
+			response = self.client.get(reverse("coordinator_dashboard"))
+		self.assertNotIn("Server-Timing", response)
+
+	def test_header_is_for_staff_only_by_default(self):
+		with self.assertLogs("core.middleware", "INFO"):
+			response = self.client.get(reverse("coordinator_dashboard"))
+		self.assertNotIn("Server-Timing", response)
+		self.assertNotIn("Server-Timing", self.client.get(reverse("login")))
+
+		User.objects.filter(pk=self.data["coordinators"][0].pk).update(is_staff=True)
+		self.assertIn("Server-Timing", self.client.get(reverse("coordinator_dashboard")))
+		with override_settings(DEBUG=True):
+			self.client.logout()
+			self.assertIn("Server-Timing", self.client.get(reverse("login")))
+
+
+	def test_building_the_middleware_leaves_templates_alone(self):
+		installed = DjangoTemplate.render
+		self.assertTrue(installed.timed)
+		DjangoTemplate.render = installed.__wrapped__
+		self.addCleanup(setattr, DjangoTemplate, "render", installed)
+		RequestTimingMiddleware(lambda request: None)
+		self.assertIs(DjangoTemplate.render, installed.__wrapped__)
+
+
+class RepeatedQueryTests(TestCase):
+	def test_reports_first_call_site(self):
+		data = build_department(group_count=4, department="N")
+		with self.assertRaises(RepeatedQueriesError) as raised, detect_repeated_queries(threshold=3):
+			for group in data["groups"]:
+				list(GroupMember.objects.filter(group=group))
+		report = str(raised.exception)
+		self.assertIn("4 queries of the same shape (more than 3)", report)
+		self.assertIn('WHERE "core_groupmember"."group_id" = ?', report)
+		self.assertIn("list(GroupMember.objects.filter(group=group))", report)
+		self.assertNotIn("site-packages", report)
+
+		with detect_repeated_queries(threshold=4) as detector:
+			for group in data["groups"]:
+				list(GroupMember.objects.filter(group=group))
+		self.assertEqual(detector.repeated(), [])
+
+	def test_sql_shape(self):
+		self.assertEqual(
+			sql_shape("SELECT * FROM t WHERE a = %s AND b IN (%s, %s, %s) AND c = 'x' LIMIT 21"),
+			"SELECT * FROM t WHERE a = ? AND b IN (...) AND c = ? LIMIT ?",
+		)
+
+	def test_middleware_modes(self):
+		data = build_department(group_count=1, department="M")
+		self.client.force_login(data["guide"])
+		url = reverse("guide_dashboard")
+		with override_settings(REPEATED_QUERY_MODE="log", REPEATED_QUERY_THRESHOLD=0):
+			with self.assertLogs("core.middleware", "WARNING") as logs:
+				response = self.client.get(url)
+			self.assertEqual(response.status_code, 200)
+			self.assertIn("Repeated queries in url_name=guide_dashboard", logs.output[0])
+		with override_settings(REPEATED_QUERY_MODE="raise", REPEATED_QUERY_THRESHOLD=0):
+			self.client = self.client_class()
+			self.client.force_login(data["guide"])
+			with self.assertRaises(RepeatedQueriesError):
+				self.client.get(url)
+
+	@override_settings(REPEATED_QUERY_MODE="raise", REPEATED_QUERY_THRESHOLD=5)
+	def test_dashboards_do_not_repeat_queries_per_group(self):
+		data = build_department(group_count=COORDINATOR_GROUPS_PER_PAGE + 5, department="D")
+		for user, url_name in [(data["coordinators"][0], "coordinator_dashboard"), (data["guide"], "guide_dashboard"), (data["hod"], "hod_dashboard")]:
+			self.client.force_login(user)
+			self.assertEqual(self.client.get(reverse(url_name)).status_code, 200)
+
+
+class FragmentCacheTests(TestCase):
+	"""Dashboard panels are served from the cache until something they show is saved or deleted."""
+
+	@classmethod
+	def setUpTestData(cls):
+		cls.data = build_department(group_count=2)
+
+	def setUp(self):
+		self.group, self.other = self.data["groups"]
+		reset_fragment_stats()
+
+	def get(self, user, url):
+		self.client.force_login(user)
+		return self.client.get(url)
+
+	def mutations(self):
+		"""A save and a delete of each model shown in the group's panels, as (label, callable) pairs."""
+		group = self.group
+
+		def first(model):
+			return model.objects.filter(group=group).first()
+
+		mutations = []
+		for model in (StudentEvaluation, GroupEvaluation, EvaluationFile, Abstract, CoordinatorApproval, GroupMember):
+			mutations.append((f"{model.__name__} saved", lambda model=model: first(model).save()))
+			mutations.append((f"{model.__name__} deleted", lambda model=model: first(model).delete()))
+		mutations += [
+			("ProjectReport saved", lambda: ProjectReport.objects.create(group=group, report_file="project_reports/report.pdf", uploaded_by=group.leader)),
+			("ProjectReport deleted", lambda: first(ProjectReport).delete()),
+			("SustainableDevelopmentGoal saved", lambda: SustainableDevelopmentGoal.objects.create(group=group, submitted_by=group.leader, sdg1="4")),
+			("SustainableDevelopmentGoal deleted", lambda: first(SustainableDevelopmentGoal).delete()),
+			("GuideRequest saved", lambda: first(GuideRequest).save()),
+			("StudentProfile saved", lambda: StudentProfile.objects.get(user=group.leader).save()),
+			("Group saved", lambda: group.save()),
+		]
+		return mutations
+
+	def assertRebuildsOnlyGroup(self, user, url, name, mutations):
+		self.get(user, url)
+		for label, mutate in mutations:
+			with self.subTest(label):
+				reset_fragment_stats()
+				mutate()
+				self.get(user, url)
+				self.assertEqual(fragment_stats()[name]["misses"], 1)
+
+	def test_guide_panels(self):
+		self.assertRebuildsOnlyGroup(self.data["guide"], reverse("guide_dashboard"), "guide-group", self.mutations())
+		self.assertEqual(fragment_stats()["guide-group"], {"hits": 1, "misses": 1})
+
+	def test_coordinator_panel(self):
+		url = reverse("coordinator_group_detail", args=[self.group.id])
+		self.assertRebuildsOnlyGroup(self.data["coordinators"][0], url, "coordinator-group", self.mutations())
+
+	def test_hod_cards(self):
+		abstract = Abstract.objects.get(group=self.group)
+		mutations = [("Abstract saved", lambda: Abstract.objects.filter(pk=abstract.pk).first().save())]
+		self.assertRebuildsOnlyGroup(self.data["hod"], reverse("hod_dashboard"), "hod-project", mutations)
+		self.assertEqual(fragment_stats()["hod-project"], {"hits": 1, "misses": 1})
+
+	def test_unchanged_panels_are_served_from_the_cache(self):
+		url = reverse("guide_dashboard")
+		first = self.get(self.data["guide"], url)
+		second = self.get(self.data["guide"], url)
+		self.assertEqual(second.context["group_panels"], first.context["group_panels"])
+		self.assertEqual(fragment_stats()["guide-group"], {"hits": 2, "misses": 2})
+
+	def test_panel_shows_the_write(self):
+		url = reverse("guide_dashboard")
+		self.get(self.data["guide"], url)
+		# A queryset update() sends no signal, so the cached panel stays.
+		Abstract.objects.filter(group=self.group).update(title="Renamed without signals")
+		panels = "".join(self.get(self.data["guide"], url).context["group_panels"])
+		self.assertNotIn("Renamed without signals", panels)
+		abstract = Abstract.objects.get(group=self.group)
+		abstract.title = "Renamed topic"
+		abstract.save()
+		panels = "".join(self.get(self.data["guide"], url).context["group_panels"])
+		self.assertIn("Renamed topic", panels)
+
+	def test_accepting_a_request_adds_the_panel(self):
+		url = reverse("guide_dashboard")
+		GuideRequest.objects.filter(group=self.other).update(status=GuideRequest.STATUS_PENDING)
+		self.assertEqual(len(self.get(self.data["guide"], url).context["group_panels"]), 1)
+		guide_request = GuideRequest.objects.get(group=self.other)
+		guide_request.status = GuideRequest.STATUS_ACCEPTED
+		guide_request.save()
+		self.assertEqual(len(self.get(self.data["guide"], url).context["group_panels"]), 2)
+		guide_request.delete()
+		self.assertEqual(len(self.get(self.data["guide"], url).context["group_panels"]), 1)
+
+	def test_coordinator_assignment_invalidates_the_coordinators_panels(self):
+		coordinator = self.data["coordinators"][0]
+		url = reverse("coordinator_group_detail", args=[self.group.id])
+		self.get(coordinator, url)
+		CoordinatorAssignment.objects.get(faculty=coordinator).save()
+		self.get(coordinator, url)
+		self.get(self.data["coordinators"][1], url)
+		self.assertEqual(fragment_stats()["coordinator-group"], {"hits": 0, "misses": 3})
+
+	def test_panels_are_per_user(self):
+		url = reverse("coordinator_group_detail", args=[self.group.id])
+		first = self.get(self.data["coordinators"][0], url)
+		second = self.get(self.data["coordinators"][1], url)
+		self.assertEqual(first.context["item"]["coordinator_role"], 1)
+		self.assertEqual(second.context["item"]["coordinator_role"], 2)
+
+	def test_outsiders_get_no_cached_panel(self):
+		url = reverse("coordinator_group_detail", args=[self.group.id])
+		self.get(self.data["coordinators"][0], url)
+		outsider = User.objects.create_user(username="other-coord")
+		FacultyProfile.objects.create(user=outsider, department="EEE", is_coordinator=True)
+		self.assertEqual(self.get(outsider, url).status_code, 404)
+
+	def test_evicted_versions_do_not_restart(self):
+		before = versions(("group", self.group.id))
+		cache.delete(f"group:{self.group.id}:version")
+		self.assertNotEqual(versions(("group", self.group.id)), before)
+
+	@override_settings(FRAGMENT_CACHE_TIMEOUT=0)
+	def test_timeout_zero_turns_caching_off(self):
+		url = reverse("guide_dashboard")
+		self.get(self.data["guide"], url)
+		self.assertEqual(len(self.get(self.data["guide"], url).context["group_panels"]), 2)
+		self.assertEqual(fragment_stats()["guide-group"], {"hits": 0, "misses": 4})
+
+
+class SQLiteCacheTests(TestCase):
+	def make_cache(self, **options):
+		directory = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+		return SQLiteCache(os.path.join(directory, "cache.sqlite3"), {"OPTIONS": options})
+
+	def test_tests_write_nothing_to_the_checkout(self):
+		def snapshot():
+			return {name: os.stat(os.path.join(settings.BASE_DIR, name)).st_mtime_ns for name in os.listdir(settings.BASE_DIR) if name.startswith("cache.sqlite3")}
+
+		before = snapshot()
+		cache.set("probe", 1)
+		cache.clear()
+		self.assertFalse(os.path.abspath(caches["default"]._path).startswith(os.path.abspath(settings.BASE_DIR)))
+		self.assertEqual(snapshot(), before)
+
+	def test_values_round_trip(self):
+		sqlite_cache = self.make_cache()
+		values = {"int": 7, "big": 2 ** 70, "bool": True, "text": "panel", "bytes": b"\x00", "dict": {(1, 2): 3}}
+		sqlite_cache.set_many(values)
+		self.assertEqual(sqlite_cache.get_many([*values, "missing"]), values)
+		self.assertIs(sqlite_cache.get("bool"), True)
+		self.assertEqual(sqlite_cache.get("missing", "default"), "default")
+		self.assertTrue(sqlite_cache.delete("int"))
+		self.assertFalse(sqlite_cache.has_key("int"))
+		sqlite_cache.clear()
+		self.assertEqual(sqlite_cache.get_many(values), {})
+
+	def test_expired_entries_are_missing(self):
+		sqlite_cache = self.make_cache()
+		sqlite_cache.set("soon", 1, timeout=0.05)
+		sqlite_cache.set("never", 1, timeout=None)
+		time.sleep(0.1)
+		self.assertIsNone(sqlite_cache.get("soon"))
+		self.assertFalse(sqlite_cache.touch("soon"))
+		self.assertTrue(sqlite_cache.add("soon", 2))
+		self.assertFalse(sqlite_cache.add("never", 2))
+		self.assertEqual(sqlite_cache.get_many(["soon", "never"]), {"soon": 2, "never": 1})
+
+	def test_incr(self):
+		sqlite_cache = self.make_cache()
+		with self.assertRaises(ValueError):
+			sqlite_cache.incr("version")
+		sqlite_cache.set("version", 1)
+		self.assertEqual(sqlite_cache.incr("version"), 2)
+		self.assertEqual(sqlite_cache.decr("version", 5), -3)
+		sqlite_cache.set("big", 2 ** 70)
+		self.assertEqual(sqlite_cache.incr("big"), 2 ** 70 + 1)
+
+	def test_culls_the_least_recently_read(self):
+		sqlite_cache = self.make_cache(MAX_ENTRIES=4, CULL_FREQUENCY=2, ACCESS_RESOLUTION=0)
+		for key in "abcd":
+			sqlite_cache.set(key, key)
+			time.sleep(0.002)
+		sqlite_cache.get("a")
+		sqlite_cache.set("e", "e")
+		self.assertEqual(sorted(sqlite_cache.get_many("abcde")), ["a", "d", "e"])
+
+	def test_get_or_set_computes_once(self):
+		sqlite_cache = self.make_cache()
+		calls = []
+
+		def compute():
+			calls.append(1)
+			time.sleep(0.1)
+			return "slots"
+
+		threads = [threading.Thread(target=sqlite_cache.get_or_set, args=("slot-map", compute)) for _ in range(6)]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+		self.assertEqual(len(calls), 1)
+		self.assertEqual(sqlite_cache.get("slot-map"), "slots")
+		self.assertFalse(sqlite_cache.has_key("slot-map:lock"))
+
+	def test_lock_times_out(self):
+		sqlite_cache = self.make_cache()
+		with sqlite_cache.lock("report", timeout=0) as held:
+			self.assertTrue(held)
+			with sqlite_cache.lock("report", timeout=0.05) as also_held:
+				self.assertFalse(also_held)
+
+	def test_cachebench_shares_one_counter_across_processes(self):
+		if multiprocessing.current_process().daemon:
+			self.skipTest("The workers of test --parallel cannot start processes.")
+		handle, output = tempfile.mkstemp(suffix=".json")
+		os.close(handle)
+		self.addCleanup(os.remove, output)
+		call_command("cachebench", "--backends", "sqlite", "locmem", "--workers", "3", "--ops", "300", "--keys", "50", "--output", output, stdout=io.StringIO())
+		with open(output) as handle:
+			results = json.load(handle)["backends"]
+		self.assertGreater(results["sqlite"]["increments"], 0)
+		self.assertEqual(results["sqlite"]["counter"], results["sqlite"]["increments"])
+		self.assertEqual(results["sqlite"]["hit_rate"], 1)
+		# Each locmem process counts in its own memory.
+		self.assertEqual(results["locmem"]["counter"], 0)
+		self.assertEqual(results["sqlite"]["get"]["count"] + results["sqlite"]["set"]["count"] + results["sqlite"]["incr"]["count"], 900)
+
+
+class TemporaryBlobStorageMixin:
+	"""Point STORAGES["blobs"] at a throwaway directory for the test case."""
+
+	@classmethod
+	def setUpClass(cls):
+		cls._blob_dir = tempfile.mkdtemp()
+		storages = {
+			**settings.STORAGES,
+			"blobs": {
+				"BACKEND": "core.storage.ContentAddressedStorage",
+				"OPTIONS": {"location": cls._blob_dir},
+			},
+		}
+		cls._blob_override = override_settings(STORAGES=storages)
+		cls._blob_override.enable()
+		super().setUpClass()
+
+	@classmethod
+	def tearDownClass(cls):
+		super().tearDownClass()
+		cls._blob_override.disable()
+		shutil.rmtree(cls._blob_dir, ignore_errors=True)
+
+
+class ConditionalDownloadTests(TemporaryBlobStorageMixin, TestCase):
+	CONTENT = b"%PDF-1.7 " + bytes(range(256)) * 4
+
+	@classmethod
+	def setUpTestData(cls):
+		cls.data = build_department()
+		group = cls.data["groups"][0]
+		cls.eval_file = EvaluationFile.objects.create(
+			group=group,
+			stage="first",
+			file_blob=SimpleUploadedFile("deck.pdf", cls.CONTENT),
+			file_name="deck.pdf",
+			file_size=len(cls.CONTENT),
+			file_type="application/pdf",
+			uploaded_by=group.leader,
+		)
+		cls.etag = f'"{hashlib.sha256(cls.CONTENT).hexdigest()}"'
+
+	def setUp(self):
+		self.client.force_login(self.data["groups"][0].leader)
+		self.url = reverse("download_evaluation_file", args=[self.eval_file.id])
+
+	def test_full_download_carries_validators(self):
+		response = self.client.get(self.url)
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(b"".join(response.streaming_content), self.CONTENT)
+		self.assertEqual(response["ETag"], self.etag)
+		self.assertEqual(response["Accept-Ranges"], "bytes")
+		self.assertIn("Last-Modified", response)
+
+	def test_if_none_match_returns_not_modified(self):
+		response = self.client.get(self.url, HTTP_IF_NONE_MATCH=self.etag)
+		self.assertEqual(response.status_code, 304)
+		self.assertEqual(response["ETag"], self.etag)
+
+	def test_if_modified_since_returns_not_modified(self):
+		last_modified = self.client.get(self.url)["Last-Modified"]
+		response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+		self.assertEqual(response.status_code, 304)
+
+	def test_single_range(self):
+		response = self.client.get(self.url, HTTP_RANGE="bytes=10-19")
+		self.assertEqual(response.status_code, 206)
+		self.assertEqual(response["Content-Range"], f"bytes 10-19/{len(self.CONTENT)}")
+		self.assertEqual(response["Content-Length"], "10")
+		self.assertEqual(b"".join(response.streaming_content), self.CONTENT[10:20])
+
+	def test_suffix_range(self):
+		response = self.client.get(self.url, HTTP_RANGE="bytes=-5")
+		self.assertEqual(response.status_code, 206)
+		self.assertEqual(b"".join(response.streaming_content), self.CONTENT[-5:])
+
+	def test_unsatisfiable_range(self):
+		response = self.client.get(self.url, HTTP_RANGE=f"bytes={len(self.CONTENT)}-")
+		self.assertEqual(response.status_code, 416)
+		self.assertEqual(response["Content-Range"], f"bytes */{len(self.CONTENT)}")
+
+	def test_stale_if_range_sends_full_body(self):
+		response = self.client.get(self.url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"')
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(b"".join(response.streaming_content), self.CONTENT)
+
+	def test_digest_of_a_legacy_name_is_that_of_its_content(self):
+		os.makedirs(os.path.join(self._blob_dir, "project_reports"), exist_ok=True)
+		with open(os.path.join(self._blob_dir, "project_reports", "report.pdf"), "wb") as handle:
+			handle.write(self.CONTENT)
+		group = self.data["groups"][0]
+		report = ProjectReport.objects.create(group=group, report_file="project_reports/report.pdf", uploaded_by=group.leader)
+		self.assertEqual(content_digest(report.report_file), hashlib.sha256(self.CONTENT).hexdigest())
+		self.assertEqual(content_digest(self.eval_file.file_blob), hashlib.sha256(self.CONTENT).hexdigest())
+
+	def test_legacy_project_report_is_read_from_media(self):
+		media_dir = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, media_dir, ignore_errors=True)
+		os.makedirs(os.path.join(media_dir, "project_reports"))
+		path = os.path.join(media_dir, "project_reports", "report_V5gdAKm.pdf")
+		with open(path, "wb") as handle:
+			handle.write(self.CONTENT)
+		group = self.data["groups"][0]
+		# As uploaded before the blob store, not moved by migrate_blobs yet.
+		report = ProjectReport.objects.create(group=group, report_file="project_reports/report_V5gdAKm.pdf", uploaded_by=group.leader)
+		url = reverse("download_project_report", args=[report.id])
+
+		with override_settings(MEDIA_ROOT=media_dir):
+			response = self.client.get(url)
+			self.assertEqual(response.status_code, 200)
+			self.assertEqual(b"".join(response.streaming_content), self.CONTENT)
+			self.assertEqual(response["ETag"], self.etag)
+			os.remove(path)
+			self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class StreamingUploadTests(TemporaryBlobStorageMixin, TestCase):
+	@classmethod
+	def setUpTestData(cls):
+		cls.data = build_department()
+
+	def setUp(self):
+		self.leader = self.data["groups"][0].leader
+		self.client.force_login(self.leader)
+
+	def test_upload_is_stored_under_its_digest(self):
+		content = b"%PDF-1.7 deck"
+		self.client.post(
+			reverse("upload_evaluation_file", args=["final"]),
+			{"file": SimpleUploadedFile("deck.pdf", content, content_type="application/pdf")},
+		)
+		eval_file = EvaluationFile.objects.get(group=self.data["groups"][0], stage="final")
+		self.assertEqual(eval_file.file_blob.name.rsplit("/", 1)[-1], hashlib.sha256(content).hexdigest())
+		self.assertEqual(eval_file.file_size, len(content))
+
+	def test_upload_with_mismatched_magic_bytes_is_rejected(self):
+		eval_file = EvaluationFile.objects.get(group=self.data["groups"][0], stage="final")
+		blobs = sorted(os.walk(self._blob_dir))
+		temp_dir = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+		with override_settings(FILE_UPLOAD_TEMP_DIR=temp_dir):
+			response = self.client.post(
+				reverse("upload_evaluation_file", args=["final"]),
+				{"file": SimpleUploadedFile("deck.pptx", b"%PDF-1.7 not a pptx")},
+			)
+		errors = [message.message for message in get_messages(response.wsgi_request) if message.level == messages.ERROR]
+		self.assertEqual(errors, ["The uploaded file does not look like a .pptx file."])
+		unchanged = EvaluationFile.objects.get(group=self.data["groups"][0], stage="final")
+		self.assertEqual((unchanged.pk, unchanged.file_name, unchanged.file_blob.name), (eval_file.pk, "final.pdf", ""))
+		self.assertTrue(unchanged.file_data)
+		self.assertFalse(StoredBlob.objects.exists())
+		self.assertEqual(sorted(os.walk(self._blob_dir)), blobs)
+		self.assertEqual(os.listdir(temp_dir), [])
+
+	def test_mismatched_upload_never_reaches_request_files(self):
+		class UploadForm(forms.Form):
+			file = forms.FileField()
+
+		temp_dir = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+		with override_settings(FILE_UPLOAD_TEMP_DIR=temp_dir):
+			request = RequestFactory().post("/", {
+				"file": SimpleUploadedFile("deck.pptx", b"%PDF-1.7 " + b"x" * 200000),
+				"other": SimpleUploadedFile("notes.pdf", b"%PDF-1.7 notes"),
+			})
+			files = request.FILES
+			self.assertEqual(len(os.listdir(temp_dir)), 1)
+		self.assertEqual(list(files), ["other"])
+		self.assertEqual(files["other"].read(), b"%PDF-1.7 notes")
+		files["other"].close()
+		self.assertEqual(rejected_upload(request, "file"), "deck.pptx")
+		self.assertIsNone(rejected_upload(request, "other"))
+		# A form that does not check signatures gets no file at all.
+		form = UploadForm(request.POST, files)
+		self.assertFalse(form.is_valid())
+		self.assertEqual(form.errors["file"], ["This field is required."])
+		self.assertEqual(os.listdir(temp_dir), [])
+
+	def test_short_mismatched_upload_is_dropped(self):
+		request = RequestFactory().post("/", {"file": SimpleUploadedFile("deck.pdf", b"PK")})
+		self.assertNotIn("file", request.FILES)
+		self.assertEqual(rejected_upload(request, "file"), "deck.pdf")
+
+
+class BlobDeduplicationTests(TemporaryBlobStorageMixin, TestCase):
+	CONTENT = b"%PDF-1.7 same deck"
+
+	@classmethod
+	def setUpTestData(cls):
+		cls.data = build_department()
+		cls.digest = hashlib.sha256(cls.CONTENT).hexdigest()
+
+	def setUp(self):
+		self.client.force_login(self.data["groups"][0].leader)
+
+	def upload(self, stage):
+		self.client.post(
+			reverse("upload_evaluation_file", args=[stage]),
+			{"file": SimpleUploadedFile("deck.pdf", self.CONTENT, content_type="application/pdf")},
+		)
+
+	def test_identical_uploads_share_one_blob(self):
+		self.upload("first")
+		self.upload("second")
+		self.upload("second")  # re-upload replaces the row but keeps the blob
+		blob = StoredBlob.objects.get(digest=self.digest)
+		self.assertEqual(blob.ref_count, 2)
+		self.assertEqual(blob.size, len(self.CONTENT))
+		self.assertIsNone(blob.orphaned_at)
+		self.assertEqual(len(os.listdir(os.path.join(self._blob_dir, self.digest[:2], self.digest[2:4]))), 1)
+
+	def test_unreferenced_blob_is_reclaimed_after_grace_period(self):
+		self.upload("first")
+		EvaluationFile.objects.filter(file_blob__endswith=self.digest).delete()
+		blob = StoredBlob.objects.get(digest=self.digest)
+		self.assertEqual(blob.ref_count, 0)
+		self.assertIsNotNone(blob.orphaned_at)
+
+		call_command("dedupe_blobs", "--reclaim", stdout=io.StringIO())
+		self.assertTrue(os.path.exists(os.path.join(self._blob_dir, blob.name)))
+
+		StoredBlob.objects.filter(digest=self.digest).update(orphaned_at=timezone.now() - timedelta(days=2))
+		os.utime(os.path.join(self._blob_dir, blob.name), (0, 0))
+		call_command("dedupe_blobs", "--reclaim", stdout=io.StringIO())
+		self.assertFalse(StoredBlob.objects.filter(digest=self.digest).exists())
+		self.assertFalse(os.path.exists(os.path.join(self._blob_dir, blob.name)))
+
+	def test_recount_repairs_counts_after_bulk_updates(self):
+		self.upload("first")
+		self.upload("second")
+		StoredBlob.objects.all().delete()
+		out = io.StringIO()
+		call_command("dedupe_blobs", stdout=out)
+		self.assertEqual(StoredBlob.objects.get(digest=self.digest).ref_count, 2)
+		self.assertIn(f"Reclaimed:         {len(self.CONTENT)} B (50.0%)", out.getvalue())
+
+
+class NginxStandIn:
+	"""Just enough of nginx/mod_xsendfile to resolve offloaded downloads in tests.
+
+	Like nginx, an X-Accel-Redirect URI is only honoured under a configured
+	internal location, which is aliased onto a directory on disk.
+	"""
+
+	def __init__(self, internal_location, root):
+		self.internal_location = internal_location
+		self.root = root
+
+	def resolve(self, response):
+		if "X-Accel-Redirect" in response:
+			uri = unquote(response["X-Accel-Redirect"])
+			if not uri.startswith(self.internal_location):
+				return 404, b""
+			path = os.path.join(self.root, uri[len(self.internal_location):])
+		elif "X-Sendfile" in response:
+			path = response["X-Sendfile"]
+		else:
+			return response.status_code, b"".join(response.streaming_content) if response.streaming else response.content
+		if not os.path.isfile(path):
+			return 404, b""
+		with open(path, "rb") as handle:
+			return 200, handle.read()
+
+
+class OffloadedDownloadTests(TemporaryBlobStorageMixin, TestCase):
+	CONTENT = b"%PDF-1.7 project report"
+
+	@classmethod
+	def setUpTestData(cls):
+		cls.data = build_department()
+		group = cls.data["groups"][0]
+		cls.report = ProjectReport.objects.create(
+			group=group,
+			report_file=SimpleUploadedFile("report.pdf", cls.CONTENT),
+			report_filename="Final Report.pdf",
+			uploaded_by=group.leader,
+		)
+
+	def setUp(self):
+		self.client.force_login(self.data["groups"][0].leader)
+		self.url = reverse("download_project_report", args=[self.report.id])
+		self.web_server = NginxStandIn("/protected/", self._blob_dir)
+
+	def test_django_mode_streams_the_file(self):
+		response = self.client.get(self.url)
+		self.assertNotIn("X-Accel-Redirect", response)
+		self.assertNotIn("X-Sendfile", response)
+		self.assertEqual(self.web_server.resolve(response), (200, self.CONTENT))
+
+	@override_settings(FILE_DELIVERY="x-accel-redirect", FILE_DELIVERY_ACCEL_PREFIX="/protected/")
+	def test_x_accel_redirect_mode(self):
+		response = self.client.get(self.url)
+		self.assertEqual(response.status_code, 200)
+		self.assertFalse(response.streaming)
+		self.assertEqual(response["X-Accel-Redirect"], f"/protected/{self.report.report_file.name}")
+		self.assertIn('filename="Final Report.pdf"', response["Content-Disposition"])
+		self.assertEqual(response["Content-Type"], "application/pdf")
+		self.assertEqual(self.web_server.resolve(response), (200, self.CONTENT))
+
+	@override_settings(FILE_DELIVERY="x-sendfile")
+	def test_x_sendfile_mode(self):
+		response = self.client.get(self.url)
+		self.assertEqual(response["X-Sendfile"], self.report.report_file.path)
+		self.assertEqual(self.web_server.resolve(response), (200, self.CONTENT))
+
+	@override_settings(FILE_DELIVERY="x-accel-redirect")
+	def test_conditional_requests_are_answered_before_offloading(self):
+		etag = self.client.get(self.url)["ETag"]
+		response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+		self.assertEqual(response.status_code, 304)
+		self.assertNotIn("X-Accel-Redirect", response)
+
+	@override_settings(FILE_DELIVERY="x-accel-redirect")
+	def test_unauthorized_users_are_not_offloaded(self):
+		self.client.force_login(User.objects.create_user(username="outsider"))
+		response = self.client.get(self.url)
+		self.assertEqual(response.status_code, 403)
+		self.assertNotIn("X-Accel-Redirect", response)
+
+	@override_settings(FILE_DELIVERY="x-accel-redirect")
+	def test_inline_legacy_content_falls_back_to_django(self):
+		eval_file = EvaluationFile.objects.filter(group=self.data["groups"][0]).first()
+		response = self.client.get(reverse("download_evaluation_file", args=[eval_file.id]))
+		self.assertNotIn("X-Accel-Redirect", response)
+		self.assertEqual(self.web_server.resolve(response), (200, b"%PDF-1.4 inline"))
+
+
+def make_pdf(pages=2, text=True, compress=False):
+	"""Build a small but structurally valid PDF with ``pages`` pages."""
+	content = b"BT /F1 12 Tf 72 720 Td (Hello) Tj ET" if text else b"0 0 m 10 10 l S"
+	stream_dict = b"<< /Length %d >>"
+	if compress:
+		content = zlib.compress(content)
+		stream_dict = b"<< /Length %d /Filter /FlateDecode >>"
+	kids = b" ".join(b"%d 0 R" % (4 + i) for i in range(pages))
+	objects = [
+		b"<< /Type /Catalog /Pages 2 0 R >>",
+		b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % pages,
+		stream_dict % len(content) + b"\nstream\n" + content + b"\nendstream",
+	]
+	objects += [b"<< /Type /Page /Parent 2 0 R /Contents 3 0 R >>"] * pages
+	out = b"%PDF-1.6\n"
+	for number, body in enumerate(objects, start=1):
+		out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+	return out + b"trailer\n<< /Root 1 0 R >>\n%%EOF\n"
+
+
+@override_settings(BACKGROUND_WORKERS=0)
+class PDFMetadataTests(TemporaryBlobStorageMixin, TestCase):
+	@classmethod
+	def setUpTestData(cls):
+		cls.data = build_department()
+
+	def upload(self, content, name="deck.pdf"):
+		self.client.force_login(self.data["groups"][0].leader)
+		with self.captureOnCommitCallbacks(execute=True):
+			self.client.post(
+				reverse("upload_evaluation_file", args=["first"]),
+				{"file": SimpleUploadedFile(name, content, content_type="application/pdf")},
+			)
+		return StoredBlob.objects.get(digest=hashlib.sha256(content).hexdigest())
+
+	def test_metadata_is_recorded_after_upload(self):
+		blob = self.upload(make_pdf(pages=3, compress=True))
+		self.assertTrue(blob.pdf_valid)
+		self.assertEqual(blob.page_count, 3)
+		self.assertEqual(blob.pdf_version, "1.6")
+		self.assertFalse(blob.is_encrypted)
+		self.assertTrue(blob.has_text)
+
+	def test_pdf_without_text_operators(self):
+		blob = self.upload(make_pdf(text=False))
+		self.assertTrue(blob.pdf_valid)
+		self.assertFalse(blob.has_text)
+
+	def test_truncated_pdf_is_flagged_invalid(self):
+		blob = self.upload(make_pdf()[:-20])
+		self.assertFalse(blob.pdf_valid)
+		self.assertIn("%%EOF", blob.pdf_error)
+
+	def test_reviewer_lists_show_page_counts(self):
+		content = make_pdf(pages=5)
+		abstract = Abstract.objects.create(
+			group=self.data["groups"][0],
+			title="Paged abstract",
+			abstract_text="Abstract",
+			pdf_blob=SimpleUploadedFile("abstract.pdf", content),
+			pdf_filename="abstract.pdf",
+			pdf_size=len(content),
+			guide_status=Abstract.STATUS_APPROVED,
+		)
+		StoredBlob.inspect_pdf(hashlib.sha256(content).hexdigest())
+
+		self.client.force_login(self.data["guide"])
+		self.assertContains(self.client.get(reverse("faculty_abstracts")), "5 pages")
+		self.client.force_login(self.data["coordinators"][0])
+		self.assertContains(self.client.get(reverse("coordinator_dashboard")), "5 pages")
+		self.assertEqual(abstract.pdf_blob.name.rsplit("/", 1)[-1], hashlib.sha256(content).hexdigest())
+
+
+class FileExportTests(TemporaryBlobStorageMixin, TestCase):
+	REPORT = b"%PDF-1.7 " + bytes(range(256)) * 1024
+
+	@classmethod
+	def setUpTestData(cls):
+		cls.data = build_department(group_count=2)
+		cls.other = build_department(department="ECE")
+		group = cls.data["groups"][0]
+		ProjectReport.objects.create(
+			group=group,
+			report_file=SimpleUploadedFile("report.pdf", cls.REPORT),
+			report_filename="Final Report.pdf",
+			uploaded_by=group.leader,
+		)
+
+	def export(self, user, *args):
+		self.client.force_login(user)
+		response = self.client.get(reverse("export_class_files" if args else "export_files", args=args))
+		if response.status_code != 200:
+			return response, None
+		self.assertTrue(response.streaming)
+		chunks = list(response.streaming_content)
+		return response, chunks
+
+	def test_coordinator_export_layout(self):
+		response, chunks = self.export(self.data["coordinators"][0])
+		self.assertEqual(response["Content-Type"], "application/zip")
+		archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+		self.assertIsNone(archive.testzip())
+		names = archive.namelist()
+		group = self.data["groups"][0]
+		folder = f"CSE-A/group-{group.id}-{group.leader.username}"
+		self.assertEqual(names[:5], [f"{folder}/{stage}/{stage}.pdf" for stage in STAGES] + [f"{folder}/project-report/Final Report.pdf"])
+		self.assertEqual(len(names), 9)
+		self.assertEqual(archive.read(f"{folder}/first/first.pdf"), b"%PDF-1.4 inline")
+		self.assertEqual(archive.read(f"{folder}/project-report/Final Report.pdf"), self.REPORT)
+
+	def test_archive_is_streamed_in_bounded_chunks(self):
+		_, chunks = self.export(self.data["coordinators"][0])
+		self.assertGreater(len(chunks), len(self.REPORT) // (64 * 1024))
+		self.assertLessEqual(max(len(chunk) for chunk in chunks), 64 * 1024 + 1024)
+
+	def test_hod_exports_own_department_only(self):
+		_, chunks = self.export(self.data["hod"])
+		names = zipfile.ZipFile(io.BytesIO(b"".join(chunks))).namelist()
+		self.assertTrue(names)
+		self.assertTrue(all(name.startswith("CSE-A/") for name in names))
+
+	def test_hod_scope_follows_the_students_department(self):
+		Class.objects.filter(id=self.other["class"].id).update(department="CSE")
+		_, chunks = self.export(self.data["hod"])
+		names = zipfile.ZipFile(io.BytesIO(b"".join(chunks))).namelist()
+		self.assertTrue(names)
+		self.assertTrue(all(name.startswith("CSE-A/") for name in names))
+		response, _ = self.export(self.data["hod"], self.other["class"].id)
+		self.assertEqual(response.status_code, 403)
+
+	def test_dual_role_coordinator_exports_in_the_coordinator_role_only(self):
+		coordinator = self.data["coordinators"][0]
+		FacultyProfile.objects.filter(user=coordinator).update(is_guide=True)
+		self.client.force_login(coordinator)
+		for active_role, target in ((None, "role_selection"), ("guide", "guide_dashboard")):
+			session = self.client.session
+			session["active_role"] = active_role
+			session.save()
+			response = self.client.get(reverse("export_files"))
+			self.assertRedirects(response, reverse(target), fetch_redirect_response=False)
+		session = self.client.session
+		session["active_role"] = "coordinator"
+		session.save()
+		response, chunks = self.export(coordinator)
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(len(zipfile.ZipFile(io.BytesIO(b"".join(chunks))).namelist()), 9)
+
+	def test_leaders_without_a_class_or_profile_are_exported_as_unassigned(self):
+		classless = User.objects.create_user(username="cse-classless")
+		StudentProfile.objects.create(user=classless, department="CSE")
+		profileless = User.objects.create_user(username="no-profile")
+		for leader in (classless, profileless):
+			EvaluationFile.objects.create(
+				group=Group.objects.create(leader=leader),
+				stage="first",
+				file_data=b"%PDF-1.4 inline",
+				file_name="first.pdf",
+				file_size=15,
+				file_type="application/pdf",
+				uploaded_by=leader,
+			)
+		_, chunks = self.export(self.data["hod"])
+		names = zipfile.ZipFile(io.BytesIO(b"".join(chunks))).namelist()
+		self.assertEqual([name for name in names if name.startswith("unassigned/")], [f"unassigned/group-{classless.leading_groups.get().id}-cse-classless/first/first.pdf"])
+
+		_, chunks = self.export(User.objects.create_superuser(username="admin"))
+		names = zipfile.ZipFile(io.BytesIO(b"".join(chunks))).namelist()
+		self.assertEqual(len([name for name in names if name.startswith("unassigned/")]), 2)
+		self.assertIn(f"unassigned/group-{profileless.leading_groups.get().id}-no-profile/first/first.pdf", names)
+
+	def test_class_outside_assignment_is_forbidden(self):
+		response, _ = self.export(self.data["coordinators"][0], self.other["class"].id)
+		self.assertEqual(response.status_code, 403)
+		response, _ = self.export(self.data["guide"])
+		self.assertEqual(response.status_code, 403)
+
+	def test_management_command_writes_same_layout(self):
+		with tempfile.TemporaryDirectory() as directory:
+			path = os.path.join(directory, "export.zip")
+			call_command("export_files", path, "--department", "ECE", stdout=io.StringIO())
+			with zipfile.ZipFile(path) as archive:
+				self.assertEqual(len(archive.namelist()), 4)
+				self.assertTrue(all(name.startswith("ECE-A/") for name in archive.namelist()))
+
+
+class BlobCompressionTests(TemporaryBlobStorageMixin, TestCase):
+	DOC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1" + b"legacy word document " * 4096
+	PPTX = b"PK\x03\x04" + b"already deflated " * 4096
+
+	@classmethod
+	def setUpTestData(cls):
+		cls.data = build_department()
+
+	def setUp(self):
+		self.client.force_login(self.data["groups"][0].leader)
+
+	def upload(self, name, content, stage="first"):
+		self.client.post(reverse("upload_evaluation_file", args=[stage]), {"file": SimpleUploadedFile(name, content)})
+		return EvaluationFile.objects.get(group=self.data["groups"][0], stage=stage)
+
+	def test_legacy_office_files_are_stored_compressed(self):
+		eval_file = self.upload("notes.doc", self.DOC)
+		self.assertTrue(eval_file.file_blob.name.endswith(".gz"))
+		self.assertLess(os.path.getsize(eval_file.file_blob.path), len(self.DOC) // 10)
+		self.assertEqual(eval_file.file_blob.size, len(self.DOC))
+		self.assertEqual(StoredBlob.objects.get(digest=hashlib.sha256(self.DOC).hexdigest()).codec, "gzip")
+
+	def test_already_compressed_formats_are_stored_raw(self):
+		eval_file = self.upload("deck.pptx", self.PPTX)
+		self.assertEqual(eval_file.file_blob.name.rsplit("/", 1)[-1], hashlib.sha256(self.PPTX).hexdigest())
+
+	def test_download_decompresses_as_a_stream(self):
+		eval_file = self.upload("notes.doc", self.DOC)
+		url = reverse("download_evaluation_file", args=[eval_file.id])
+		response = self.client.get(url)
+		self.assertEqual(response["Content-Length"], str(len(self.DOC)))
+		self.assertEqual(response["ETag"], f'"{hashlib.sha256(self.DOC).hexdigest()}"')
+		self.assertEqual(b"".join(response.streaming_content), self.DOC)
+
+		response = self.client.get(url, HTTP_RANGE="bytes=50000-50099")
+		self.assertEqual(response.status_code, 206)
+		self.assertEqual(b"".join(response.streaming_content), self.DOC[50000:50100])
+
+	@override_settings(FILE_DELIVERY="x-accel-redirect")
+	def test_compressed_blobs_are_not_offloaded(self):
+		eval_file = self.upload("notes.doc", self.DOC)
+		response = self.client.get(reverse("download_evaluation_file", args=[eval_file.id]))
+		self.assertNotIn("X-Accel-Redirect", response)
+
+	def test_command_compresses_existing_blobs_and_reports_ratio(self):
+		content = self.DOC + b"stored before compression"
+		blob_storage.compress = False
+		try:
+			eval_file = self.upload("notes.doc", content)
+		finally:
+			blob_storage.compress = True
+		self.assertFalse(eval_file.file_blob.name.endswith(".gz"))
+
+		out = io.StringIO()
+		with self.captureOnCommitCallbacks(execute=True):
+			call_command("compress_blobs", stdout=out)
+		eval_file.refresh_from_db()
+		self.assertTrue(eval_file.file_blob.name.endswith(".gz"))
+		self.assertFalse(os.path.exists(os.path.join(self._blob_dir, eval_file.file_blob.name[:-3])))
+		with eval_file.file_blob.open("rb") as handle:
+			self.assertEqual(handle.read(), content)
+		self.assertIn("Compressed 1 blobs", out.getvalue())
+		self.assertRegex(out.getvalue(), r"\.doc +1 +84\.0 KB +[\d.]+ (B|KB) +\d+\.\d+x")
+
+
+class StaticAssetTests(TestCase):
+	CSS = b".panel { background: url('font.woff2'); }\n" + b".card { border-radius: 16px; }\n" * 400
+	FONT = os.urandom(4096)
+
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		cls._source_dir = tempfile.mkdtemp()
+		cls._static_root = tempfile.mkdtemp()
+		os.makedirs(os.path.join(cls._source_dir, "core"))
+		for name, content in (("app.css", cls.CSS), ("font.woff2", cls.FONT)):
+			with open(os.path.join(cls._source_dir, "core", name), "wb") as handle:
+				handle.write(content)
+		cls._static_override = override_settings(
+			STATICFILES_DIRS=[cls._source_dir],
+			STATICFILES_FINDERS=["django.contrib.staticfiles.finders.FileSystemFinder"],
+			STATIC_ROOT=cls._static_root,
+		)
+		cls._static_override.enable()
+		call_command("collectstatic", interactive=False, verbosity=0)
+
+	@classmethod
+	def tearDownClass(cls):
+		cls._static_override.disable()
+		shutil.rmtree(cls._source_dir, ignore_errors=True)
+		shutil.rmtree(cls._static_root, ignore_errors=True)
+		super().tearDownClass()
+
+	def hashed(self, name):
+		from django.contrib.staticfiles.storage import staticfiles_storage
+
+		return staticfiles_storage.stored_name(name)
+
+	def test_collectstatic_fingerprints_and_precompresses_text_assets(self):
+		hashed = self.hashed("core/app.css")
+		self.assertRegex(hashed, r"^core/app\.[0-9a-f]{12}\.css$")
+		for name in ("core/app.css", hashed):
+			with open(os.path.join(self._static_root, name + ".gz"), "rb") as handle:
+				self.assertIn(b".card", zlib.decompress(handle.read(), wbits=31))
+		font = self.hashed("core/font.woff2").removeprefix("core/")
+		with open(os.path.join(self._static_root, hashed), "rb") as handle:
+			self.assertTrue(handle.read().startswith(f'.panel {{ background: url("{font}")'.encode()))
+		# Already compressed.
+		self.assertFalse(os.path.exists(os.path.join(self._static_root, self.hashed("core/font.woff2") + ".gz")))
+
+	def test_fingerprinted_files_are_served_precompressed_and_immutable(self):
+		url = settings.STATIC_URL + self.hashed("core/app.css")
+		response = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+		self.assertEqual(response["Content-Encoding"], "gzip")
+		self.assertEqual(response["Content-Type"], "text/css")
+		self.assertEqual(response["Vary"], "Accept-Encoding")
+		self.assertIn("immutable", response["Cache-Control"])
+		with open(os.path.join(self._static_root, self.hashed("core/app.css")), "rb") as handle:
+			self.assertEqual(zlib.decompress(b"".join(response.streaming_content), wbits=31), handle.read())
+
+		response = self.client.get(url)
+		self.assertNotIn("Content-Encoding", response)
+		self.assertTrue(b"".join(response.streaming_content).startswith(b".panel"))
+
+		response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+		self.assertEqual(response.status_code, 304)
+
+	def test_unhashed_and_unknown_files(self):
+		response = self.client.get(settings.STATIC_URL + "core/app.css")
+		self.assertEqual(response.status_code, 200)
+		self.assertNotIn("immutable", response["Cache-Control"])
+		self.assertIn("no-cache", response["Cache-Control"])
+		self.assertEqual(self.client.get(settings.STATIC_URL + "core/missing.css").status_code, 404)
+		self.assertEqual(self.client.get(settings.STATIC_URL + "../manage.py").status_code, 404)
+
+
+
+class PageDeliveryTests(TemporaryBlobStorageMixin, TestCase):
+	@classmethod
+	def setUpTestData(cls):
+		cls.data = build_department()
+
+	def test_pages_load_no_inline_assets(self):
+		self.client.force_login(self.data["guide"])
+		response = self.client.get(reverse("guide_dashboard"))
+		self.assertNotContains(response, "<script>")
+		self.assertNotContains(response, "<style>")
+		self.assertContains(response, 'src="/static/core/js/guide_dashboard.js"')
+
+	def test_collectstatic_covers_every_asset_the_pages_use(self):
+		static_root = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, static_root, ignore_errors=True)
+		with override_settings(STATIC_ROOT=static_root):
+			call_command("collectstatic", interactive=False, verbosity=0)
+			self.client.force_login(self.data["guide"])
+			# A name missing from the manifest fails the render.
+			response = self.client.get(reverse("guide_dashboard"))
+		self.assertRegex(response.content.decode(), r'src="/static/core/js/guide_dashboard\.[0-9a-f]{12}\.js"')
+		self.assertTrue(os.path.exists(os.path.join(static_root, "core", "css", "base.css.gz")))
+
+	def test_pages_are_compressed_and_pdf_downloads_are_not(self):
+		self.client.force_login(self.data["groups"][0].leader)
+		response = self.client.get(reverse("mini_project"), HTTP_ACCEPT_ENCODING="gzip")
+		self.assertEqual(response["Content-Encoding"], "gzip")
+		self.assertIn(b"Project Hub", zlib.decompress(response.content, wbits=31))
+
+		eval_file = EvaluationFile.objects.get(group=self.data["groups"][0], stage="first")
+		response = self.client.get(reverse("download_evaluation_file", args=[eval_file.id]), HTTP_ACCEPT_ENCODING="gzip")
+		self.assertEqual(response.status_code, 200)
+		self.assertNotIn("Content-Encoding", response)
+		self.assertEqual(b"".join(response.streaming_content), b"%PDF-1.4 inline")
+
+
+class OrphanedMediaTests(TemporaryBlobStorageMixin, TestCase):
+	@classmethod
+	def setUpTestData(cls):
+		cls.data = build_department()
+		group = cls.data["groups"][0]
+		cls.report = ProjectReport.objects.create(
+			group=group,
+			report_file=SimpleUploadedFile("report.pdf", b"%PDF-1.7 kept"),
+			uploaded_by=group.leader,
+		)
+
+	def setUp(self):
+		self.media_dir = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, self.media_dir, ignore_errors=True)
+		storages = {**settings.STORAGES, "default": {"BACKEND": "django.core.files.storage.FileSystemStorage", "OPTIONS": {"location": self.media_dir}}}
+		override = override_settings(STORAGES=storages)
+		override.enable()
+		self.addCleanup(override.disable)
+
+	def make_file(self, root, name, age_hours=48):
+		path = os.path.join(root, name)
+		os.makedirs(os.path.dirname(path), exist_ok=True)
+		with open(path, "wb") as handle:
+			handle.write(b"orphan")
+		timestamp = time.time() - age_hours * 3600
+		os.utime(path, (timestamp, timestamp))
+		return path
+
+	def run_command(self, *args):
+		out = io.StringIO()
+		call_command("collect_orphaned_media", "--workers", "4", *args, stdout=out)
+		return out.getvalue()
+
+	def test_orphans_are_found_in_blob_store_and_legacy_upload_dirs(self):
+		legacy = self.make_file(self.media_dir, "project_reports/demoreport_V5gdAKm.pdf")
+		stray_blob = self.make_file(self._blob_dir, "ab/cd/" + "ab" * 32)
+		leftover = self.make_file(self._blob_dir, ".incoming-abc123")
+		fresh = self.make_file(self.media_dir, "project_reports/just-uploaded.pdf", age_hours=0)
+
+		output = self.run_command("--dry-run")
+		self.assertIn("Would remove 3 orphans", output)
+		self.assertIn("files/s", output)
+		for path in (legacy, stray_blob, leftover, fresh, self.report.report_file.path):
+			self.assertTrue(os.path.exists(path))
+
+		self.run_command()
+		for path in (legacy, stray_blob, leftover):
+			self.assertFalse(os.path.exists(path))
+		self.assertTrue(os.path.exists(fresh))
+		self.assertTrue(os.path.exists(self.report.report_file.path))
+
+	def test_quarantine_moves_orphans(self):
+		legacy = self.make_file(self.media_dir, "project_reports/demoreport.pdf")
+		quarantine = os.path.join(self.media_dir, "..", os.path.basename(self.media_dir) + "-quarantine")
+		self.addCleanup(shutil.rmtree, quarantine, ignore_errors=True)
+		self.run_command("--quarantine", quarantine)
+		self.assertFalse(os.path.exists(legacy))
+		self.assertTrue(os.path.exists(os.path.join(quarantine, "project_reports", "demoreport.pdf")))
+
+	def test_blobs_tracked_by_stored_blob_are_left_to_dedupe(self):
+		self.report.delete()
+		self.assertIn("Would remove 0 orphans", self.run_command("--dry-run", "--min-age-hours", "0"))
+
+
+def query_shape_diff(small, large):
+	"""Describe the SQL shapes whose counts differ between two captured runs, most grown first."""
+	small_shapes = Counter(sql_shape(query["sql"]) for query in small)
+	large_shapes = Counter(sql_shape(query["sql"]) for query in large)
+	changed = [shape for shape in small_shapes | large_shapes if small_shapes[shape] != large_shapes[shape]]
+	changed.sort(key=lambda shape: small_shapes[shape] - large_shapes[shape])
+	return "\n".join(f"  {small_shapes[shape]} -> {large_shapes[shape]}: {shape}" for shape in changed)
+
+
+@override_settings(FRAGMENT_CACHE_TIMEOUT=0)
+class ViewQueryBudgetTests(TemporaryBlobStorageMixin, TestCase):
+	"""Every view in core/urls.py stays within a query budget at two data scales.
+
+	Each request is made against a small and a large department whose groups
+	have been through second evaluation and wait for the approval of a
+	faculty member who is both guide and coordinator, inside a savepoint
+	that is rolled back afterwards. Both runs must stay within the budget and issue the same
+	number of queries; when the count grows with the department, the failure
+	lists the SQL shapes that grew, which is what an N+1 regression looks
+	like. Loops over the members of one group are bounded by the five-member
+	limit and are the same at both scales. Dashboard fragments are not cached,
+	so the budgets are those of a cold cache.
+	"""
+
+	SMALL_GROUPS = 2
+	LARGE_GROUPS = COORDINATOR_GROUPS_PER_PAGE + 5
+
+	@classmethod
+	def setUpTestData(cls):
+		cls.small = cls.seed(cls.SMALL_GROUPS, "SMALL")
+		cls.large = cls.seed(cls.LARGE_GROUPS, "LARGE")
+		# Evaluation files and abstracts as they are after migrate_blobs.
+		call_command("migrate_blobs", stdout=io.StringIO())
+
+	@staticmethod
+	def seed(group_count, department):
+		data = build_department(group_count=group_count, department=department)
+		groups = data["groups"]
+		for group in groups:
+			ProjectReport.objects.create(
+				group=group,
+				report_file=SimpleUploadedFile("report.pdf", make_pdf()),
+				report_filename="report.pdf",
+				uploaded_by=group.leader,
+				review_status=ProjectReport.STATUS_APPROVED,
+				coordinator1_mark=8,
+				coordinator2_mark=8,
+				coordinator1_submitted=True,
+				coordinator2_submitted=True,
+				final_mark=8,
+			)
+		StudentEvaluation.objects.filter(group__in=groups).update(
+			guide_submitted=True,
+			coordinator1_submitted=True,
+			coordinator2_submitted=True,
+			finalized=True,
+		)
+		StudentEvaluation.objects.filter(group__in=groups, stage="second").update(
+			final_guide_submitted=True,
+			final_guide_mark=12,
+			attendance_submitted=True,
+			attendance_marks=8,
+			cie_calculated=True,
+			cie_total=60,
+		)
+
+		# A guide who also coordinates, with every group waiting for their approval.
+		dual = User.objects.create_user(username=f"{department.lower()}-dual")
+		FacultyProfile.objects.create(user=dual, department=department, is_guide=True, is_coordinator=True)
+		for group in groups:
+			CoordinatorApproval.objects.create(group=group, coordinator=dual, status=CoordinatorApproval.STATUS_PENDING)
+
+		group = groups[0]
+		loner = User.objects.create_user(username=f"{department.lower()}-loner")
+		StudentProfile.objects.create(user=loner, student_class=data["class"], department=department)
+		data.update(
+			dual=dual,
+			leader=group.leader,
+			member=GroupMember.objects.filter(group=group).exclude(user=group.leader).first().user,
+			coordinator=data["coordinators"][0],
+			members=list(GroupMember.objects.filter(group=group).order_by("id").values_list("user_id", flat=True)),
+			abstract=Abstract.objects.get(group=group),
+			evaluation_file=EvaluationFile.objects.get(group=group, stage="first"),
+			report=ProjectReport.objects.get(group=group),
+			group_request=GroupRequest.objects.create(sender=loner, recipient=group.leader),
+			guide_request=GuideRequest.objects.get(group=group),
+		)
+		return data
+
+	def run_view(self, department, role, method, url_name, args, data, prepare, active_role):
+		if role:
+			self.client.force_login(department[role])
+			if active_role:
+				session = self.client.session
+				session["active_role"] = active_role
+				session.save()
+		else:
+			self.client.logout()
+		savepoint = transaction.savepoint()
+		try:
+			if prepare:
+				prepare(department)
+			with CaptureQueriesContext(connection) as ctx:
+				response = getattr(self.client, method)(reverse(url_name, args=args(department)), data(department))
+				if response.streaming:
+					b"".join(response.streaming_content)
+		finally:
+			transaction.savepoint_rollback(savepoint)
+		self.assertLess(response.status_code, 400, f"{url_name} as {role}")
+		problems = [message.message for message in get_messages(response.wsgi_request) if message.level >= messages.WARNING]
+		self.assertEqual(problems, [], f"{url_name} as {role} did not complete")
+		return ctx.captured_queries
+
+	def assertQueryBudget(self, budget, role, url_name, args=lambda department: [], method="get", data=lambda department: {}, prepare=None, active_role=None):
+		with self.subTest(url_name=url_name, role=role, method=method):
+			# The first run fills per-process caches (content types, sessions) for both.
+			self.run_view(self.small, role, method, url_name, args, data, prepare, active_role)
+			small = self.run_view(self.small, role, method, url_name, args, data, prepare, active_role)
+			large = self.run_view(self.large, role, method, url_name, args, data, prepare, active_role)
+			self.assertEqual(
+				len(small),
+				len(large),
+				f"{method.upper()} {url_name} as {role} issued {len(small)} queries with {self.SMALL_GROUPS} groups "
+				f"and {len(large)} with {self.LARGE_GROUPS}. Shapes that changed:\n{query_shape_diff(small, large)}",
+			)
+			self.assertLessEqual(
+				len(large),
+				budget,
+				f"{method.upper()} {url_name} as {role} issued {len(large)} queries, budget {budget}:\n"
+				+ "\n".join(f"  {query['sql']}" for query in large),
+			)
+
+	def test_growth_is_reported_by_query_shape(self):
+		def member_queries(department):
+			with CaptureQueriesContext(connection) as ctx:
+				for group in department["groups"]:
+					list(GroupMember.objects.filter(group=group))
+			return ctx.captured_queries
+
+		diff = query_shape_diff(member_queries(self.small), member_queries(self.large))
+		self.assertEqual(len(diff.splitlines()), 1)
+		self.assertTrue(diff.startswith(f"  {self.SMALL_GROUPS} -> {self.LARGE_GROUPS}: SELECT"))
+		self.assertIn('WHERE "core_groupmember"."group_id" = ?', diff)
+
+	def test_account_views(self):
+		self.assertQueryBudget(0, None, "login")
+		self.assertQueryBudget(4, "leader", "logout", method="post")
+		self.assertQueryBudget(5, "leader", "profile")
+		self.assertQueryBudget(2, "guide", "profile")
+		self.assertQueryBudget(2, "coordinator", "role_selection")
+		self.assertQueryBudget(2, "coordinator", "switch_role")
+
+	def test_student_pages(self):
+		budgets = {
+			"dashboard": 11,
+			"mini_project": 11,
+			"sdg_submission": 6,
+			"group_requests": 3,
+			"guide_request": 8,
+			"submit_abstract": 7,
+			"abstract_status": 5,
+			"project_report": 2,
+			"request_coordinator_approval": 6,
+		}
+		for url_name, budget in budgets.items():
+			self.assertQueryBudget(budget, "leader", url_name)
+		self.assertQueryBudget(11, "member", "mini_project")
+		self.assertQueryBudget(3, "leader", "student_search", data=lambda department: {"q": department["class"].department.lower()})
+
+	def test_student_submissions(self):
+		self.assertQueryBudget(
+			7, "leader", "sdg_submission", method="post",
+			data=lambda department: {f"sdg{index}": str(index) for index in range(1, 5)},
+		)
+		self.assertQueryBudget(
+			5, "leader", "group_requests", method="post",
+			data=lambda department: {"request_id": department["group_request"].id, "action": "reject"},
+		)
+		self.assertQueryBudget(
+			14, "leader", "upload_evaluation_file", args=lambda department: ["first"], method="post",
+			data=lambda department: {"file": SimpleUploadedFile("deck.pdf", make_pdf(), content_type="application/pdf")},
+		)
+		self.assertQueryBudget(
+			17, "leader", "submit_project_report", args=lambda department: [department["groups"][0].id], method="post",
+			data=lambda department: {"report_file": SimpleUploadedFile("report.pdf", make_pdf(pages=3), content_type="application/pdf")},
+		)
+		self.assertQueryBudget(
+			10, "leader", "submit_abstract", method="post",
+			data=lambda department: {
+				"title": "Revised topic",
+				"abstract_text": "Abstract",
+				"pdf_file": SimpleUploadedFile("abstract.pdf", make_pdf(), content_type="application/pdf"),
+			},
+			prepare=lambda department: Abstract.objects.filter(pk=department["abstract"].pk).update(is_final_approved=False),
+		)
+		self.assertQueryBudget(
+			10, "leader", "request_coordinator_approval", method="post",
+			prepare=lambda department: CoordinatorApproval.objects.filter(group=department["groups"][0]).delete(),
+		)
+		self.assertQueryBudget(
+			10, "leader", "guide_request", method="post",
+			data=lambda department: {"guide_id": department["guide"].id, "message": "Please guide us"},
+			prepare=lambda department: GuideRequest.objects.filter(group=department["groups"][0]).update(status=GuideRequest.STATUS_REJECTED),
+		)
+
+	def test_guide_views(self):
+		self.assertQueryBudget(13, "guide", "guide_dashboard")
+		self.assertQueryBudget(3, "guide", "guide_requests")
+		self.assertQueryBudget(4, "guide", "faculty_abstracts")
+		self.assertQueryBudget(11, "guide", "review_abstract", args=lambda department: [department["abstract"].id])
+		self.assertQueryBudget(
+			4, "guide", "guide_requests", method="post",
+			data=lambda department: {"request_id": department["guide_request"].id, "action": "accept"},
+		)
+		self.assertQueryBudget(
+			6, "guide", "review_abstract", args=lambda department: [department["abstract"].id], method="post",
+			data=lambda department: {"action": "approve"},
+			prepare=lambda department: Abstract.objects.filter(pk=department["abstract"].pk).update(
+				guide_status=Abstract.STATUS_PENDING,
+				coordinator_status=Abstract.STATUS_PENDING,
+				is_final_approved=False,
+			),
+		)
+
+	def test_guide_evaluations(self):
+		group_args = lambda department: [department["groups"][0].id]
+		self.assertQueryBudget(6, "guide", "submit_guide_evaluation", args=lambda department: [department["groups"][0].id, "first"], method="post")
+		self.assertQueryBudget(45, "guide", "submit_guide_student_evaluation", args=lambda department: [department["groups"][0].id, "second"], method="post")
+		self.assertQueryBudget(
+			36, "guide", "submit_final_guide_evaluation", args=group_args, method="post",
+			data=lambda department: {
+				f"student_{student_id}_{field}": "3"
+				for student_id in department["members"]
+				for field in ("final_guide_topic", "final_guide_planning", "final_guide_scale", "final_guide_novelty", "final_guide_task", "final_guide_schedule", "final_guide_interim", "final_guide_presentation", "final_guide_viva")
+			} | {f"student_{student_id}_final_guide_scale": "2" for student_id in department["members"]},
+		)
+		self.assertQueryBudget(
+			28, "guide", "submit_guide_ese", args=group_args, method="post",
+			data=lambda department: {f"student_{student_id}_ese_{field}": "15" for student_id in department["members"] for field in ("presentation", "demo", "viva")},
+		)
+
+	def test_coordinator_views(self):
+		self.assertQueryBudget(11, "coordinator", "coordinator_dashboard")
+		self.assertQueryBudget(12, "dual", "coordinator_dashboard", active_role="coordinator")
+		self.assertQueryBudget(13, "dual", "guide_dashboard", active_role="guide")
+		self.assertQueryBudget(13, "coordinator", "coordinator_group_detail", args=lambda department: [department["groups"][-1].id])
+		self.assertQueryBudget(6, "coordinator", "export_files")
+
+	def test_coordinator_evaluations(self):
+		group_args = lambda department: [department["groups"][0].id]
+		self.assertQueryBudget(8, "coordinator", "submit_coordinator_evaluation", args=lambda department: [department["groups"][0].id, "first"], method="post")
+		self.assertQueryBudget(47, "coordinator", "submit_coordinator_student_evaluation", args=lambda department: [department["groups"][0].id, "second"], method="post")
+		self.assertQueryBudget(
+			28, "coordinator", "submit_attendance_marks", args=group_args, method="post",
+			data=lambda department: {f"attendance_{student_id}": "9" for student_id in department["members"]},
+		)
+		self.assertQueryBudget(
+			27, "coordinator", "submit_coordinator_ese", args=group_args, method="post",
+			data=lambda department: {f"student_{student_id}_ese_{field}": "15" for student_id in department["members"] for field in ("presentation", "demo", "viva")},
+		)
+		report_args = lambda department: [department["report"].id]
+		self.assertQueryBudget(30, "coordinator", "submit_report_mark", args=report_args, method="post", data=lambda department: {"report_mark": "9"})
+		self.assertQueryBudget(5, "coordinator", "submit_report_rejection", args=report_args, method="post", data=lambda department: {"rejection_review": "Missing references"})
+
+	def test_hod_views(self):
+		self.assertQueryBudget(6, "hod", "hod_dashboard")
+		self.assertQueryBudget(
+			8, "hod", "hod_dashboard", method="post",
+			data=lambda department: {"abstract_id": department["abstract"].id, "action": "verify_compliance"},
+		)
+		self.assertQueryBudget(7, "hod", "export_class_files", args=lambda department: [department["class"].id])
+
+	def test_downloads(self):
+		budgets = {
+			"leader": (5, 5, 3),
+			"guide": (5, 5, 5),
+			"coordinator": (6, 5, 4),
+			"hod": (6, 6, 4),
+		}
+		for role, (evaluation_file, abstract, report) in budgets.items():
+			self.assertQueryBudget(evaluation_file, role, "download_evaluation_file", args=lambda department: [department["evaluation_file"].id])
+			self.assertQueryBudget(abstract, role, "download_abstract", args=lambda department: [department["abstract"].id])
+			self.assertQueryBudget(report, role, "download_project_report", args=lambda department: [department["report"].id])
+
+
+class GenerateInstitutionTests(TemporaryBlobStorageMixin, TestCase):
+	def generate(self, *args):
+		out = io.StringIO()
+		call_command("generate_institution", "--students", "150", "--departments", "2", "--pdf-payloads", "3", *args, stdout=out)
+		return out.getvalue()
+
+	def snapshot(self):
+		return (
+			list(User.objects.filter(username__startswith="gen-").order_by("username").values_list("username", "first_name", "last_name")),
+			sorted(Group.objects.values_list("leader__username", "guiderequest__guide__username", "guiderequest__status")),
+			list(StudentEvaluation.objects.order_by("student__username", "stage").values_list(
+				"student__username", "stage", "guide_topic", "coordinator2_viva", "finalized", "cie_total", "final_grade",
+			)),
+		)
+
+	def test_generates_every_lifecycle_state(self):
+		self.assertIn("Done!", self.generate())
+		self.assertEqual(StudentProfile.objects.filter(user__username__startswith="gen-").count(), 150)
+		self.assertEqual(FacultyProfile.objects.filter(is_hod=True).count(), 2)
+		self.assertEqual(CoordinatorAssignment.objects.count(), 8)
+		self.assertTrue(FacultyProfile.objects.filter(is_guide=True, is_coordinator=True).exists())
+		self.assertTrue(User.objects.get(username="gen-cse-s00001").check_password("password"))
+
+		self.assertTrue(GroupRequest.objects.exists())
+		self.assertTrue(CoordinatorApproval.objects.filter(status=CoordinatorApproval.STATUS_PENDING).exists())
+		self.assertTrue(GuideRequest.objects.filter(status=GuideRequest.STATUS_PENDING).exists())
+		self.assertTrue(Abstract.objects.filter(is_final_approved=False, guide_status=Abstract.STATUS_PENDING).exists())
+		second = StudentEvaluation.objects.filter(stage="second")
+		self.assertTrue(second.filter(finalized=False).exists())
+		self.assertTrue(second.filter(final_guide_submitted=True, cie_calculated=False).exists())
+		self.assertTrue(second.filter(cie_calculated=True, ese_completed=False).exists())
+		self.assertTrue(second.filter(result_calculated=True, final_grade__isnull=False).exists())
+		for group in Group.objects.all():
+			self.assertLessEqual(GroupMember.objects.filter(group=group).count(), 5)
+
+		abstract = Abstract.objects.exclude(pdf_blob="").first()
+		self.assertEqual(StoredBlob.objects.get(digest=abstract.pdf_blob.name.rsplit("/", 1)[-1]).ref_count, Abstract.objects.filter(pdf_blob=abstract.pdf_blob.name).count())
+		self.assertTrue(abstract.pdf_blob.open("rb").read().startswith(b"%PDF-"))
+
+	def test_same_seed_same_institution(self):
+		self.generate("--seed", "7")
+		first = self.snapshot()
+		with self.assertRaisesMessage(CommandError, "already exists"):
+			self.generate("--seed", "7")
+		self.generate("--seed", "7", "--replace")
+		self.assertEqual(self.snapshot(), first)
+		self.generate("--seed", "8", "--replace")
+		self.assertNotEqual(self.snapshot(), first)
+
+
+class LoadTestCommandTests(TemporaryCacheMixin, TemporaryBlobStorageMixin, LiveServerTestCase):
+	def setUp(self):
+		# The cache outlives the flushed rows, whose ids the next test reuses.
+		cache.clear()
+		call_command("generate_institution", "--students", "60", "--departments", "1", "--pdf-payloads", "1", stdout=io.StringIO())
+		handle, self.output = tempfile.mkstemp(suffix=".json")
+		os.close(handle)
+		self.addCleanup(os.remove, self.output)
+
+	def loadtest(self, scenario):
+		out = io.StringIO()
+		call_command(
+			"loadtest", "--scenario", scenario, "--users", "3", "--duration", "1",
+			"--base-url", self.live_server_url, "--output", self.output, stdout=out,
+		)
+		with open(self.output) as handle:
+			return out.getvalue(), json.load(handle)
+
+	def test_mixed_reports_latency_per_url_name(self):
+		out, results = self.loadtest("mixed")
+		self.assertIn("Done!", out)
+		self.assertEqual(results["scenario"], "mixed")
+		self.assertEqual(sum(results["users"].values()), 3)
+		self.assertIn("login", results["urls"])
+		self.assertGreater(results["totals"]["requests"], 0)
+		self.assertEqual(results["totals"]["errors"], 0)
+		for stats in results["urls"].values():
+			self.assertLessEqual(stats["p50_ms"], stats["p95_ms"])
+			self.assertLessEqual(stats["p95_ms"], stats["p99_ms"])
+
+	def test_ese_burst_submits_marks(self):
+		_, results = self.loadtest("ese-burst")
+		self.assertTrue({"submit_coordinator_ese", "submit_guide_ese"} & results["urls"].keys())
+		self.assertEqual(results["totals"]["errors"], 0)
+		self.assertTrue(StudentEvaluation.objects.filter(stage="second", ese_coord1_submitted=True).exists()
+			or StudentEvaluation.objects.filter(stage="second", ese_guide_submitted=True).exists())
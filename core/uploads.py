@@ -0,0 +1,100 @@
+import hashlib
+import os
+
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+
+# Leading bytes identifying the formats accepted for abstracts, reports and
+# evaluation files. Legacy .doc/.ppt are OLE2 compound files, .docx/.pptx are
+# ZIP containers.
+SIGNATURES = {
+	"pdf": b"%PDF-",
+	"ole": b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",
+	"zip": b"PK\x03\x04",
+}
+EXTENSION_KINDS = {
+	".pdf": "pdf",
+	".doc": "ole",
+	".ppt": "ole",
+	".docx": "zip",
+	".pptx": "zip",
+}
+_HEAD_SIZE = max(len(signature) for signature in SIGNATURES.values())
+
+
+def sniff_kind(head):
+	"""Return the SIGNATURES key matching the first bytes of a file, or None."""
+	for kind, signature in SIGNATURES.items():
+		if head.startswith(signature):
+			return kind
+	return None
+
+
+def has_expected_signature(uploaded_file, extension):
+	"""True when the file's magic bytes match what its extension promises."""
+	kind = getattr(uploaded_file, "kind", None)
+	if kind is None:
+		# Uploads that did not come through HashingFileUploadHandler.
+		uploaded_file.seek(0)
+		kind = sniff_kind(uploaded_file.read(_HEAD_SIZE))
+		uploaded_file.seek(0)
+	return kind is not None and EXTENSION_KINDS.get(extension.lower()) == kind
+
+
+def rejected_upload(request, field_name):
+	"""Name of the file sent as ``field_name`` that HashingFileUploadHandler
+	dropped because its first bytes did not match its extension, or None."""
+	if request.method != "POST" or field_name in request.FILES:
+		return None
+	return getattr(request, "rejected_uploads", {}).get(field_name)
+
+
+class HashingUploadedFile(TemporaryUploadedFile):
+	"""Spooled upload that knows its SHA-256 digest and sniffed format."""
+
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.sha256 = None
+		self.kind = None
+
+
+class HashingFileUploadHandler(FileUploadHandler):
+	"""Stream every uploaded file to a temporary file on disk.
+
+	The digest and size are computed chunk by chunk and the format is sniffed
+	from the first bytes, so nothing ever holds a whole upload in memory and
+	ContentAddressedStorage can move the temp file into place without reading
+	it a second time. A file whose first bytes cannot match its extension is
+	dropped there and then: it never reaches request.FILES, and its name is
+	kept for rejected_upload().
+	"""
+
+	def new_file(self, *args, **kwargs):
+		super().new_file(*args, **kwargs)
+		self.file = HashingUploadedFile(self.file_name, self.content_type, 0, self.charset, self.content_type_extra)
+		self.hasher = hashlib.sha256()
+		self.head = b""
+		self.signature = SIGNATURES.get(EXTENSION_KINDS.get(os.path.splitext(self.file_name or "")[1].lower()))
+
+	def receive_data_chunk(self, raw_data, start):
+		if len(self.head) < _HEAD_SIZE:
+			self.head += raw_data[:_HEAD_SIZE - len(self.head)]
+			if self.signature and not (self.head.startswith(self.signature) or self.signature.startswith(self.head)):
+				if not hasattr(self.request, "rejected_uploads"):
+					self.request.rejected_uploads = {}
+				self.request.rejected_uploads[self.field_name] = self.file_name
+				# The parser closes, and so deletes, the temp file.
+				raise SkipFile
+		self.hasher.update(raw_data)
+		self.file.write(raw_data)
+
+	def file_complete(self, file_size):
+		self.file.seek(0)
+		self.file.size = file_size
+		self.file.sha256 = self.hasher.hexdigest()
+		self.file.kind = sniff_kind(self.head)
+		return self.file
+
+	def upload_interrupted(self):
+		if hasattr(self, "file"):
+			self.file.close()
@@ -11,11 +11,14 @@ urlpatterns = [
     path("switch-role/", views.switch_role, name="switch_role"),
     path("profile/", views.profile, name="profile"),
     path("mini-project/", views.mini_project, name="mini_project"),
+    path("mini-project/students/", views.student_search, name="student_search"),
     path("project-report/", views.project_report, name="project_report"),
     path("project-report/submit/<int:group_id>/", views.submit_project_report, name="submit_project_report"),
     path("project-report/mark/<int:report_id>/", views.submit_report_mark, name="submit_report_mark"),
     path("project-report/reject/<int:report_id>/", views.submit_report_rejection, name="submit_report_rejection"),
     path("project-report/download/<int:report_id>/", views.download_project_report, name="download_project_report"),
+    path("export/files/", views.export_files, name="export_files"),
+    path("export/files/<int:class_id>/", views.export_files, name="export_class_files"),
     path("sdg-submission/", views.sdg_submission, name="sdg_submission"),
     path("group-requests/", views.group_requests, name="group_requests"),
     path("guide-request/", views.guide_request, name="guide_request"),
@@ -24,6 +27,7 @@ urlpatterns = [
     # Coordinator URLs
     path("request-coordinator-approval/", views.request_coordinator_approval, name="request_coordinator_approval"),
     path("coordinator-dashboard/", views.coordinator_dashboard, name="coordinator_dashboard"),
+    path("coordinator-dashboard/groups/<int:group_id>/", views.coordinator_group_detail, name="coordinator_group_detail"),
     # Abstract submission URLs
     path("submit-abstract/", views.submit_abstract, name="submit_abstract"),
     path("abstract-status/", views.abstract_status, name="abstract_status"),
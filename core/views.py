@@ -1,48 +1,52 @@
-import os
-
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
-from django.db.models import Prefetch, Q
-from django.http import FileResponse, HttpResponse, HttpResponseForbidden, HttpResponseRedirect
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.paginator import Paginator
+from django.db.models import F, Prefetch, Q
+from django.http import Http404, HttpResponse, HttpResponseForbidden, HttpResponseRedirect, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import render_to_string
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.http import content_disposition_header
 
-from .models import Abstract, CoordinatorApproval, CoordinatorAssignment, Group, GroupMember, GroupRequest, GuideRequest, Notification, StudentProfile, FacultyProfile, SustainableDevelopmentGoal, GroupEvaluation, EvaluationFile, ProjectReport, StudentEvaluation
+from .downloads import serve_file
+from .exports import export_entries, stream_zip
+from .fragments import cached_fragments
+from .loaders import EvaluationIndex, StudentWorkspace, annotate_group_progress, search_available_students
+from .models import Abstract, Class, CoordinatorApproval, CoordinatorAssignment, Group, GroupMember, GroupRequest, GuideRequest, Notification, StudentProfile, FacultyProfile, SustainableDevelopmentGoal, GroupEvaluation, EvaluationFile, ProjectReport, StoredBlob, StudentEvaluation
+from .storage import is_blob_name
+from .uploads import has_expected_signature, rejected_upload
 
 
-def _is_student(user):
-	return hasattr(user, "student_profile")
+def _is_student(request):
+	return request.roles.is_student
 
 
-def _is_guide(user):
-	return hasattr(user, "faculty_profile") and user.faculty_profile.is_guide
+def _is_guide(request):
+	return request.roles.is_guide
 
 
-def _is_coordinator(user):
-	return hasattr(user, "faculty_profile") and user.faculty_profile.is_coordinator
+def _is_coordinator(request):
+	return request.roles.is_coordinator
 
 
-def _is_hod(user):
-	return hasattr(user, "faculty_profile") and user.faculty_profile.is_hod
+def _is_hod(request):
+	return request.roles.is_hod
 
 
-def _has_dual_faculty_roles(user):
-	return _is_guide(user) and _is_coordinator(user)
+def _has_dual_faculty_roles(request):
+	return request.roles.is_dual
 
 
 def _get_active_faculty_role(request):
-	if not _has_dual_faculty_roles(request.user):
-		return None
-	active_role = request.session.get("active_role")
-	if active_role in ["guide", "coordinator"]:
-		return active_role
-	return None
+	return request.roles.active_role
 
 
 def _ensure_active_role_for_dual_faculty(request, required_role):
-	if not _has_dual_faculty_roles(request.user):
+	if not _has_dual_faculty_roles(request):
 		return None
 	active_role = _get_active_faculty_role(request)
 	if not active_role:
@@ -52,6 +56,21 @@ def _ensure_active_role_for_dual_faculty(request, required_role):
 	return None
 
 
+def _get_exportable_groups(request):
+	"""Groups whose files the user may bulk-export: those of the assigned
+	classes for a coordinator, every group of the department for the HOD.
+	None when the user may export nothing."""
+	if request.user.is_superuser:
+		return Group.objects.all()
+	scope = None
+	if _is_coordinator(request) and not _ensure_active_role_for_dual_faculty(request, "coordinator"):
+		scope = Q(leader__student_profile__student_class_id__in=list(request.roles.coordinator_slots))
+	if _is_hod(request) and request.roles.department:
+		department_scope = Q(leader__student_profile__department=request.roles.department)
+		scope = department_scope if scope is None else scope | department_scope
+	return None if scope is None else Group.objects.filter(scope)
+
+
 def _get_group_for_user(user):
 	leader_group = Group.objects.filter(leader=user).first()
 	if leader_group:
@@ -140,7 +159,7 @@ def calculate_final_result(student_eval):
 		and student_eval.final_percentage == final_percentage
 	):
 		return
-	grade = _derive_grade_from_percentage(final_percentage)
+	grade = StudentEvaluation.grade_for(final_percentage)
 	student_eval.final_total = final_total
 	student_eval.final_percentage = final_percentage
 	student_eval.final_grade = grade
@@ -153,28 +172,6 @@ def calculate_final_result(student_eval):
 	])
 
 
-def _derive_grade_from_percentage(percentage):
-	if percentage >= 90:
-		return "S"
-	if percentage >= 85:
-		return "A+"
-	if percentage >= 80:
-		return "A"
-	if percentage >= 75:
-		return "B+"
-	if percentage >= 70:
-		return "B"
-	if percentage >= 65:
-		return "C+"
-	if percentage >= 60:
-		return "C"
-	if percentage >= 55:
-		return "D"
-	if percentage >= 50:
-		return "P"
-	return "F"
-
-
 def _ensure_final_result(student_eval):
 	"""Backfill final result if prerequisites met but cache stale."""
 	if not student_eval:
@@ -184,23 +181,24 @@ def _ensure_final_result(student_eval):
 
 @login_required
 def dashboard(request):
-	if _has_dual_faculty_roles(request.user):
+	if _has_dual_faculty_roles(request):
 		active_role = _get_active_faculty_role(request)
 		if not active_role:
 			return redirect("role_selection")
 		return redirect("guide_dashboard" if active_role == "guide" else "coordinator_dashboard")
-	if _is_guide(request.user):
+	if _is_guide(request):
 		request.session["active_role"] = "guide"
 		return redirect("guide_dashboard")
-	elif _is_coordinator(request.user):
+	elif _is_coordinator(request):
 		request.session["active_role"] = "coordinator"
 		return redirect("coordinator_dashboard")
-	elif _is_hod(request.user):
+	elif _is_hod(request):
 		return redirect("hod_dashboard")
 	
 	# Get student-specific data for dashboard
-	group = _get_group_for_user(request.user)
-	group_size = _get_group_size(group) if group else 0
+	workspace = StudentWorkspace.for_request(request)
+	group = workspace.group
+	group_size = workspace.size
 	group_ready = group_size >= 4
 	
 	# Get pending requests count
@@ -209,37 +207,20 @@ def dashboard(request):
 		status=GroupRequest.STATUS_PENDING
 	).count()
 	
-	# Get evaluation files for the group
-	evaluation_files = {}
-	evaluations = {}
-	if group:
-		evaluation_files = {
-			"zeroth": EvaluationFile.objects.filter(group=group, stage="zeroth").first(),
-			"first": EvaluationFile.objects.filter(group=group, stage="first").first(),
-			"second": EvaluationFile.objects.filter(group=group, stage="second").first(),
-			"final": EvaluationFile.objects.filter(group=group, stage="final").first(),
-		}
-		evaluations = {
-			"zeroth": GroupEvaluation.objects.filter(group=group, stage="zeroth").first(),
-			"first": GroupEvaluation.objects.filter(group=group, stage="first").first(),
-			"second": GroupEvaluation.objects.filter(group=group, stage="second").first(),
-			"final": GroupEvaluation.objects.filter(group=group, stage="final").first(),
-		}
-	
 	context = {
 		'group': group,
 		'group_size': group_size,
 		'group_ready': group_ready,
 		'pending_requests_count': pending_requests_count,
-		'evaluation_files': evaluation_files,
-		'evaluations': evaluations,
+		'evaluation_files': workspace.evaluation_files,
+		'evaluations': workspace.evaluations,
 	}
 	return render(request, "dashboard.html", context)
 
 
 @login_required
 def switch_role(request):
-	if not _has_dual_faculty_roles(request.user):
+	if not _has_dual_faculty_roles(request):
 		return redirect("dashboard")
 	active_role = _get_active_faculty_role(request)
 	if active_role == "guide":
@@ -252,10 +233,10 @@ def switch_role(request):
 
 @login_required
 def role_selection(request):
-	if not hasattr(request.user, "faculty_profile"):
+	if not request.roles.is_faculty:
 		return redirect("dashboard")
 
-	if not _has_dual_faculty_roles(request.user):
+	if not _has_dual_faculty_roles(request):
 		return redirect("dashboard")
 
 	if request.method == "POST":
@@ -273,13 +254,14 @@ def role_selection(request):
 
 @login_required
 def mini_project(request):
-	if not _is_student(request.user):
+	if not _is_student(request):
 		messages.error(request, "Only students can access this page.")
 		return redirect("dashboard")
 
-	group = _get_group_for_user(request.user)
-	is_leader = group and group.leader == request.user
-	group_size = _get_group_size(group) if group else 0
+	workspace = StudentWorkspace.for_request(request)
+	group = workspace.group
+	is_leader = workspace.is_leader
+	group_size = workspace.size
 	group_full = group_size >= 5
 
 	if request.method == "POST":
@@ -294,15 +276,11 @@ def mini_project(request):
 				messages.error(request, "Only the group leader can submit SDG.")
 				return redirect("mini_project")
 
-			coordinator_approval = CoordinatorApproval.objects.filter(
-				group=group,
-				status=CoordinatorApproval.STATUS_APPROVED,
-			).first()
-			if not coordinator_approval:
+			if not any(approval.status == CoordinatorApproval.STATUS_APPROVED for approval in workspace.coordinator_approvals):
 				messages.error(request, "Coordinator approval is required before SDG submission.")
 				return redirect("mini_project")
 
-			if SustainableDevelopmentGoal.objects.filter(group=group).exists():
+			if workspace.sdg:
 				messages.info(request, "SDG already submitted for this group.")
 				return redirect("mini_project")
 
@@ -343,7 +321,7 @@ def mini_project(request):
 			return redirect("mini_project")
 		
 		# Validate that recipient is a student
-		if not _is_student(to_user):
+		if not hasattr(to_user, "student_profile"):
 			messages.error(request, "You can only send group requests to students.")
 			return redirect("mini_project")
 
@@ -376,20 +354,14 @@ def mini_project(request):
 			messages.success(request, "Group request sent.")
 		return redirect("mini_project")
 
-	query = request.GET.get("q", "").strip()
-	# Only show students in the available list (exclude faculty, coordinators, HOD, admin)
-	available_students = User.objects.filter(student_profile__isnull=False).exclude(id=request.user.id)
-	if query:
-		available_students = available_students.filter(Q(username__icontains=query) | Q(email__icontains=query))
-
 	sent_requests = GroupRequest.objects.filter(sender=request.user).select_related("recipient")
-	group_members = GroupMember.objects.filter(group=group).select_related("user") if group else []
+	group_members = workspace.members
 
 	coordinator_approval = None
 	coordinator_approvals = []
 	is_coordinator_approved = False
 	if group:
-		coordinator_approvals = list(CoordinatorApproval.objects.filter(group=group).select_related("coordinator", "coordinator__faculty_profile"))
+		coordinator_approvals = workspace.coordinator_approvals
 		# Check if ANY coordinator has approved
 		is_coordinator_approved = any(approval.status == CoordinatorApproval.STATUS_APPROVED for approval in coordinator_approvals)
 		# For backward compatibility, set coordinator_approval to first approved or first overall
@@ -398,43 +370,29 @@ def mini_project(request):
 		elif coordinator_approvals:
 			coordinator_approval = coordinator_approvals[0]
 
-	sdg_submission = SustainableDevelopmentGoal.objects.filter(group=group).first() if group else None
-	assigned_guide = _get_accepted_guide_for_group(group) if group else None
-	selected_topic = Abstract.objects.filter(group=group, is_final_approved=True).order_by("-submitted_at").first() if group else None
+	sdg_submission = workspace.sdg
+	assigned_guide = workspace.assigned_guide
+	selected_topic = workspace.selected_topic
 	can_submit_sdg = bool(
 		group
 		and is_leader
 		and is_coordinator_approved
 		and (not sdg_submission or not sdg_submission.is_submitted)
 	)
-	project_report = ProjectReport.objects.filter(group=group).first() if group else None
-	first_complete = _is_stage_completed_for_group(group, "first") if group else False
-	second_complete = _is_stage_completed_for_group(group, "second") if group else False
+	project_report = workspace.project_report
+	first_complete = workspace.stage_completed("first")
+	second_complete = workspace.stage_completed("second")
 
 	# Get evaluation files and evaluations for the group
-	evaluation_files = {}
-	evaluations = {}
-	student_evaluations = {}
+	evaluation_files = workspace.evaluation_files
+	evaluations = workspace.evaluations
+	student_evaluations = workspace.student_evaluations
 	if group:
-		evaluation_files = {
-			"zeroth": EvaluationFile.objects.filter(group=group, stage="zeroth").first(),
-			"first": EvaluationFile.objects.filter(group=group, stage="first").first(),
-			"second": EvaluationFile.objects.filter(group=group, stage="second").first(),
-			"final": EvaluationFile.objects.filter(group=group, stage="final").first(),
-		}
-		evaluations = {
-			"zeroth": GroupEvaluation.objects.filter(group=group, stage="zeroth").first(),
-			"first": GroupEvaluation.objects.filter(group=group, stage="first").first(),
-			"second": GroupEvaluation.objects.filter(group=group, stage="second").first(),
-			"final": GroupEvaluation.objects.filter(group=group, stage="final").first(),
-		}
-		
-		# Get student evaluations for current user
-		student_evaluations = {
-			"first": StudentEvaluation.objects.filter(student=request.user, stage="first").first(),
-			"second": StudentEvaluation.objects.filter(student=request.user, stage="second").first(),
-		}
-		_ensure_final_result(student_evaluations.get("second"))
+		second_eval = student_evaluations.get("second")
+		if second_eval and second_eval.group_id == group.id:
+			# _get_ese_availability reads group.project_report, already loaded.
+			second_eval.group = group
+		_ensure_final_result(second_eval)
 
 	# Official SDG names for display
 	sdg_names = {
@@ -489,10 +447,8 @@ def mini_project(request):
 		"group_size": group_size,
 		"group_full": group_full,
 		"group_ready": group_size >= 4,
-		"available_students": available_students,
 		"sent_requests": sent_requests,
 		"group_members": group_members,
-		"query": query,
 		"coordinator_approval": coordinator_approval,
 		"coordinator_approvals": coordinator_approvals,
 		"is_coordinator_approved": is_coordinator_approved,
@@ -518,9 +474,37 @@ def mini_project(request):
 	return render(request, "mini_project.html", context)
 
 
+STUDENT_SEARCH_PAGE_SIZE = 20
+
+
+@login_required
+def student_search(request):
+	"""Autocomplete for group invitations: students not yet in a group, a page at a time."""
+	if not _is_student(request):
+		return JsonResponse({"error": "Only students can search for group members."}, status=403)
+
+	students, next_cursor = search_available_students(
+		request.user,
+		request.GET.get("q", ""),
+		after=request.GET.get("after", ""),
+		limit=STUDENT_SEARCH_PAGE_SIZE,
+	)
+	results = []
+	for student in students:
+		profile = student.student_profile
+		results.append({
+			"id": student.id,
+			"username": student.username,
+			"name": student.get_full_name(),
+			"roll_number": profile.roll_number or "",
+			"register_number": profile.register_number or "",
+		})
+	return JsonResponse({"results": results, "next": next_cursor})
+
+
 @login_required
 def sdg_submission(request):
-	if not _is_student(request.user):
+	if not _is_student(request):
 		messages.error(request, "Only students can access this page.")
 		return redirect("dashboard")
 
@@ -608,7 +592,7 @@ def sdg_submission(request):
 
 @login_required
 def project_report(request):
-	if not _is_student(request.user):
+	if not _is_student(request):
 		messages.error(request, "Only students can access project report submission.")
 		return redirect("dashboard")
 	return redirect(f"{reverse('mini_project')}#project-report")
@@ -616,7 +600,7 @@ def project_report(request):
 
 @login_required
 def submit_project_report(request, group_id):
-	if not _is_student(request.user):
+	if not _is_student(request):
 		messages.error(request, "Only students can submit project reports.")
 		return redirect("dashboard")
 
@@ -633,6 +617,9 @@ def submit_project_report(request, group_id):
 		return redirect(f"{reverse('mini_project')}#project-report")
 
 	report_file = request.FILES.get("report_file")
+	if rejected_upload(request, "report_file"):
+		messages.error(request, "The uploaded file is not a valid PDF.")
+		return redirect(f"{reverse('mini_project')}#project-report")
 	if not report_file:
 		messages.error(request, "Please choose a PDF file to upload.")
 		return redirect(f"{reverse('mini_project')}#project-report")
@@ -647,11 +634,16 @@ def submit_project_report(request, group_id):
 		messages.error(request, "Only PDF files are allowed.")
 		return redirect(f"{reverse('mini_project')}#project-report")
 
+	if not has_expected_signature(report_file, ".pdf"):
+		messages.error(request, "The uploaded file is not a valid PDF.")
+		return redirect(f"{reverse('mini_project')}#project-report")
+
 	report, created = ProjectReport.objects.get_or_create(
 		group=group,
 		defaults={
 			"uploaded_by": request.user,
 			"report_file": report_file,
+			"report_filename": report_file.name,
 			"review_status": ProjectReport.STATUS_PENDING,
 		},
 	)
@@ -659,9 +651,10 @@ def submit_project_report(request, group_id):
 	if created:
 		messages.success(request, "Project report uploaded successfully.")
 	else:
-		if report.report_file:
-			report.report_file.delete(save=False)
+		# Stored files are content-addressed and may be shared with other rows,
+		# so the previous file is left for the blob store to reclaim.
 		report.report_file = report_file
+		report.report_filename = report_file.name
 		report.uploaded_by = request.user
 		report.uploaded_at = timezone.now()
 		report.coordinator1_mark = None
@@ -676,12 +669,13 @@ def submit_project_report(request, group_id):
 		report.save()
 		messages.success(request, "Project report updated successfully.")
 
+	StoredBlob.inspect_pdf_later(report.report_file.name)
 	return redirect(f"{reverse('mini_project')}#project-report")
 
 
 @login_required
 def submit_report_mark(request, report_id):
-	if not _is_coordinator(request.user):
+	if not _is_coordinator(request):
 		return HttpResponseForbidden("Only coordinators can submit report marks.")
 
 	role_redirect = _ensure_active_role_for_dual_faculty(request, "coordinator")
@@ -700,17 +694,7 @@ def submit_report_mark(request, report_id):
 	if not student_profile or not student_profile.student_class:
 		return HttpResponseForbidden("Group leader class information is missing.")
 
-	coordinator_role = None
-	assignments = list(
-		CoordinatorAssignment.objects.filter(student_class=student_profile.student_class)
-		.select_related("faculty")
-		.order_by("id")
-	)
-	for idx, assignment in enumerate(assignments, 1):
-		if assignment.faculty_id == request.user.id:
-			coordinator_role = idx
-			break
-
+	coordinator_role = request.roles.coordinator_slot(student_profile.student_class_id)
 	if coordinator_role not in (1, 2):
 		return HttpResponseForbidden("You are not assigned as a coordinator for this group.")
 
@@ -762,7 +746,7 @@ def submit_report_mark(request, report_id):
 
 @login_required
 def submit_report_rejection(request, report_id):
-	if not _is_coordinator(request.user):
+	if not _is_coordinator(request):
 		return HttpResponseForbidden("Only coordinators can reject project reports.")
 
 	role_redirect = _ensure_active_role_for_dual_faculty(request, "coordinator")
@@ -781,11 +765,7 @@ def submit_report_rejection(request, report_id):
 	if not student_profile or not student_profile.student_class:
 		return HttpResponseForbidden("Group leader class information is missing.")
 
-	coordinator_assigned = CoordinatorAssignment.objects.filter(
-		student_class=student_profile.student_class,
-		faculty=request.user,
-	).exists()
-	if not coordinator_assigned:
+	if not request.roles.coordinator_slot(student_profile.student_class_id):
 		return HttpResponseForbidden("You are not assigned as a coordinator for this group.")
 
 	review_text = request.POST.get("rejection_review", "").strip()
@@ -821,27 +801,61 @@ def download_project_report(request, report_id):
 		allowed = True
 	elif group.leader_id == request.user.id or GroupMember.objects.filter(group=group, user=request.user).exists():
 		allowed = True
-	elif _is_guide(request.user) and GuideRequest.objects.filter(group=group, guide=request.user, status=GuideRequest.STATUS_ACCEPTED).exists():
+	elif _is_guide(request) and GuideRequest.objects.filter(group=group, guide=request.user, status=GuideRequest.STATUS_ACCEPTED).exists():
 		allowed = True
-	elif _is_coordinator(request.user):
+	elif _is_coordinator(request):
 		student_profile = getattr(group.leader, "student_profile", None)
-		if student_profile and student_profile.student_class:
-			allowed = CoordinatorAssignment.objects.filter(student_class=student_profile.student_class, faculty=request.user).exists()
-	elif _is_hod(request.user):
+		if student_profile and student_profile.student_class_id:
+			allowed = request.roles.coordinator_slot(student_profile.student_class_id) is not None
+	elif _is_hod(request):
 		student_profile = getattr(group.leader, "student_profile", None)
-		hod_dept = getattr(getattr(request.user, "faculty_profile", None), "department", None)
+		hod_dept = request.roles.department
 		allowed = bool(student_profile and hod_dept and student_profile.department == hod_dept)
 
 	if not allowed:
 		return HttpResponseForbidden("You are not authorized to download this project report.")
 
-	file_name = os.path.basename(report.report_file.name)
-	return FileResponse(report.report_file.open("rb"), as_attachment=True, filename=file_name)
+	report_file = report.report_file
+	if not is_blob_name(report_file.name):
+		# Uploaded before the blob store and not moved by migrate_blobs yet.
+		if not default_storage.exists(report_file.name):
+			raise Http404("Project report file not found.")
+		report_file = default_storage.open(report_file.name, "rb")
+
+	return serve_file(
+		request,
+		report_file,
+		filename=report.display_filename,
+		content_type="application/pdf",
+		last_modified=report.uploaded_at,
+	)
+
+
+@login_required
+def export_files(request, class_id=None):
+	"""Stream every project report and evaluation file of the user's classes as one ZIP."""
+	if not _is_hod(request):
+		role_redirect = _ensure_active_role_for_dual_faculty(request, "coordinator")
+		if role_redirect:
+			return role_redirect
+
+	groups = _get_exportable_groups(request)
+	archive_name = "project-files.zip"
+	if groups is not None and class_id is not None:
+		student_class = get_object_or_404(Class, id=class_id)
+		groups = groups.filter(leader__student_profile__student_class=student_class)
+		archive_name = f"{student_class.name}-files.zip"
+	if groups is None or not groups.exists():
+		return HttpResponseForbidden("You are not authorized to export these files.")
+
+	response = StreamingHttpResponse(stream_zip(export_entries(groups)), content_type="application/zip")
+	response["Content-Disposition"] = content_disposition_header(True, archive_name)
+	return response
 
 
 @login_required
 def group_requests(request):
-	if not _is_student(request.user):
+	if not _is_student(request):
 		messages.error(request, "Only students can access this page.")
 		return redirect("dashboard")
 
@@ -890,7 +904,7 @@ def group_requests(request):
 
 @login_required
 def guide_request(request):
-	if not _is_student(request.user):
+	if not _is_student(request):
 		messages.error(request, "Only students can access this page.")
 		return redirect("dashboard")
 
@@ -931,7 +945,7 @@ def guide_request(request):
 			messages.error(request, "Message is required.")
 			return redirect("guide_request")
 		guide_user = get_object_or_404(User, id=guide_id)
-		if not _is_guide(guide_user):
+		if not getattr(getattr(guide_user, "faculty_profile", None), "is_guide", False):
 			messages.error(request, "Selected user is not a guide.")
 			return redirect("guide_request")
 		GuideRequest.objects.create(group=group, guide=guide_user, message=message)
@@ -948,82 +962,60 @@ def guide_request(request):
 	return render(request, "guide_request.html", context)
 
 
-@login_required
-def guide_dashboard(request):
-	if not _is_guide(request.user):
-		messages.error(request, "Only guides can access this page.")
-		return redirect("dashboard")
-
-	role_redirect = _ensure_active_role_for_dual_faculty(request, "guide")
-	if role_redirect:
-		return role_redirect
-
-	accepted_requests = GuideRequest.objects.filter(
-		guide=request.user,
-		status=GuideRequest.STATUS_ACCEPTED,
-	).select_related("group", "group__leader")
+def _guide_group_items(guide, group_ids):
+	"""Panel data of the groups ``guide`` accepted among ``group_ids``, in that order, None for the others."""
+	accepted_requests = list(
+		GuideRequest.objects.filter(
+			guide=guide,
+			status=GuideRequest.STATUS_ACCEPTED,
+			group_id__in=group_ids,
+		).select_related("group", "group__leader").prefetch_related(
+			"group__project_report",
+			"group__abstracts",
+			Prefetch(
+				"group__groupmember_set",
+				queryset=GroupMember.objects.select_related("user").order_by("id"),
+			),
+		)
+	)
 
-	group_ids = accepted_requests.values_list("group_id", flat=True)
 	sdg_by_group_id = {
 		sdg.group_id: sdg
 		for sdg in SustainableDevelopmentGoal.objects.filter(group_id__in=group_ids)
 	}
 	report_by_group_id = {
-		report.group_id: report
-		for report in ProjectReport.objects.filter(group_id__in=group_ids)
+		guide_request.group_id: guide_request.group.project_report
+		for guide_request in accepted_requests
+		if hasattr(guide_request.group, "project_report")
 	}
 
-	# Get evaluations for assigned groups
-	evaluations_by_group = {}
-	evaluation_files_by_group = {}
-	student_evaluations_by_group = {}
-	for group_id in group_ids:
-		evaluations_by_group[group_id] = {
-			"zeroth": GroupEvaluation.objects.filter(group_id=group_id, stage="zeroth").first(),
-			"first": GroupEvaluation.objects.filter(group_id=group_id, stage="first").first(),
-			"second": GroupEvaluation.objects.filter(group_id=group_id, stage="second").first(),
-			"final": GroupEvaluation.objects.filter(group_id=group_id, stage="final").first(),
-		}
-		evaluation_files_by_group[group_id] = {
-			"zeroth": EvaluationFile.objects.filter(group_id=group_id, stage="zeroth").first(),
-			"first": EvaluationFile.objects.filter(group_id=group_id, stage="first").first(),
-			"second": EvaluationFile.objects.filter(group_id=group_id, stage="second").first(),
-			"final": EvaluationFile.objects.filter(group_id=group_id, stage="final").first(),
-		}
-		
-		# Get student evaluations for this group
-		group_members = GroupMember.objects.filter(group_id=group_id).select_related("user")
-		student_evaluations_by_group[group_id] = {
-			"first": {
-				member.user.id: StudentEvaluation.objects.filter(student=member.user, stage="first").first()
-				for member in group_members
-			},
-			"second": {
-				member.user.id: StudentEvaluation.objects.filter(student=member.user, stage="second").first()
-				for member in group_members
-			}
-		}
-		for eval_obj in student_evaluations_by_group[group_id]["second"].values():
-			_ensure_final_result(eval_obj)
+	# Evaluations, files and per-student evaluations for all assigned groups at once
+	evaluation_index = EvaluationIndex(group_ids)
 
-	assigned_groups = []
+	items_by_group_id = {}
 	for guide_request in accepted_requests:
-		members = list(GroupMember.objects.filter(group=guide_request.group).select_related("user"))
-		student_eval_map = student_evaluations_by_group.get(guide_request.group_id, {})
+		group = guide_request.group
+		members = list(group.groupmember_set.all())
+		student_eval_map = evaluation_index.student_evaluations_for([member.user_id for member in members])
 		first_eval_map = student_eval_map.get("first", {})
 		second_eval_map = student_eval_map.get("second", {})
+		for eval_obj in second_eval_map.values():
+			if eval_obj and eval_obj.group_id == group.id:
+				# _get_ese_availability reads group.project_report, already prefetched.
+				eval_obj.group = group
+			_ensure_final_result(eval_obj)
 		esestatus = {}
 		for member in members:
 			eval_second = second_eval_map.get(member.user.id)
 			allowed, reason = _get_ese_availability(eval_second)
 			esestatus[member.user.id] = {"allowed": allowed, "message": reason}
 		blocked_reasons = [status["message"] for status in esestatus.values() if not status["allowed"] and status["message"]]
-		assigned_groups.append({
-			"group": guide_request.group,
+		items_by_group_id[guide_request.group_id] = {
+			"group": group,
 			"sdg": sdg_by_group_id.get(guide_request.group_id),
 			"project_report": report_by_group_id.get(guide_request.group_id),
-			"evaluations": evaluations_by_group.get(guide_request.group_id, {}),
-			"evaluation_files": evaluation_files_by_group.get(guide_request.group_id, {}),
+			"evaluations": evaluation_index.group_evaluations_for(guide_request.group_id),
+			"evaluation_files": evaluation_index.evaluation_files_for(guide_request.group_id),
 			"student_evaluations": student_eval_map,
 			"members": members,
 			"first_complete": all(eval_obj and eval_obj.finalized for eval_obj in first_eval_map.values()),
@@ -1031,7 +1023,37 @@ def guide_dashboard(request):
 			"ese_status": esestatus,
 			"ese_ready": not blocked_reasons,
 			"ese_block_reason": blocked_reasons[0] if blocked_reasons else "",
-		})
+		}
+	return [items_by_group_id.get(group_id) for group_id in group_ids]
+
+
+@login_required
+def guide_dashboard(request):
+	if not _is_guide(request):
+		messages.error(request, "Only guides can access this page.")
+		return redirect("dashboard")
+
+	role_redirect = _ensure_active_role_for_dual_faculty(request, "guide")
+	if role_redirect:
+		return role_redirect
+
+	group_ids = list(
+		GuideRequest.objects.filter(
+			guide=request.user,
+			status=GuideRequest.STATUS_ACCEPTED,
+		).order_by("id").values_list("group_id", flat=True)
+	)
+
+	# Group panels come from the fragment cache; only stale ones are rebuilt.
+	def render_panels(parts):
+		items = _guide_group_items(request.user, [group_id for group_id, _ in parts])
+		return [
+			render_to_string("guide_group_panel.html", {"item": item, "number": number}, request) if item else None
+			for item, (_, number) in zip(items, parts)
+		]
+
+	parts = [(group_id, number) for number, group_id in enumerate(group_ids, start=1)]
+	group_panels = [panel for panel in cached_fragments(request, "guide-group", parts, render_panels) if panel]
 
 	# Get pending guide requests for the requests tab
 	pending_requests = GuideRequest.objects.filter(
@@ -1040,25 +1062,25 @@ def guide_dashboard(request):
 	).select_related("group", "group__leader", "group__leader__student_profile")
 
 	# Get abstracts for the review abstracts tab
-	all_abstracts = Abstract.objects.filter(group_id__in=group_ids).select_related("group", "group__leader").order_by("-submitted_at")
-	pending_abstracts = all_abstracts.filter(guide_status=Abstract.STATUS_PENDING)
-	approved_abstracts = all_abstracts.filter(guide_status=Abstract.STATUS_APPROVED)
-	rejected_abstracts = all_abstracts.filter(guide_status=Abstract.STATUS_REJECTED)
+	all_abstracts = list(Abstract.objects.filter(group_id__in=group_ids).select_related("group", "group__leader").order_by("-submitted_at"))
+	pending_abstracts = [abstract for abstract in all_abstracts if abstract.guide_status == Abstract.STATUS_PENDING]
+	approved_abstracts = [abstract for abstract in all_abstracts if abstract.guide_status == Abstract.STATUS_APPROVED]
+	rejected_abstracts = [abstract for abstract in all_abstracts if abstract.guide_status == Abstract.STATUS_REJECTED]
 
 	context = {
-		"assigned_groups": assigned_groups,
+		"group_panels": group_panels,
 		"pending_requests": pending_requests,
 		"pending_abstracts": pending_abstracts,
 		"approved_abstracts": approved_abstracts,
 		"rejected_abstracts": rejected_abstracts,
-		"is_dual_role": _has_dual_faculty_roles(request.user),
+		"is_dual_role": _has_dual_faculty_roles(request),
 	}
 	return render(request, "guide_dashboard.html", context)
 
 
 @login_required
 def guide_requests(request):
-	if not _is_guide(request.user):
+	if not _is_guide(request):
 		messages.error(request, "Only guides can access this page.")
 		return redirect("dashboard")
 
@@ -1086,12 +1108,6 @@ def guide_requests(request):
 	return render(request, "guide_requests.html", context)
 
 
-def _get_accepted_guide_for_group(group):
-	"""Get the accepted guide for a group, if any."""
-	accepted_request = GuideRequest.objects.filter(group=group, status=GuideRequest.STATUS_ACCEPTED).first()
-	return accepted_request.guide if accepted_request else None
-
-
 def _apply_abstract_derived_status(abstract):
 	if abstract.is_final_approved:
 		abstract.status = Abstract.STATUS_APPROVED
@@ -1103,30 +1119,31 @@ def _apply_abstract_derived_status(abstract):
 
 @login_required
 def submit_abstract(request):
-	if not _is_student(request.user):
+	if not _is_student(request):
 		messages.error(request, "Only students can access this page.")
 		return redirect("dashboard")
 
-	group = _get_group_for_user(request.user)
+	workspace = StudentWorkspace.for_request(request)
+	group = workspace.group
 	if not group:
 		messages.error(request, "You must be in a group to submit an abstract.")
 		return redirect("mini_project")
 
-	if group.leader != request.user:
+	if not workspace.is_leader:
 		messages.error(request, "Only the group leader can submit abstracts.")
 		return redirect("mini_project")
 
-	group_size = _get_group_size(group)
+	group_size = workspace.size
 	if group_size < 4:
 		messages.error(request, "Group must have at least 4 members to submit an abstract.")
 		return redirect("mini_project")
 
-	guide = _get_accepted_guide_for_group(group)
+	guide = workspace.assigned_guide
 	if not guide:
 		messages.error(request, "Your group must have an accepted guide before submitting an abstract.")
 		return redirect("guide_request")
 
-	selected_topic = Abstract.objects.filter(group=group, is_final_approved=True).order_by("-submitted_at").first()
+	selected_topic = workspace.selected_topic
 	if selected_topic and request.method == "POST":
 		messages.info(request, "Abstract already selected. New submissions are not allowed for this group.")
 		return redirect("abstract_status")
@@ -1144,6 +1161,10 @@ def submit_abstract(request):
 			messages.error(request, "Abstract text is required.")
 			return redirect("submit_abstract")
 
+		if rejected_upload(request, "pdf_file"):
+			messages.error(request, "The uploaded file is not a valid PDF.")
+			return redirect("submit_abstract")
+
 		if not pdf_file:
 			messages.error(request, "PDF file is required.")
 			return redirect("submit_abstract")
@@ -1156,12 +1177,16 @@ def submit_abstract(request):
 			messages.error(request, "Only PDF files are allowed.")
 			return redirect("submit_abstract")
 
+		if not has_expected_signature(pdf_file, ".pdf"):
+			messages.error(request, "The uploaded file is not a valid PDF.")
+			return redirect("submit_abstract")
+
 		# Create new abstract submission
 		abstract = Abstract.objects.create(
 			group=group,
 			title=title,
 			abstract_text=abstract_text,
-			pdf_file=pdf_file.read(),
+			pdf_blob=pdf_file,
 			pdf_filename=pdf_file.name,
 			pdf_size=pdf_file.size,
 			status=Abstract.STATUS_PENDING,
@@ -1169,12 +1194,13 @@ def submit_abstract(request):
 			coordinator_status=Abstract.STATUS_PENDING,
 			is_final_approved=False,
 		)
+		StoredBlob.inspect_pdf_later(abstract.pdf_blob.name)
 
 		messages.success(request, "Abstract submitted successfully!")
 		return redirect("abstract_status")
 
 	# Get previous submissions
-	previous_abstracts = Abstract.objects.filter(group=group).order_by("-submitted_at")
+	previous_abstracts = workspace.abstracts
 
 	context = {
 		"group": group,
@@ -1187,7 +1213,7 @@ def submit_abstract(request):
 
 @login_required
 def abstract_status(request):
-	if not _is_student(request.user):
+	if not _is_student(request):
 		messages.error(request, "Only students can access this page.")
 		return redirect("dashboard")
 
@@ -1209,7 +1235,7 @@ def abstract_status(request):
 
 @login_required
 def faculty_abstracts(request):
-	if not _is_guide(request.user):
+	if not _is_guide(request):
 		messages.error(request, "Only faculty can access this page.")
 		return redirect("dashboard")
 
@@ -1223,12 +1249,14 @@ def faculty_abstracts(request):
 		status=GuideRequest.STATUS_ACCEPTED
 	).values_list("group_id", flat=True)
 
-	# Get all abstracts from these groups
-	all_abstracts = Abstract.objects.filter(group_id__in=accepted_groups).select_related("group", "group__leader").order_by("-submitted_at")
+	# Get all abstracts from these groups, with page counts from the PDF worker
+	all_abstracts = StoredBlob.attach_pdf_info(
+		Abstract.objects.filter(group_id__in=accepted_groups).select_related("group", "group__leader").order_by("-submitted_at")
+	)
 
-	pending_abstracts = all_abstracts.filter(guide_status=Abstract.STATUS_PENDING)
-	approved_abstracts = all_abstracts.filter(guide_status=Abstract.STATUS_APPROVED)
-	rejected_abstracts = all_abstracts.filter(guide_status=Abstract.STATUS_REJECTED)
+	pending_abstracts = [abstract for abstract in all_abstracts if abstract.guide_status == Abstract.STATUS_PENDING]
+	approved_abstracts = [abstract for abstract in all_abstracts if abstract.guide_status == Abstract.STATUS_APPROVED]
+	rejected_abstracts = [abstract for abstract in all_abstracts if abstract.guide_status == Abstract.STATUS_REJECTED]
 
 	context = {
 		"pending_abstracts": pending_abstracts,
@@ -1240,7 +1268,7 @@ def faculty_abstracts(request):
 
 @login_required
 def review_abstract(request, abstract_id):
-	if not _is_guide(request.user):
+	if not _is_guide(request):
 		messages.error(request, "Only faculty can access this page.")
 		return redirect("dashboard")
 
@@ -1308,14 +1336,14 @@ def review_abstract(request, abstract_id):
 
 @login_required
 def download_abstract(request, abstract_id):
-	abstract = get_object_or_404(Abstract, id=abstract_id)
+	abstract = get_object_or_404(Abstract.objects.with_content(), id=abstract_id)
 	has_access = False
 
-	if _is_student(request.user):
+	if _is_student(request):
 		group = _get_group_for_user(request.user)
 		has_access = group and group.id == abstract.group.id
 
-	elif _is_guide(request.user):
+	elif _is_guide(request):
 		guide_request = GuideRequest.objects.filter(
 			group=abstract.group,
 			guide=request.user,
@@ -1323,33 +1351,30 @@ def download_abstract(request, abstract_id):
 		).exists()
 		has_access = guide_request
 
-	elif _is_coordinator(request.user):
+	elif _is_coordinator(request):
 		has_access = CoordinatorApproval.objects.filter(
 			group=abstract.group,
 			coordinator=request.user,
 		).exists()
 		if not has_access:
 			student_profile = getattr(abstract.group.leader, "student_profile", None)
-			student_class = getattr(student_profile, "student_class", None)
-			if student_class:
-				has_access = CoordinatorAssignment.objects.filter(
-					faculty=request.user,
-					student_class=student_class,
-				).exists()
-
-	elif _is_hod(request.user):
-		user_dept = getattr(request.user.faculty_profile, "department", None)
+			class_id = getattr(student_profile, "student_class_id", None)
+			if class_id:
+				has_access = request.roles.coordinator_slot(class_id) is not None
+
+	elif _is_hod(request):
+		user_dept = request.roles.department
 		group_dept = getattr(getattr(abstract.group.leader, "student_profile", None), "department", None)
 		has_access = user_dept and group_dept and user_dept == group_dept
 
 	def _role_redirect():
-		if _is_student(request.user):
+		if _is_student(request):
 			return redirect("abstract_status")
-		if _is_guide(request.user):
+		if _is_guide(request):
 			return redirect("faculty_abstracts")
-		if _is_coordinator(request.user):
+		if _is_coordinator(request):
 			return HttpResponseRedirect(reverse("coordinator_dashboard") + "#topics")
-		if _is_hod(request.user):
+		if _is_hod(request):
 			return redirect("hod_dashboard")
 		return redirect("dashboard")
 
@@ -1357,18 +1382,27 @@ def download_abstract(request, abstract_id):
 		messages.error(request, "You don't have permission to download this abstract.")
 		return _role_redirect()
 
-	if not abstract.pdf_file:
+	if abstract.pdf_blob:
+		pdf = abstract.pdf_blob
+	elif abstract.pdf_file:
+		# Rows that migrate_blobs has not moved out of the database yet.
+		pdf = ContentFile(bytes(abstract.pdf_file))
+	else:
 		messages.error(request, "No PDF file available for this abstract.")
 		return _role_redirect()
 
-	response = HttpResponse(abstract.pdf_file, content_type='application/pdf')
-	response['Content-Disposition'] = f'attachment; filename="{abstract.pdf_filename}"'
-	return response
+	return serve_file(
+		request,
+		pdf,
+		filename=abstract.pdf_filename,
+		content_type="application/pdf",
+		last_modified=abstract.submitted_at,
+	)
 
 
 @login_required
 def request_coordinator_approval(request):
-	if not _is_student(request.user):
+	if not _is_student(request):
 		messages.error(request, "Only students can request coordinator approval.")
 		return redirect("dashboard")
 
@@ -1389,7 +1423,7 @@ def request_coordinator_approval(request):
 		return redirect("mini_project")
 
 	# Get student's class
-	student_profile = getattr(request.user, "student_profile", None)
+	student_profile = request.roles.student_profile
 	student_class = student_profile.student_class if student_profile else None
 	
 	if not student_class:
@@ -1401,7 +1435,7 @@ def request_coordinator_approval(request):
 		student_class=student_class
 	).select_related("faculty", "faculty__faculty_profile")
 	
-	coordinators = [assignment.faculty for assignment in coordinator_assignments if _is_coordinator(assignment.faculty)]
+	coordinators = [assignment.faculty for assignment in coordinator_assignments if getattr(getattr(assignment.faculty, "faculty_profile", None), "is_coordinator", False)]
 
 	if request.method == "POST":
 		if not coordinators:
@@ -1426,9 +1460,208 @@ def request_coordinator_approval(request):
 	return render(request, "request_coordinator_approval.html", context)
 
 
+COORDINATOR_GROUPS_PER_PAGE = 20
+
+COORDINATOR_GROUP_SORTS = {
+	"id": ("id",),
+	"newest": ("-created_at", "-id"),
+	"class": ("leader__student_profile__student_class__name", "id"),
+	"leader": ("leader__username", "id"),
+	"size": ("-member_count", "id"),
+}
+
+GROUP_STAGE_FILTERS = {
+	"first_complete": Q(member_count__gt=0, first_finalized__gte=F("member_count")),
+	"first_pending": Q(member_count=0) | Q(first_finalized__lt=F("member_count")),
+	"second_complete": Q(member_count__gt=0, second_finalized__gte=F("member_count")),
+	"second_pending": Q(member_count=0) | Q(second_finalized__lt=F("member_count")),
+}
+
+GROUP_ESE_FILTERS = {
+	"ready": Q(member_count__gt=0, ese_ready_members__gte=F("member_count"), report_marked=True),
+	"blocked": Q(member_count=0) | Q(ese_ready_members__lt=F("member_count")) | Q(report_marked=False),
+}
+
+GROUP_REPORT_FILTERS = {
+	"missing": Q(project_report__isnull=True),
+	"pending": Q(project_report__final_mark__isnull=True, project_report__review_status__in=[ProjectReport.STATUS_PENDING, ProjectReport.STATUS_APPROVED]),
+	"evaluated": Q(project_report__final_mark__isnull=False),
+	"rejected": Q(project_report__review_status=ProjectReport.STATUS_REJECTED),
+}
+
+
+def _summarize_coordinator_approvals(coordinator_approvals):
+	"""Return (approval to show, whether any coordinator approved)."""
+	approved = next(
+		(approval for approval in coordinator_approvals if approval.status == CoordinatorApproval.STATUS_APPROVED),
+		None,
+	)
+	if approved:
+		return approved, True
+	return (coordinator_approvals[0] if coordinator_approvals else None), False
+
+
+def _accepted_guide(guide_requests):
+	"""Guide of the latest request when it was accepted; ``guide_requests`` newest first."""
+	latest_guide_request = guide_requests[0] if guide_requests else None
+	if latest_guide_request and latest_guide_request.status == GuideRequest.STATUS_ACCEPTED:
+		return latest_guide_request.guide
+	return None
+
+
+def _report_status(project_report):
+	if not project_report:
+		return "missing"
+	if project_report.review_status == ProjectReport.STATUS_REJECTED:
+		return "rejected"
+	if project_report.final_mark is not None:
+		return "evaluated"
+	return "pending"
+
+
+def _coordinator_group_summary(group):
+	"""Header row of a dashboard group, built from annotate_group_progress()."""
+	coordinator_approval, is_coordinator_approved = _summarize_coordinator_approvals(list(group.coordinator_approvals.all()))
+	student_profile = getattr(group.leader, "student_profile", None)
+	members = group.member_count
+	return {
+		"group": group,
+		"class_name": student_profile.student_class.name if student_profile and student_profile.student_class else None,
+		"group_size": members,
+		"coordinator_approval": coordinator_approval,
+		"is_coordinator_approved": is_coordinator_approved,
+		"assigned_guide": _accepted_guide(list(group.guiderequest_set.all())),
+		"approved_abstract": next(iter(group.abstracts.all()), None),
+		"first_complete": bool(members) and group.first_finalized >= members,
+		"second_complete": bool(members) and group.second_finalized >= members,
+		"ese_ready": bool(members) and group.ese_ready_members >= members and group.report_marked,
+		"report_status": _report_status(getattr(group, "project_report", None)),
+	}
+
+
+def _coordinator_groups_queryset(user):
+	"""Groups of the coordinator's department with everything their detail panels show."""
+	return Group.objects.filter(
+		leader__student_profile__department=user.faculty_profile.department
+	).select_related(
+		"leader",
+		"leader__student_profile__student_class",
+	).prefetch_related(
+		"project_report",
+		Prefetch(
+			"groupmember_set",
+			queryset=GroupMember.objects.select_related("user", "user__student_profile").order_by("id"),
+		),
+		Prefetch(
+			"guiderequest_set",
+			queryset=GuideRequest.objects.select_related("guide").order_by("-id"),
+		),
+		Prefetch(
+			"abstracts",
+			queryset=Abstract.objects.select_related("reviewed_by").order_by("-submitted_at"),
+		),
+		Prefetch(
+			"coordinator_approvals",
+			queryset=CoordinatorApproval.objects.select_related("coordinator", "coordinator__faculty_profile").order_by("id"),
+		),
+	)
+
+
+def _coordinator_group_details(request, groups):
+	"""Full panel data for ``groups`` from _coordinator_groups_queryset(), in a fixed number of queries."""
+	group_ids = [group.id for group in groups]
+	sdg_by_group_id = {
+		sdg.group_id: sdg
+		for sdg in SustainableDevelopmentGoal.objects.filter(group_id__in=group_ids)
+	}
+	report_by_group_id = {
+		report.group_id: report
+		for report in StoredBlob.attach_pdf_info(getattr(group, "project_report", None) for group in groups)
+	}
+	evaluation_index = EvaluationIndex(group_ids)
+
+	group_details = []
+	for group in groups:
+		members = list(group.groupmember_set.all())
+		guide_requests = list(group.guiderequest_set.all())
+		latest_guide_request = guide_requests[0] if guide_requests else None
+		assigned_guide = _accepted_guide(guide_requests)
+
+		abstracts = list(group.abstracts.all())
+		approved_abstract = next((item for item in abstracts if item.is_final_approved), None)
+		sdg_entry = sdg_by_group_id.get(group.id)
+		project_report = report_by_group_id.get(group.id)
+
+		# Evaluations, files and per-student evaluations from the bulk index
+		group_evaluations = evaluation_index.group_evaluations_for(group.id)
+		evaluation_files = evaluation_index.evaluation_files_for(group.id)
+		student_evaluations = evaluation_index.student_evaluations_for([member.user_id for member in members])
+		for eval_obj in student_evaluations.get("second", {}).values():
+			if eval_obj and eval_obj.group_id == group.id:
+				# _get_ese_availability reads group.project_report, already prefetched.
+				eval_obj.group = group
+			_ensure_final_result(eval_obj)
+
+		second_eval_map = student_evaluations.get("second", {})
+		ese_rows = [
+			{"student": member.user, "student_eval": second_eval_map.get(member.user.id)}
+			for member in members
+		]
+		esestatus = {}
+		for member in members:
+			allowed, message = _get_ese_availability(second_eval_map.get(member.user.id))
+			esestatus[member.user.id] = {"allowed": allowed, "message": message}
+		blocked_reasons = [status["message"] for status in esestatus.values() if not status["allowed"] and status["message"]]
+
+		student_profile = getattr(group.leader, "student_profile", None)
+		class_name = student_profile.student_class.name if student_profile and student_profile.student_class else None
+		coordinator_role = None
+		if student_profile and student_profile.student_class_id:
+			coordinator_role = request.roles.coordinator_slot(student_profile.student_class_id)
+		
+		# Get all coordinator approvals for this group
+		coordinator_approvals = list(group.coordinator_approvals.all())
+		coordinator_approval, is_coordinator_approved = _summarize_coordinator_approvals(coordinator_approvals)
+		
+		group_details.append({
+			"group": group,
+			"class_name": class_name,
+			"department": getattr(student_profile, "department", None),
+			"leader_profile": getattr(group.leader, "student_profile", None),
+			"members": members,
+			"group_size": len(members),
+			"coordinator_role": coordinator_role,
+			"coordinator_approval": coordinator_approval,
+			"coordinator_approvals": coordinator_approvals,
+			"is_coordinator_approved": is_coordinator_approved,
+			"latest_guide_request": latest_guide_request,
+			"assigned_guide": assigned_guide,
+			"approved_abstract": approved_abstract,
+			"sdg": sdg_entry,
+			"project_report": project_report,
+			"evaluations": group_evaluations,
+			"evaluation_files": evaluation_files,
+			"student_evaluations": student_evaluations,
+			# Add flags for evaluation completion status
+			"first_complete": all(
+				eval_obj and eval_obj.finalized
+				for eval_obj in student_evaluations.get("first", {}).values()
+			),
+			"second_complete": all(
+				eval_obj and eval_obj.finalized
+				for eval_obj in student_evaluations.get("second", {}).values()
+			),
+			"ese_status": esestatus,
+			"ese_ready": not blocked_reasons,
+			"ese_block_reason": blocked_reasons[0] if blocked_reasons else "",
+			"ese_data": ese_rows,
+		})
+	return group_details
+
+
 @login_required
 def coordinator_dashboard(request):
-	if not _is_coordinator(request.user):
+	if not _is_coordinator(request):
 		messages.error(request, "Only coordinators can access this page.")
 		return redirect("dashboard")
 
@@ -1506,7 +1739,7 @@ def coordinator_dashboard(request):
 			messages.info(request, "Group rejected.")
 		return HttpResponseRedirect(reverse("coordinator_dashboard") + "#approvals")
 
-	faculty_profile = request.user.faculty_profile
+	faculty_profile = request.roles.faculty_profile
 	coordinator_dept = faculty_profile.department
 
 	assigned_classes = list(
@@ -1516,195 +1749,111 @@ def coordinator_dashboard(request):
 	)
 	assigned_classes = [class_name for class_name in assigned_classes if class_name]
 
-	# Show ALL groups from coordinator's department for evaluation
-	groups_queryset = Group.objects.filter(
-		leader__student_profile__department=coordinator_dept
-	)
-
-	groups_queryset = groups_queryset.select_related(
+	# Show ALL groups from coordinator's department, one page at a time.
+	# Stage, ESE and report panels are fetched per group from coordinator_group_detail.
+	department_classes = list(Class.objects.filter(department=coordinator_dept).order_by("name"))
+	groups_queryset = annotate_group_progress(
+		Group.objects.filter(leader__student_profile__department=coordinator_dept)
+	).select_related(
 		"leader",
-		"leader__student_profile",
+		"leader__student_profile__student_class",
+		"project_report",
 	).prefetch_related(
-		Prefetch(
-			"groupmember_set",
-			queryset=GroupMember.objects.select_related("user", "user__student_profile").order_by("id"),
-		),
 		Prefetch(
 			"guiderequest_set",
 			queryset=GuideRequest.objects.select_related("guide").order_by("-id"),
 		),
 		Prefetch(
 			"abstracts",
-			queryset=Abstract.objects.select_related("reviewed_by").order_by("-submitted_at"),
+			queryset=Abstract.objects.filter(is_final_approved=True).order_by("-submitted_at"),
 		),
 		Prefetch(
 			"coordinator_approvals",
-			queryset=CoordinatorApproval.objects.select_related("coordinator", "coordinator__faculty_profile").order_by("id"),
+			queryset=CoordinatorApproval.objects.order_by("id"),
 		),
 	)
 
-	sdg_by_group_id = {}
-	report_by_group_id = {}
-	if groups_queryset:
-		sdg_by_group_id = {
-			sdg.group_id: sdg
-			for sdg in SustainableDevelopmentGoal.objects.filter(group_id__in=groups_queryset.values_list("id", flat=True))
-		}
-		report_by_group_id = {
-			report.group_id: report
-			for report in ProjectReport.objects.filter(group_id__in=groups_queryset.values_list("id", flat=True))
-		}
-
-	group_details = []
-	for group in groups_queryset.order_by("id"):
-		members = list(group.groupmember_set.all())
-		guide_requests = list(group.guiderequest_set.all())
-		latest_guide_request = guide_requests[0] if guide_requests else None
-		assigned_guide = None
-		if latest_guide_request and latest_guide_request.status == GuideRequest.STATUS_ACCEPTED:
-			assigned_guide = latest_guide_request.guide
-
-		abstracts = list(group.abstracts.all())
-		approved_abstract = next((item for item in abstracts if item.is_final_approved), None)
-		sdg_entry = sdg_by_group_id.get(group.id)
-		project_report = report_by_group_id.get(group.id)
-
-		# Get evaluations for this group
-		group_evaluations = {
-			"zeroth": GroupEvaluation.objects.filter(group=group, stage="zeroth").first(),
-			"first": GroupEvaluation.objects.filter(group=group, stage="first").first(),
-			"second": GroupEvaluation.objects.filter(group=group, stage="second").first(),
-			"final": GroupEvaluation.objects.filter(group=group, stage="final").first(),
-		}
-
-		# Get evaluation files for this group
-		evaluation_files = {
-			"zeroth": EvaluationFile.objects.filter(group=group, stage="zeroth").first(),
-			"first": EvaluationFile.objects.filter(group=group, stage="first").first(),
-			"second": EvaluationFile.objects.filter(group=group, stage="second").first(),
-			"final": EvaluationFile.objects.filter(group=group, stage="final").first(),
-		}
-
-		# Get student evaluations for this group
-		group_members = GroupMember.objects.filter(group=group).select_related("user")
-		student_evaluations = {
-			"first": {
-				member.user.id: StudentEvaluation.objects.filter(student=member.user, stage="first").first()
-				for member in group_members
-			},
-			"second": {
-				member.user.id: StudentEvaluation.objects.filter(student=member.user, stage="second").first()
-				for member in group_members
-			}
-		}
-		for eval_obj in student_evaluations.get("second", {}).values():
-			_ensure_final_result(eval_obj)
-
-		second_eval_map = student_evaluations.get("second", {})
-		ese_rows = [
-			{"student": member.user, "student_eval": second_eval_map.get(member.user.id)}
-			for member in members
-		]
-		esestatus = {}
-		for member in group_members:
-			allowed, message = _get_ese_availability(second_eval_map.get(member.user.id))
-			esestatus[member.user.id] = {"allowed": allowed, "message": message}
-		blocked_reasons = [status["message"] for status in esestatus.values() if not status["allowed"] and status["message"]]
+	sort = request.GET.get("sort")
+	filters = {
+		"class": request.GET.get("class", ""),
+		"stage": request.GET.get("stage", ""),
+		"ese": request.GET.get("ese", ""),
+		"report": request.GET.get("report", ""),
+		"sort": sort if sort in COORDINATOR_GROUP_SORTS else "id",
+	}
+	if filters["class"].isdigit():
+		groups_queryset = groups_queryset.filter(leader__student_profile__student_class_id=int(filters["class"]))
+	for name, choices in (("stage", GROUP_STAGE_FILTERS), ("ese", GROUP_ESE_FILTERS), ("report", GROUP_REPORT_FILTERS)):
+		if filters[name] in choices:
+			groups_queryset = groups_queryset.filter(choices[filters[name]])
+	groups_queryset = groups_queryset.order_by(*COORDINATOR_GROUP_SORTS[filters["sort"]])
 
-		student_profile = getattr(group.leader, "student_profile", None)
-		class_name = student_profile.student_class.name if student_profile and student_profile.student_class else None
-		coordinator_role = None
-		if student_profile and student_profile.student_class:
-			class_assignments = list(
-				CoordinatorAssignment.objects.filter(student_class=student_profile.student_class)
-				.select_related("faculty")
-				.order_by("id")
-			)
-			for idx, assignment in enumerate(class_assignments, 1):
-				if assignment.faculty_id == request.user.id:
-					coordinator_role = idx
-					break
-		
-		# Get all coordinator approvals for this group
-		coordinator_approvals = list(group.coordinator_approvals.all())
-		# Check if any coordinator has approved
-		is_coordinator_approved = any(approval.status == CoordinatorApproval.STATUS_APPROVED for approval in coordinator_approvals)
-		coordinator_approval = None
-		if is_coordinator_approved:
-			coordinator_approval = next(
-				(approval for approval in coordinator_approvals if approval.status == CoordinatorApproval.STATUS_APPROVED),
-				None,
-			)
-		elif coordinator_approvals:
-			coordinator_approval = coordinator_approvals[0]
-		
-		group_details.append({
-			"group": group,
-			"class_name": class_name,
-			"department": getattr(student_profile, "department", None),
-			"leader_profile": getattr(group.leader, "student_profile", None),
-			"members": members,
-			"group_size": len(members),
-			"coordinator_role": coordinator_role,
-			"coordinator_approval": coordinator_approval,
-			"coordinator_approvals": coordinator_approvals,
-			"is_coordinator_approved": is_coordinator_approved,
-			"latest_guide_request": latest_guide_request,
-			"assigned_guide": assigned_guide,
-			"approved_abstract": approved_abstract,
-			"sdg": sdg_entry,
-			"project_report": project_report,
-			"evaluations": group_evaluations,
-			"evaluation_files": evaluation_files,
-			"student_evaluations": student_evaluations,
-			# Add flags for evaluation completion status
-			"first_complete": all(
-				eval_obj and eval_obj.finalized
-				for eval_obj in student_evaluations.get("first", {}).values()
-			),
-			"second_complete": all(
-				eval_obj and eval_obj.finalized
-				for eval_obj in student_evaluations.get("second", {}).values()
-			),
-			"ese_status": esestatus,
-			"ese_ready": not blocked_reasons,
-			"ese_block_reason": blocked_reasons[0] if blocked_reasons else "",
-			"ese_data": ese_rows,
-		})
+	page_obj = Paginator(groups_queryset, COORDINATOR_GROUPS_PER_PAGE).get_page(request.GET.get("page"))
+	group_details = [_coordinator_group_summary(group) for group in page_obj.object_list]
 
 	pending_approvals = CoordinatorApproval.objects.filter(
 		coordinator=request.user,
 		status=CoordinatorApproval.STATUS_PENDING,
-	).select_related("group", "group__leader")
+	).select_related("group__leader__student_profile__student_class").prefetch_related(
+		Prefetch(
+			"group__groupmember_set",
+			queryset=GroupMember.objects.select_related("user__student_profile__student_class"),
+		),
+	)
 
-	coordinator_pending_abstracts = Abstract.objects.filter(
+	coordinator_pending_abstracts = StoredBlob.attach_pdf_info(Abstract.objects.filter(
 		guide_status=Abstract.STATUS_APPROVED,
 		coordinator_status=Abstract.STATUS_PENDING,
 		group__leader__student_profile__student_class__name__in=assigned_classes,
-	).select_related("group", "group__leader").order_by("-submitted_at")
+	).select_related("group", "group__leader").order_by("-submitted_at"))
 
 	context = {
 		"pending_approvals": pending_approvals,
 		"faculty_profile": faculty_profile,
 		"assigned_classes": assigned_classes,
 		"group_details": group_details,
+		"page_obj": page_obj,
+		"department_classes": department_classes,
+		"filters": filters,
 		"coordinator_pending_abstracts": coordinator_pending_abstracts,
-		"is_dual_role": _has_dual_faculty_roles(request.user),
+		"is_dual_role": _has_dual_faculty_roles(request),
 	}
 	return render(request, "coordinator_dashboard.html", context)
 
 
+@login_required
+def coordinator_group_detail(request, group_id):
+	"""Evaluation, ESE and report panels of one group, loaded into the dashboard on demand."""
+	if not _is_coordinator(request):
+		return HttpResponseForbidden("Only coordinators can access this page.")
+	# A fragment, so no redirect to the role selection: the dashboard it belongs to does that.
+	if _ensure_active_role_for_dual_faculty(request, "coordinator"):
+		return HttpResponseForbidden("Switch to the coordinator role to view this group.")
+
+	def render_panel(parts):
+		groups = list(_coordinator_groups_queryset(request.user).filter(id=group_id))
+		if not groups:
+			return [None]
+		return [render_to_string("coordinator_group_detail.html", {"item": _coordinator_group_details(request, groups)[0]}, request)]
+
+	# The panel is cached for the coordinator's department only, which the rendering query checks.
+	panel = cached_fragments(request, "coordinator-group", [(group_id, request.roles.department)], render_panel)[0]
+	if panel is None:
+		raise Http404("Group not found.")
+	return HttpResponse(panel)
+
+
 @login_required
 def profile(request):
 	context = {
-		"is_student": _is_student(request.user),
-		"is_guide": _is_guide(request.user),
-		"is_coordinator": _is_coordinator(request.user),
-		"is_hod": _is_hod(request.user),
+		"is_student": _is_student(request),
+		"is_guide": _is_guide(request),
+		"is_coordinator": _is_coordinator(request),
+		"is_hod": _is_hod(request),
 	}
 	
-	if _is_student(request.user):
-		context["student_profile"] = request.user.student_profile
+	if _is_student(request):
+		context["student_profile"] = request.roles.student_profile
 		# Fetch the student's group and its SDG submission
 		group = _get_group_for_user(request.user)
 		if group:
@@ -1743,19 +1892,19 @@ def profile(request):
 							'name': sdg_names.get(sdg_field_value, f'SDG {sdg_field_value}')
 						})
 			context["selected_sdgs"] = selected_sdgs
-	elif hasattr(request.user, "faculty_profile"):
-		context["faculty_profile"] = request.user.faculty_profile
+	elif request.roles.is_faculty:
+		context["faculty_profile"] = request.roles.faculty_profile
 	
 	return render(request, "profile.html", context)
 
 
 @login_required
 def hod_dashboard(request):
-	if not _is_hod(request.user):
+	if not _is_hod(request):
 		messages.error(request, "Only HOD can access this page.")
 		return redirect("dashboard")
 
-	hod_profile = request.user.faculty_profile
+	hod_profile = request.roles.faculty_profile
 	dept = hod_profile.department
 
 	# Handle HOD actions
@@ -1813,10 +1962,18 @@ def hod_dashboard(request):
 			return redirect("hod_dashboard")
 
 	# HOD sees coordinator-approved abstracts in their department only
-	forwarded_abstracts = Abstract.objects.filter(
+	forwarded_abstracts = list(Abstract.objects.filter(
 		coordinator_status=Abstract.STATUS_APPROVED,
 		group__leader__student_profile__department=dept,
-	).select_related("group", "group__leader", "reviewed_by").order_by("-reviewed_at")
+	).select_related("group", "group__leader", "reviewed_by").order_by("-reviewed_at"))
+
+	def render_cards(parts):
+		abstracts = {abstract.id: abstract for abstract in forwarded_abstracts}
+		return [render_to_string("hod_project_card.html", {"abstract": abstracts[abstract_id]}, request) for _, abstract_id in parts]
+
+	project_cards = cached_fragments(
+		request, "hod-project", [(abstract.group_id, abstract.id) for abstract in forwarded_abstracts], render_cards,
+	)
 
 	# Notifications for this HOD
 	notifications = Notification.objects.filter(recipient=request.user, is_read=False).order_by("-created_at")
@@ -1831,11 +1988,12 @@ def hod_dashboard(request):
 		"hod_profile": hod_profile,
 		"department": dept,
 		"forwarded_abstracts": forwarded_abstracts,
+		"project_cards": project_cards,
 		"notifications": all_notifications,
 		"unread_count": unread_count,
-		"compliance_count": forwarded_abstracts.filter(hod_status=Abstract.STATUS_APPROVED).count(),
-		"presentation_count": forwarded_abstracts.filter(presentation_approved=True).count(),
-		"final_count": forwarded_abstracts.filter(final_approved=True).count(),
+		"compliance_count": sum(abstract.hod_status == Abstract.STATUS_APPROVED for abstract in forwarded_abstracts),
+		"presentation_count": sum(abstract.presentation_approved for abstract in forwarded_abstracts),
+		"final_count": sum(abstract.final_approved for abstract in forwarded_abstracts),
 	}
 	return render(request, "hod_dashboard.html", context)
 
@@ -1843,7 +2001,7 @@ def hod_dashboard(request):
 @login_required
 def submit_guide_evaluation(request, group_id, stage):
 	"""Handle guide evaluation submission."""
-	if not _is_guide(request.user):
+	if not _is_guide(request):
 		messages.error(request, "Only guides can submit evaluations.")
 		return redirect("dashboard")
 
@@ -1884,7 +2042,7 @@ def submit_guide_evaluation(request, group_id, stage):
 @login_required
 def submit_coordinator_evaluation(request, group_id, stage):
 	"""Handle coordinator evaluation submission."""
-	if not _is_coordinator(request.user):
+	if not _is_coordinator(request):
 		messages.error(request, "Only coordinators can submit evaluations.")
 		return redirect("dashboard")
 
@@ -1902,23 +2060,13 @@ def submit_coordinator_evaluation(request, group_id, stage):
 		return redirect("coordinator_dashboard")
 	
 	student_class = student_profile.student_class
-	coordinator_assignments = list(
-		CoordinatorAssignment.objects.filter(student_class=student_class)
-		.select_related('faculty')
-		.order_by('id')
-	)
+	# Determine which coordinator is submitting (coordinator1 or coordinator2)
+	coordinator_role = request.roles.coordinator_slot(student_class.id)
 	
-	if not coordinator_assignments:
+	if not coordinator_role and not CoordinatorAssignment.objects.filter(student_class=student_class).exists():
 		messages.error(request, "No coordinators assigned to this class.")
 		return redirect("coordinator_dashboard")
 	
-	# Determine which coordinator is submitting (coordinator1 or coordinator2)
-	coordinator_role = None
-	for idx, assignment in enumerate(coordinator_assignments, 1):
-		if assignment.faculty == request.user:
-			coordinator_role = idx
-			break
-	
 	if not coordinator_role:
 		messages.error(request, "You are not assigned as a coordinator for this class.")
 		return redirect("coordinator_dashboard")
@@ -1973,15 +2121,21 @@ def submit_coordinator_evaluation(request, group_id, stage):
 @login_required
 def upload_evaluation_file(request, stage):
 	"""Handle file upload for group evaluations."""
-	if not _is_student(request.user):
+	if not _is_student(request):
 		messages.error(request, "Only students can upload evaluation files.")
 		return redirect("dashboard")
 
-	group = _get_group_for_user(request.user)
+	group = StudentWorkspace.for_request(request).group
 	if not group:
 		messages.error(request, "You must be in a group to upload files.")
 		return redirect("mini_project")
 
+	rejected_name = rejected_upload(request, "file")
+	if rejected_name:
+		file_ext = '.' + rejected_name.split('.')[-1].lower()
+		messages.error(request, f"The uploaded file does not look like a {file_ext} file.")
+		return redirect("dashboard")
+
 	if request.method == "POST" and request.FILES.get("file"):
 		uploaded_file = request.FILES["file"]
 		
@@ -1997,19 +2151,25 @@ def upload_evaluation_file(request, stage):
 			messages.error(request, "File size must be less than 10MB.")
 			return redirect("dashboard")
 
+		if not has_expected_signature(uploaded_file, file_ext):
+			messages.error(request, f"The uploaded file does not look like a {file_ext} file.")
+			return redirect("dashboard")
+
 		# Delete existing file for this stage if exists
 		EvaluationFile.objects.filter(group=group, stage=stage).delete()
 
 		# Save new file
-		EvaluationFile.objects.create(
+		eval_file = EvaluationFile.objects.create(
 			group=group,
 			stage=stage,
-			file_data=uploaded_file.read(),
+			file_blob=uploaded_file,
 			file_name=uploaded_file.name,
 			file_size=uploaded_file.size,
 			file_type=uploaded_file.content_type,
 			uploaded_by=request.user,
 		)
+		if file_ext == ".pdf":
+			StoredBlob.inspect_pdf_later(eval_file.file_blob.name)
 
 		messages.success(request, f"File uploaded successfully for {stage} evaluation!")
 		return redirect("dashboard")
@@ -2020,18 +2180,18 @@ def upload_evaluation_file(request, stage):
 @login_required
 def download_evaluation_file(request, file_id):
 	"""Download evaluation file."""
-	eval_file = get_object_or_404(EvaluationFile, id=file_id)
+	eval_file = get_object_or_404(EvaluationFile.objects.with_content(), id=file_id)
 	
 	# Check authorization
 	user = request.user
 	is_authorized = False
 	
 	# Students in the group can download
-	if _is_student(user) and _get_group_for_user(user) == eval_file.group:
+	if _is_student(request) and _get_group_for_user(user) == eval_file.group:
 		is_authorized = True
 	
 	# Guide of the group can download
-	if _is_guide(user) and GuideRequest.objects.filter(
+	if _is_guide(request) and GuideRequest.objects.filter(
 		group=eval_file.group, 
 		guide=user, 
 		status=GuideRequest.STATUS_ACCEPTED
@@ -2039,15 +2199,15 @@ def download_evaluation_file(request, file_id):
 		is_authorized = True
 	
 	# Coordinator can download if same department
-	if _is_coordinator(user):
-		coordinator_dept = user.faculty_profile.department
+	if _is_coordinator(request):
+		coordinator_dept = request.roles.department
 		group_dept = getattr(getattr(eval_file.group.leader, "student_profile", None), "department", None)
 		if coordinator_dept == group_dept:
 			is_authorized = True
 	
 	# HOD can download if same department
-	if _is_hod(user):
-		hod_dept = user.faculty_profile.department
+	if _is_hod(request):
+		hod_dept = request.roles.department
 		group_dept = getattr(getattr(eval_file.group.leader, "student_profile", None), "department", None)
 		if hod_dept == group_dept:
 			is_authorized = True
@@ -2056,9 +2216,19 @@ def download_evaluation_file(request, file_id):
 		messages.error(request, "You are not authorized to download this file.")
 		return redirect("dashboard")
 	
-	response = HttpResponse(eval_file.file_data, content_type=eval_file.file_type)
-	response['Content-Disposition'] = f'attachment; filename="{eval_file.file_name}"'
-	return response
+	if eval_file.file_blob:
+		content = eval_file.file_blob
+	else:
+		# Rows that migrate_blobs has not moved out of the database yet.
+		content = ContentFile(bytes(eval_file.file_data or b""))
+
+	return serve_file(
+		request,
+		content,
+		filename=eval_file.file_name,
+		content_type=eval_file.file_type,
+		last_modified=eval_file.uploaded_at,
+	)
 
 
 def _update_finalized_status(group, stage):
@@ -2134,7 +2304,7 @@ def _try_calculate_cie(second_eval):
 @login_required
 def submit_attendance_marks(request, group_id):
 	"""Allow a coordinator to submit or update attendance marks for all students in a group."""
-	if not _is_coordinator(request.user):
+	if not _is_coordinator(request):
 		return HttpResponseForbidden("Only coordinators can submit attendance marks.")
 
 	role_redirect = _ensure_active_role_for_dual_faculty(request, "coordinator")
@@ -2150,11 +2320,7 @@ def submit_attendance_marks(request, group_id):
 	if not student_profile or not student_profile.student_class:
 		return HttpResponseForbidden("Group leader's class is not assigned.")
 
-	coordinator_assigned = CoordinatorAssignment.objects.filter(
-		student_class=student_profile.student_class,
-		faculty=request.user,
-	).exists()
-	if not coordinator_assigned:
+	if not request.roles.coordinator_slot(student_profile.student_class_id):
 		return HttpResponseForbidden("You are not assigned as a coordinator for this class.")
 
 	members = list(GroupMember.objects.filter(group=group).select_related("user").order_by("id"))
@@ -2222,7 +2388,7 @@ def submit_attendance_marks(request, group_id):
 @login_required
 def submit_coordinator_ese(request, group_id):
 	"""Allow coordinators to record End Semester Evaluation (ESE) marks for students."""
-	if not _is_coordinator(request.user):
+	if not _is_coordinator(request):
 		return HttpResponseForbidden("Only coordinators can submit ESE marks.")
 
 	role_redirect = _ensure_active_role_for_dual_faculty(request, "coordinator")
@@ -2237,20 +2403,10 @@ def submit_coordinator_ese(request, group_id):
 	if not student_profile or not student_profile.student_class:
 		return HttpResponseForbidden("Group leader's class is not assigned.")
 
-	assignments = list(
-		CoordinatorAssignment.objects.filter(student_class=student_profile.student_class)
-		.select_related("faculty")
-		.order_by("id")
-	)
-	if not assignments:
+	coordinator_role = request.roles.coordinator_slot(student_profile.student_class_id)
+	if not coordinator_role and not CoordinatorAssignment.objects.filter(student_class_id=student_profile.student_class_id).exists():
 		messages.error(request, "No coordinators assigned to this class.")
 		return redirect("coordinator_dashboard")
-
-	coordinator_role = None
-	for idx, assignment in enumerate(assignments, 1):
-		if assignment.faculty == request.user:
-			coordinator_role = idx
-			break
 	if not coordinator_role:
 		messages.error(request, "You are not assigned as a coordinator for this class.")
 		return redirect("coordinator_dashboard")
@@ -2362,7 +2518,7 @@ def submit_coordinator_ese(request, group_id):
 @login_required
 def submit_guide_ese(request, group_id):
 	"""Allow the assigned guide to submit their ESE marks for all members in a group."""
-	if not _is_guide(request.user):
+	if not _is_guide(request):
 		messages.error(request, "Only guides can submit ESE marks.")
 		return redirect("dashboard")
 
@@ -2458,7 +2614,7 @@ def submit_guide_ese(request, group_id):
 @login_required
 def submit_guide_student_evaluation(request, group_id, stage):
 	"""Handle guide submission for student evaluations (First/Second)."""
-	if not _is_guide(request.user):
+	if not _is_guide(request):
 		messages.error(request, "Only guides can submit evaluations.")
 		return redirect("dashboard")
 
@@ -2527,7 +2683,7 @@ def submit_guide_student_evaluation(request, group_id, stage):
 @login_required
 def submit_final_guide_evaluation(request, group_id):
 	"""Guide submits/updates final guide evaluation for all group members at once."""
-	if not _is_guide(request.user):
+	if not _is_guide(request):
 		messages.error(request, "Only guides can submit final guide evaluation.")
 		return redirect("dashboard")
 
@@ -2628,7 +2784,7 @@ def submit_final_guide_evaluation(request, group_id):
 @login_required
 def submit_coordinator_student_evaluation(request, group_id, stage):
 	"""Handle coordinator submission for student evaluations (First/Second)."""
-	if not _is_coordinator(request.user):
+	if not _is_coordinator(request):
 		messages.error(request, "Only coordinators can submit evaluations.")
 		return redirect("dashboard")
 
@@ -2646,23 +2802,13 @@ def submit_coordinator_student_evaluation(request, group_id, stage):
 		return redirect("coordinator_dashboard")
 	
 	student_class = student_profile.student_class
-	coordinator_assignments = list(
-		CoordinatorAssignment.objects.filter(student_class=student_class)
-		.select_related('faculty')
-		.order_by('id')
-	)
+	# Determine which coordinator is submitting (coordinator1 or coordinator2)
+	coordinator_role = request.roles.coordinator_slot(student_class.id)
 	
-	if not coordinator_assignments:
+	if not coordinator_role and not CoordinatorAssignment.objects.filter(student_class=student_class).exists():
 		messages.error(request, "No coordinators assigned to this class.")
 		return redirect("coordinator_dashboard")
 	
-	# Determine which coordinator is submitting (coordinator1 or coordinator2)
-	coordinator_role = None
-	for idx, assignment in enumerate(coordinator_assignments, 1):
-		if assignment.faculty == request.user:
-			coordinator_role = idx
-			break
-	
 	if not coordinator_role:
 		messages.error(request, "You are not assigned as a coordinator for this class.")
 		return redirect("coordinator_dashboard")
@@ -0,0 +1,47 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+	global _executor
+	with _executor_lock:
+		if _executor is None:
+			_executor = ThreadPoolExecutor(
+				max_workers=settings.BACKGROUND_WORKERS,
+				thread_name_prefix="apes-worker",
+			)
+	return _executor
+
+
+def _run(func, args):
+	try:
+		func(*args)
+	except Exception:
+		logger.exception("Background task %s%r failed", func.__name__, args)
+	finally:
+		# Worker threads open their own connections; don't leave them dangling.
+		connections.close_all()
+
+
+def run_in_background(func, *args):
+	"""Run ``func(*args)`` on the in-process worker pool after the current transaction commits.
+
+	The request never waits for it. With ``BACKGROUND_WORKERS = 0`` the task
+	runs inline at commit time instead, which is what the tests use.
+	"""
+	def submit():
+		if settings.BACKGROUND_WORKERS:
+			_get_executor().submit(_run, func, args)
+		else:
+			func(*args)
+
+	transaction.on_commit(submit)
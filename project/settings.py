@@ -42,11 +42,16 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "core.middleware.StaticFilesMiddleware",
+    "core.middleware.CompressionMiddleware",
+    "core.middleware.RequestTimingMiddleware",
+    "core.middleware.RepeatedQueryMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "core.middleware.EnsureCSRFCookieMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.middleware.RolesMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -78,6 +83,29 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # The historical migrations do not replay cleanly on an empty
+        # database, so the test database is built straight from the models.
+        'TEST': {
+            'MIGRATE': False,
+        },
+    }
+}
+
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# core.sqlitecache.SQLiteCache keeps the cache in one SQLite file that every
+# server process on the host shares, so fragment versions and the
+# coordinator slot map are the same in all of them; see
+# `manage.py cachebench`. Dashboards cache one fragment per group and user,
+# hence the room for more than the default 300 entries.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'core.sqlitecache.SQLiteCache',
+        'LOCATION': BASE_DIR / 'cache.sqlite3',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
     }
 }
 
@@ -118,10 +146,81 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
+# collectstatic copies every asset here under a fingerprinted name, with
+# .gz (and, with the brotli package, .br) copies next to the text ones; see
+# core.storage.CompressedManifestStaticFilesStorage.
+# core.middleware.StaticFilesMiddleware serves this directory when the web
+# server in front does not.
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# Abstract PDFs, evaluation files and project reports are kept on disk in a
+# content-addressed store (see core.storage) instead of inside the database.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'core.storage.CompressedManifestStaticFilesStorage',
+    },
+    'blobs': {
+        'BACKEND': 'core.storage.ContentAddressedStorage',
+        'OPTIONS': {
+            'location': BASE_DIR / 'blobs',
+            # Gzip files that are not already compressed (legacy .doc/.ppt)
+            # when that saves at least 10%.
+            'compress': True,
+            'min_saving': 0.1,
+        },
+    },
+}
+
+# How downloads are delivered once the view has authorized them: 'django'
+# streams the file from Python, 'x-accel-redirect' (nginx) and 'x-sendfile'
+# (Apache mod_xsendfile, lighttpd) leave the transfer to the web server. For
+# nginx, FILE_DELIVERY_ACCEL_PREFIX must be an internal location aliased to
+# the blobs directory.
+FILE_DELIVERY = 'django'
+FILE_DELIVERY_ACCEL_PREFIX = '/protected/'
+
+# Size of the in-process thread pool used for post-upload work such as PDF
+# inspection (see core.workers). 0 runs those tasks inline at commit time.
+BACKGROUND_WORKERS = 2
+
+# Fraction of requests core.middleware.RequestTimingMiddleware measures
+# (query count, DB, template and view time). Each measured request is logged
+# by the "core.middleware" logger. 0 turns it off. REQUEST_TIMING_HEADER says
+# who also gets a Server-Timing header that browser dev tools show: 'staff'
+# (staff users, and everyone under DEBUG), 'all' or 'off'.
+REQUEST_TIMING_SAMPLE_RATE = 0.1
+REQUEST_TIMING_HEADER = 'staff'
+
+# core.middleware.RepeatedQueryMiddleware reports requests that run the same
+# query (ignoring parameters) more than REPEATED_QUERY_THRESHOLD times, the
+# mark of a query issued from a loop. 'log' logs a warning with the call
+# site, 'raise' fails the request (for tests), 'off' disables the check.
+REPEATED_QUERY_MODE = 'off'
+REPEATED_QUERY_THRESHOLD = 10
+
+# Seconds the guide, coordinator and HOD dashboards keep a rendered group
+# panel (see core.fragments). Saving anything a panel shows invalidates it
+# at once; the timeout only bounds edits no signal sees, such as a renamed
+# user or a queryset update(). 0 turns fragment caching off. With several
+# server processes CACHES must point at a shared cache.
+FRAGMENT_CACHE_TIMEOUT = 600
 
 # File Upload Settings
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB in bytes
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB in bytes
+# Uploads are always spooled to disk and hashed while they stream in, so
+# FILE_UPLOAD_MAX_MEMORY_SIZE no longer decides what is held in memory.
+FILE_UPLOAD_HANDLERS = [
+    'core.uploads.HashingFileUploadHandler',
+]
+
+# ModelBackend, but loading the student and faculty profiles with the user.
+AUTHENTICATION_BACKENDS = [
+    'core.backends.ProfileModelBackend',
+]
 
 LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/'
@@ -0,0 +1,122 @@
+function enhanceEvaluationNumberInputs() {
+    document.querySelectorAll('.eval-table input[type="number"]').forEach(input => {
+        if (input.parentElement && input.parentElement.classList.contains('number-stepper-wrapper')) {
+            return;
+        }
+
+        const wrapper = document.createElement('div');
+        wrapper.className = 'number-stepper-wrapper';
+
+        const controls = document.createElement('div');
+        controls.className = 'number-stepper-controls';
+
+        const increaseBtn = document.createElement('button');
+        increaseBtn.type = 'button';
+        increaseBtn.className = 'number-stepper-btn';
+        increaseBtn.setAttribute('aria-label', 'Increase value');
+        increaseBtn.innerHTML = '&#9650;';
+
+        const decreaseBtn = document.createElement('button');
+        decreaseBtn.type = 'button';
+        decreaseBtn.className = 'number-stepper-btn';
+        decreaseBtn.setAttribute('aria-label', 'Decrease value');
+        decreaseBtn.innerHTML = '&#9660;';
+
+        increaseBtn.addEventListener('click', () => {
+            input.stepUp();
+            input.dispatchEvent(new Event('input', { bubbles: true }));
+            input.dispatchEvent(new Event('change', { bubbles: true }));
+            input.focus();
+        });
+
+        decreaseBtn.addEventListener('click', () => {
+            input.stepDown();
+            input.dispatchEvent(new Event('input', { bubbles: true }));
+            input.dispatchEvent(new Event('change', { bubbles: true }));
+            input.focus();
+        });
+
+        input.parentNode.insertBefore(wrapper, input);
+        wrapper.appendChild(input);
+        controls.appendChild(increaseBtn);
+        controls.appendChild(decreaseBtn);
+        wrapper.appendChild(controls);
+    });
+}
+
+// Tab switching functionality
+document.querySelectorAll('.tab-link').forEach(link => {
+    link.addEventListener('click', function(e) {
+        e.preventDefault();
+
+        // Remove active class from all tabs and links
+        document.querySelectorAll('.tab-content').forEach(content => {
+            content.classList.remove('active');
+        });
+        document.querySelectorAll('.tab-link').forEach(l => {
+            l.classList.remove('active');
+        });
+
+        // Add active class to clicked link and corresponding tab
+        const tabId = this.getAttribute('data-tab');
+        document.getElementById(tabId).classList.add('active');
+        this.classList.add('active');
+
+        // Update URL hash
+        window.location.hash = tabId;
+    });
+});
+
+// Group panels are fetched from coordinator_group_detail the first time they open
+const groupAccordion = document.getElementById('groupAccordion');
+if (groupAccordion) {
+    groupAccordion.addEventListener('show.bs.collapse', function(event) {
+        if (!event.target.classList.contains('accordion-collapse')) {
+            return;
+        }
+        const body = event.target.querySelector('.accordion-body[data-detail-url]');
+        if (!body || body.dataset.loaded) {
+            return;
+        }
+        body.dataset.loaded = 'true';
+        fetch(body.dataset.detailUrl, { credentials: 'same-origin' })
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(response.statusText);
+                }
+                return response.text();
+            })
+            .then(html => {
+                body.innerHTML = html;
+                enhanceEvaluationNumberInputs();
+            })
+            .catch(() => {
+                delete body.dataset.loaded;
+                body.innerHTML = '<div class="alert alert-danger mb-0">Could not load group details. Close and reopen the group to retry.</div>';
+            });
+    });
+}
+
+// Handle URL fragment on page load
+window.addEventListener('DOMContentLoaded', function() {
+    enhanceEvaluationNumberInputs();
+
+    const hash = window.location.hash.substring(1); // Remove the # symbol
+    if (hash) {
+        // Remove active class from all tabs and links
+        document.querySelectorAll('.tab-content').forEach(content => {
+            content.classList.remove('active');
+        });
+        document.querySelectorAll('.tab-link').forEach(l => {
+            l.classList.remove('active');
+        });
+
+        // Activate the tab specified in the URL fragment
+        const targetTab = document.getElementById(hash);
+        const targetLink = document.querySelector(`.tab-link[data-tab="${hash}"]`);
+        if (targetTab && targetLink) {
+            targetTab.classList.add('active');
+            targetLink.classList.add('active');
+        }
+    }
+});
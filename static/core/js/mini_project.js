@@ -0,0 +1,102 @@
+function activateTab(tabId) {
+    const target = document.getElementById(tabId);
+    if (!target) {
+        return;
+    }
+
+    document.querySelectorAll('.tab-content').forEach(content => {
+        content.classList.remove('active');
+    });
+    document.querySelectorAll('.tab-link').forEach(link => {
+        link.classList.remove('active');
+    });
+
+    target.classList.add('active');
+    const activeLink = document.querySelector('.tab-link[href="#' + tabId + '"]');
+    if (activeLink) {
+        activeLink.classList.add('active');
+    }
+}
+
+document.querySelectorAll('.tab-link').forEach(link => {
+    link.addEventListener('click', function(e) {
+        e.preventDefault();
+        const tabId = this.getAttribute('href').substring(1);
+        activateTab(tabId);
+        window.location.hash = tabId;
+    });
+});
+
+const initialTab = window.location.hash ? window.location.hash.substring(1) : 'group';
+activateTab(initialTab);
+
+// Student autocomplete for group invitations; nothing is loaded until the user types
+const studentSearch = document.getElementById('studentSearch');
+const studentResults = document.getElementById('studentResults');
+const toUserId = document.getElementById('toUserId');
+let searchTimer = null;
+let searchRequest = 0;
+
+function studentLabel(student) {
+    const details = [student.name, student.roll_number, student.register_number].filter(Boolean).join(' · ');
+    return details ? `${student.username} (${details})` : student.username;
+}
+
+function loadStudents(query, after) {
+    const requestId = ++searchRequest;
+    const params = new URLSearchParams({ q: query });
+    if (after) {
+        params.set('after', after);
+    }
+    fetch(`${studentSearch.dataset.searchUrl}?${params}`, { credentials: 'same-origin' })
+        .then(response => response.ok ? response.json() : { results: [], next: null })
+        .then(data => {
+            if (requestId !== searchRequest) {
+                return;
+            }
+            if (!after) {
+                studentResults.replaceChildren();
+            }
+            studentResults.querySelector('.load-more')?.remove();
+            data.results.forEach(student => {
+                const item = document.createElement('button');
+                item.type = 'button';
+                item.className = 'list-group-item list-group-item-action';
+                item.textContent = studentLabel(student);
+                item.addEventListener('click', () => {
+                    toUserId.value = student.id;
+                    studentSearch.value = studentLabel(student);
+                    studentResults.replaceChildren();
+                });
+                studentResults.appendChild(item);
+            });
+            if (!after && !data.results.length) {
+                const empty = document.createElement('div');
+                empty.className = 'list-group-item';
+                empty.innerHTML = '<small>No available students match.</small>';
+                studentResults.appendChild(empty);
+            }
+            if (data.next) {
+                const more = document.createElement('button');
+                more.type = 'button';
+                more.className = 'list-group-item list-group-item-action load-more';
+                more.innerHTML = '<small>Show more…</small>';
+                more.addEventListener('click', () => loadStudents(query, data.next));
+                studentResults.appendChild(more);
+            }
+        });
+}
+
+if (studentSearch) {
+    studentSearch.addEventListener('input', () => {
+        toUserId.value = '';
+        clearTimeout(searchTimer);
+        const query = studentSearch.value.trim();
+        if (!query) {
+            searchRequest++;
+            studentResults.replaceChildren();
+            return;
+        }
+        searchTimer = setTimeout(() => loadStudents(query), 250);
+    });
+}
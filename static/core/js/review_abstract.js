@@ -0,0 +1,9 @@
+// Validate rejection requires feedback
+document.getElementById('rejectBtn')?.addEventListener('click', function (e) {
+    const feedback = document.getElementById('feedback').value.trim();
+    if (!feedback) {
+        e.preventDefault();
+        alert('Please provide feedback when rejecting an abstract.');
+        document.getElementById('feedback').focus();
+    }
+});
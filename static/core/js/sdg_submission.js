@@ -0,0 +1,127 @@
+const sdgGoals = {
+    '1': 'No Poverty',
+    '2': 'Zero Hunger',
+    '3': 'Good Health and Well-being',
+    '4': 'Quality Education',
+    '5': 'Gender Equality',
+    '6': 'Clean Water and Sanitation',
+    '7': 'Affordable and Clean Energy',
+    '8': 'Decent Work and Economic Growth',
+    '9': 'Industry, Innovation and Infrastructure',
+    '10': 'Reduced Inequalities',
+    '11': 'Sustainable Cities and Communities',
+    '12': 'Responsible Consumption and Production',
+    '13': 'Climate Action',
+    '14': 'Life Below Water',
+    '15': 'Life on Land',
+    '16': 'Peace, Justice and Strong Institutions',
+    '17': 'Partnerships for the Goals'
+};
+
+const sdgSelects = document.querySelectorAll('.sdg-select');
+
+// Update selected SDGs display and count
+function updateSDGDisplay() {
+    const selectedSDGs = [];
+    sdgSelects.forEach(select => {
+        if (select.value) {
+            selectedSDGs.push({
+                value: select.value,
+                label: sdgGoals[select.value]
+            });
+        }
+    });
+
+    const selectedCount = selectedSDGs.length;
+    document.getElementById('selectedCount').textContent = selectedCount;
+
+    const selectedDisplay = document.getElementById('selectedDisplay');
+    const badgesContainer = document.getElementById('selectedBadgesContainer');
+
+    if (selectedCount > 0) {
+        selectedDisplay.classList.add('show');
+        badgesContainer.innerHTML = selectedSDGs.map(sdg => 
+            `<span class="selected-sdg-badge">SDG #${sdg.value}: ${sdg.label}</span>`
+        ).join('');
+    } else {
+        selectedDisplay.classList.remove('show');
+        badgesContainer.innerHTML = '';
+    }
+
+    // Update selection status
+    const statusSpan = document.getElementById('selectionStatus');
+    if (selectedCount < 4) {
+        statusSpan.textContent = `(Need ${4 - selectedCount} more)`;
+        statusSpan.style.color = '#f87171';
+    } else if (selectedCount >= 4 && selectedCount <= 5) {
+        statusSpan.textContent = '✓ Valid selection';
+        statusSpan.style.color = '#86efac';
+    } else {
+        statusSpan.textContent = 'Maximum 5 goals allowed';
+        statusSpan.style.color = '#f87171';
+    }
+}
+
+// Validate SDG selection
+function validateSDGSelection() {
+    // Clear previous errors
+    document.querySelectorAll('.validation-message').forEach(el => {
+        el.classList.remove('show');
+        el.textContent = '';
+    });
+
+    const selectedSDGs = [];
+    const selectedValues = new Set();
+
+    sdgSelects.forEach((select, index) => {
+        if (select.value) {
+            selectedSDGs.push(select.value);
+            selectedValues.add(select.value);
+        }
+    });
+
+    // Check for duplicates
+    if (selectedValues.size !== selectedSDGs.length) {
+        alert('Error: Cannot select the same SDG goal multiple times.');
+        return false;
+    }
+
+    // Check minimum selection
+    if (selectedSDGs.length < 4) {
+        alert(`Error: You must select at least 4 SDG goals. Currently selected: ${selectedSDGs.length}`);
+        return false;
+    }
+
+    // Check maximum selection
+    if (selectedSDGs.length > 5) {
+        alert('Error: You can select a maximum of 5 SDG goals.');
+        return false;
+    }
+
+    return true;
+}
+
+// Prevent selecting duplicate SDGs
+sdgSelects.forEach((select, index) => {
+    select.addEventListener('change', function() {
+        const selectedValue = this.value;
+        let isDuplicate = false;
+
+        // Check if this value is already selected in another dropdown
+        sdgSelects.forEach((otherSelect, otherIndex) => {
+            if (index !== otherIndex && otherSelect.value === selectedValue && selectedValue !== '') {
+                isDuplicate = true;
+            }
+        });
+
+        if (isDuplicate) {
+            alert('This SDG goal is already selected. Please choose a different goal.');
+            this.value = '';
+        }
+
+        updateSDGDisplay();
+    });
+});
+
+// Initial display update
+updateSDGDisplay();
@@ -0,0 +1,16 @@
+document.getElementById('pdf_file').addEventListener('change', function(e) {
+    const file = e.target.files[0];
+    const warning = document.getElementById('fileSizeWarning');
+    const submitBtn = document.getElementById('submitBtn');
+
+    if (file) {
+        const maxSize = 10 * 1024 * 1024; // 10MB
+        if (file.size > maxSize) {
+            warning.style.display = 'block';
+            submitBtn.disabled = true;
+        } else {
+            warning.style.display = 'none';
+            submitBtn.disabled = false;
+        }
+    }
+});